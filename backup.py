@@ -0,0 +1,212 @@
+"""Veritabanı yedeği (SQLite online backup API).
+
+Dosya kopyalamak yerine sqlite3.Connection.backup() kullanılır: yedek,
+yazma işlemleri sürerken bile tutarlı bir anlık görüntüdür. Kopyalama
+sayfa sayfa (BACKUP_PAGES_PER_STEP) yapılır; her adımda ilerleme bildirilir
+ve iptal kontrol edilir, arada diğer bağlantılar veritabanını kullanabilir.
+
+- Yedek önce '.partial' uzantılı geçici dosyaya yazılır, doğrulanır
+  (PRAGMA integrity_check), sonra hedef isme taşınır; yarım yedek kalmaz.
+- İsteğe bağlı gzip sıkıştırma (.db.gz).
+- Otomatik yedekler bir klasörde tutulur; en yeni 'keep' adet dışındakiler
+  silinir (rotasyon).
+
+Fonksiyonlar arka plan işinde (task) ya da komut satırında çalışır; Tk'ye
+dokunmaz.
+"""
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+import db
+
+# Backup adımı başına kopyalanan sayfa sayısı (4 KB sayfa ile ~1 MB)
+BACKUP_PAGES_PER_STEP = 256
+
+# Otomatik yedek dosya adı: personel_takip_yedek_YYYYMMDD_HHMMSS.db[.gz]
+BACKUP_PREFIX = "personel_takip_yedek_"
+BACKUP_SUFFIXES = (".db", ".db.gz")
+
+# Sıkıştırılmış yedek açılırken / yazılırken kullanılan parça boyutu
+_COPY_CHUNK = 1024 * 1024
+
+
+class BackupError(Exception):
+    """Yedek doğrulanamadı (integrity_check 'ok' dönmedi)."""
+
+
+class BackupResult:
+    """Tamamlanan yedeğin özeti."""
+
+    __slots__ = ("path", "size", "pages", "seconds", "verified")
+
+    def __init__(self, path, size, pages, seconds, verified):
+        self.path = path
+        self.size = size
+        self.pages = pages
+        self.seconds = seconds
+        self.verified = verified
+
+
+def default_backup_name(compress=False, now=None):
+    stamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
+    return f"{BACKUP_PREFIX}{stamp}{'.db.gz' if compress else '.db'}"
+
+
+def default_backup_dir():
+    """Otomatik yedek klasörü: veritabanının yanında 'yedekler'."""
+    return os.path.join(os.path.dirname(os.path.abspath(db.DB_NAME)), "yedekler")
+
+
+# ---- Yedek alma ----
+
+def _online_backup(dest_path, task=None, pages=BACKUP_PAGES_PER_STEP):
+    """Canlı veritabanını dest_path'e kopyalar; geri dönen: toplam sayfa sayısı."""
+    state = {"total": 0}
+
+    def progress(status, remaining, total):
+        state["total"] = total
+        if task is not None:
+            # İstisna backup'ı yarıda keser (iptal)
+            task.check_cancelled()
+            task.report(total - remaining, total)
+
+    source = db.get_conn()
+    try:
+        # Kaynakta okuma işlemi açık tutulur: WAL modunda yedek bu anlık
+        # görüntüyü kopyalar. Açık tutulmazsa başka bir bağlantının her
+        # yazması backup'ı baştan başlatır; yoğun yazmada hiç bitmeyebilir.
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        target = sqlite3.connect(dest_path)
+        try:
+            source.backup(target, pages=pages, progress=progress)
+        finally:
+            target.close()
+            source.rollback()
+    finally:
+        source.close()
+    return state["total"]
+
+
+def integrity_problems(path):
+    """PRAGMA integrity_check sonucu; sorun yoksa boş liste."""
+    conn = sqlite3.connect(f"file:{_uri_path(path)}?mode=ro", uri=True)
+    try:
+        rows = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+    finally:
+        conn.close()
+    return [] if rows == ["ok"] else rows
+
+
+def _uri_path(path):
+    from urllib.request import pathname2url
+
+    return pathname2url(os.path.abspath(path))
+
+
+def _gzip_file(src_path, dest_path):
+    with open(src_path, "rb") as src, gzip.open(dest_path, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, _COPY_CHUNK)
+
+
+def backup_database(dest_path, compress=None, verify=True, task=None):
+    """Veritabanının tutarlı bir yedeğini dest_path'e yazar.
+
+    compress None ise dosya adına bakılır ('.gz' ile bitiyorsa sıkıştırılır).
+    verify=True ise kopya üzerinde integrity_check çalışır; hata varsa
+    BackupError fırlatılır ve hedef dosya oluşturulmaz.
+    Geri dönen: BackupResult
+    """
+    if compress is None:
+        compress = dest_path.lower().endswith(".gz")
+
+    t0 = time.perf_counter()
+    directory = os.path.dirname(os.path.abspath(dest_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, partial = tempfile.mkstemp(suffix=".partial", dir=directory)
+    os.close(fd)
+    try:
+        pages = _online_backup(partial, task=task)
+
+        if verify:
+            problems = integrity_problems(partial)
+            if problems:
+                raise BackupError("Yedek doğrulanamadı: " + "; ".join(problems[:5]))
+
+        if compress:
+            _gzip_file(partial, partial + ".gz")
+            os.remove(partial)
+            partial += ".gz"
+        os.replace(partial, dest_path)
+    except BaseException:
+        for leftover in (partial, partial + ".gz"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        raise
+
+    return BackupResult(
+        dest_path, os.path.getsize(dest_path), pages, time.perf_counter() - t0, verify
+    )
+
+
+def verify_backup(path):
+    """Var olan bir yedeği doğrular (.gz ise geçici olarak açılır); sorun listesi döner."""
+    if not path.lower().endswith(".gz"):
+        return integrity_problems(path)
+
+    fd, plain = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        with gzip.open(path, "rb") as src, open(plain, "wb") as dst:
+            shutil.copyfileobj(src, dst, _COPY_CHUNK)
+        return integrity_problems(plain)
+    finally:
+        os.remove(plain)
+
+
+# ---- Otomatik yedek / rotasyon ----
+
+def list_backups(directory):
+    """Klasördeki otomatik yedekler, en yeniden eskiye: [yol, ...]."""
+    if not os.path.isdir(directory):
+        return []
+    names = [
+        name for name in os.listdir(directory)
+        if name.startswith(BACKUP_PREFIX) and name.endswith(BACKUP_SUFFIXES)
+    ]
+    # Tarih damgası isimde olduğu için ters alfabetik sıra = en yeni önce
+    return [os.path.join(directory, name) for name in sorted(names, reverse=True)]
+
+
+def rotate_backups(directory, keep):
+    """En yeni 'keep' yedek dışındakileri siler; silinen yolları döndürür."""
+    removed = []
+    for path in list_backups(directory)[max(keep, 1):]:
+        os.remove(path)
+        removed.append(path)
+    return removed
+
+
+def auto_backup_due(config, now=None):
+    """Otomatik yedek açık ve son yedekten bu yana 'interval_hours' geçtiyse True."""
+    if not config.enabled:
+        return False
+    backups = list_backups(config.directory or default_backup_dir())
+    if not backups:
+        return True
+    age = (now or time.time()) - os.path.getmtime(backups[0])
+    return age >= config.interval_hours * 3600
+
+
+def run_auto_backup(config, task=None):
+    """Ayarlardaki klasöre yeni yedek alır ve rotasyonu uygular; geri dönen: BackupResult."""
+    directory = config.directory or default_backup_dir()
+    path = os.path.join(directory, default_backup_name(bool(config.compress)))
+    result = backup_database(path, compress=bool(config.compress), verify=True, task=task)
+    rotate_backups(directory, config.keep_count)
+    return result
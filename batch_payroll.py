@@ -0,0 +1,196 @@
+"""Toplu bordro: bir tarih aralığındaki her ay için tüm personelin bordrosu.
+
+Aylar bir süreç havuzuna dağıtılır; her worker veritabanını salt okunur
+(mode=ro) açar ve kendi ayını payroll.monthly_payroll ile hesaplar (kapanmış
+dönemlerde snapshot okunur, hesap yapılmaz).
+Sonuçlar ay sırasıyla geldikçe CSV'ye (tek dosya) ya da Excel'e (her ay ayrı
+sayfa) yazılır; tüm aralık bellekte toplanmaz.
+
+Komut satırı:
+    python batch_payroll.py --from 2024-01 --to 2025-12 --out bordro.xlsx
+    python batch_payroll.py --out bordro.csv            (tüm geçmiş)
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import db
+from payroll import monthly_payroll
+from work_calendar import MONTH_NAMES_TR
+
+# Bu sayıdan az ay için süreç havuzu açılmaz (havuz açılışı ~100 ms)
+MIN_MONTHS_FOR_POOL = 3
+
+BATCH_HEADERS = [
+    "Yıl", "Ay", "Personel", "Gün", "Teorik Saat", "Eksik Saat", "Toplam Saat",
+    "Maaş", "Mesai", "Avans Kesinti", "Net Maaş",
+]
+
+# calculate_monthly_payroll satırından yazılan alanlar (Yıl / Ay hariç)
+_ROW_KEYS = (
+    "name", "days", "theoretical_hours", "missing_hours", "total_hours",
+    "salary", "overtime", "advance", "net_salary",
+)
+
+
+def parse_month(value):
+    """'2025-03' / '03.2025' / '3/2025' -> (2025, 3); geçersizse ValueError."""
+    text = value.strip().replace("/", "-").replace(".", "-")
+    first, second = (int(part) for part in text.split("-"))
+    year, month = (first, second) if first > 12 else (second, first)
+    if not (1 <= month <= 12) or year < 1900:
+        raise ValueError(f"Geçersiz ay: {value!r}")
+    return year, month
+
+
+def month_span(start, end):
+    """(yıl, ay) başlangıç ve bitiş dahil tüm aylar, sıralı."""
+    first = start[0] * 12 + start[1] - 1
+    last = end[0] * 12 + end[1] - 1
+    return [(index // 12, index % 12 + 1) for index in range(first, last + 1)]
+
+
+# ---- Worker (ayrı süreçte çalışır) ----
+
+def _init_worker(db_name):
+    db.DB_NAME = db_name
+    db.open_read_only()
+
+
+def _payroll_month(args):
+    year, month, settings, today = args
+    return year, month, monthly_payroll(year, month, settings=settings, today=today).rows
+
+
+# ---- Hesaplama ----
+
+def iter_batch_payroll(months, settings=None, workers=None, today=None):
+    """Her ay için (yıl, ay, satırlar) üretir; aylar verilen sırayla gelir.
+
+    workers: süreç sayısı (None = CPU sayısı, 1 = havuz kullanma). Ayarlar ve
+    'bugün' bir kez alınır, tüm aylar aynı değerlerle hesaplanır.
+    """
+    settings = settings or db.get_settings()
+    today = today or date.today()
+    jobs = [(year, month, settings, today) for year, month in months]
+
+    if workers == 1 or len(jobs) < MIN_MONTHS_FOR_POOL:
+        for job in jobs:
+            yield _payroll_month(job)
+        return
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(os.path.abspath(db.DB_NAME),),
+    ) as pool:
+        # map sonuçları sırayla döndürür; sıradaki ay hazır olana kadar bekler
+        yield from pool.map(_payroll_month, jobs)
+
+
+def _batch_values(year, month, row):
+    return [year, month] + [row[key] for key in _ROW_KEYS]
+
+
+def write_batch_csv(file_path, results, task=None, total=None):
+    """Tüm aylar tek CSV'de (Yıl / Ay sütunlarıyla). Geri dönen: yazılan satır sayısı."""
+    count = 0
+    with open(file_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(BATCH_HEADERS)
+        for done, (year, month, rows) in enumerate(results, start=1):
+            for r in rows:
+                values = _batch_values(year, month, r)
+                values[4:] = [f"{v:.2f}" for v in values[4:]]
+                writer.writerow(values)
+            count += len(rows)
+            if task is not None:
+                task.check_cancelled()
+                task.report(done, total)
+    return count
+
+
+def write_batch_xlsx(file_path, results, task=None, total=None):
+    """Her ay ayrı sayfada (örn. 'Mart 2025'). Geri dönen: yazılan satır sayısı."""
+    from excel_export import ExcelExport, hours_column, money_column, text_column
+
+    columns = [
+        text_column("Yıl", 6), text_column("Ay", 5), text_column("Personel", 24),
+        text_column("Gün", 6),
+        hours_column("Teorik Saat"), hours_column("Eksik Saat"), hours_column("Toplam Saat"),
+        money_column("Maaş"), money_column("Mesai"), money_column("Avans Kesinti"),
+        money_column("Net Maaş"),
+    ]
+    export = ExcelExport(file_path)
+    for done, (year, month, rows) in enumerate(results, start=1):
+        export.write_sheet(
+            f"{MONTH_NAMES_TR[month - 1]} {year}", columns,
+            (_batch_values(year, month, r) for r in rows),
+        )
+        if task is not None:
+            task.check_cancelled()
+            task.report(done, total)
+    return export.save()
+
+
+def run_batch_payroll(file_path, start, end, settings=None, workers=None, task=None):
+    """start..end aralığını hesaplayıp file_path'e yazar (.csv ya da .xlsx).
+
+    Geri dönen: (ay sayısı, satır sayısı)
+    """
+    months = month_span(start, end)
+    results = iter_batch_payroll(months, settings=settings, workers=workers)
+    if file_path.lower().endswith(".csv"):
+        count = write_batch_csv(file_path, results, task=task, total=len(months))
+    else:
+        count = write_batch_xlsx(file_path, results, task=task, total=len(months))
+    return len(months), count
+
+
+# ---- Komut satırı ----
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tarih aralığı için toplu bordro")
+    parser.add_argument("--from", dest="start", help="İlk ay (YYYY-AA); varsayılan: ilk hareketli ay")
+    parser.add_argument("--to", dest="end", help="Son ay (YYYY-AA); varsayılan: son hareketli ay")
+    parser.add_argument("--out", required=True, help="Çıktı dosyası (.csv ya da .xlsx)")
+    parser.add_argument("--workers", type=int, default=None, help="Süreç sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument("--db", default=db.DB_NAME, help="Veritabanı dosyası")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        parser.error(f"Veritabanı bulunamadı: {args.db}")
+    db.DB_NAME = args.db
+    db.init_db()
+
+    try:
+        start = parse_month(args.start) if args.start else None
+        end = parse_month(args.end) if args.end else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    if start is None or end is None:
+        bounds = db.summary_month_bounds()
+        if bounds is None:
+            parser.error("Veritabanında hareket yok; --from ve --to verin.")
+        start = start or bounds[0]
+        end = end or bounds[1]
+    if start > end:
+        parser.error("--from, --to'dan sonra olamaz.")
+
+    t0 = time.perf_counter()
+    months, rows = run_batch_payroll(args.out, start, end, workers=args.workers)
+    elapsed = time.perf_counter() - t0
+    db.close_connection()
+
+    print(f"{months} ay, {rows} bordro satırı -> {args.out} ({elapsed:.2f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1308 @@
+"""Performans ölçümleri.
+
+Kullanım:
+    python benchmarks.py payroll [--employees 10000]
+    python benchmarks.py query-plans
+    python benchmarks.py excel-import [--rows 50000]
+    python benchmarks.py working-days [--cases 20000]
+    python benchmarks.py summary [--employees 2000]
+    python benchmarks.py advance-ledger
+    python benchmarks.py yearly-performance [--employees 2000]
+    python benchmarks.py startup [--repeat 5]
+    python benchmarks.py pdf [--employees 5000]
+    python benchmarks.py excel-export [--rows 100000]
+    python benchmarks.py batch-payroll [--employees 2000] [--months 24]
+    python benchmarks.py backup [--employees 5000] [--months 12]
+    python benchmarks.py dashboard [--employees 300] [--months 6]
+    python benchmarks.py trends [--employees 1000] [--months 36]
+    python benchmarks.py payroll-runs [--employees 5000]
+    python benchmarks.py employee-search [--names 10000]
+    python benchmarks.py search [--employees 2000] [--months 24]
+    python benchmarks.py attendance-bulk [--employees 2000] [--marks 40]
+    python benchmarks.py overtime-bulk [--employees 2000] [--shift 60]
+
+Ölçümler geçici bir veritabanı üzerinde yapılır; patron_app.db'ye dokunulmaz.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import db
+from work_calendar import month_date_range
+
+ATTENDANCE_TYPES = ["HOUR_LOSS", "FULL_ABSENCE", "FREE_LEAVE", "ANNUAL_LEAVE", "REPORT"]
+
+
+def _timed(func, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - t0, result
+
+
+def build_sample_db(path, employees=10000, year=2025, months=(1,), seed=42):
+    """Verilen yola rastgele personel + hareket verisi içeren bir DB kurar.
+
+    Her personel için her ayda ~3 devamsızlık, ~2 mesai ve ~0.3 avans kaydı üretilir.
+    months öğeleri ay numarası (year yılı) ya da (yıl, ay) ikilisi olabilir.
+    """
+    rnd = random.Random(seed)
+    db.DB_NAME = path
+    db.init_db()
+
+    att_rows, ot_rows, adv_rows = [], [], []
+    for period in months:
+        period_year, month = (year, period) if isinstance(period, int) else period
+        month_start, month_end = month_date_range(period_year, month)
+        span = (month_end - month_start).days
+        for emp_id in range(1, employees + 1):
+            for _ in range(3):
+                d = (month_start + timedelta(days=rnd.randrange(span))).isoformat()
+                typ = rnd.choice(ATTENDANCE_TYPES)
+                hrs = round(rnd.uniform(1, 5), 1) if typ == "HOUR_LOSS" else 0.0
+                att_rows.append((emp_id, d, typ, hrs, ""))
+            for _ in range(2):
+                d = (month_start + timedelta(days=rnd.randrange(span))).isoformat()
+                hrs = rnd.choice([1.0, 2.0, 3.0])
+                rate = 150.0
+                ot_rows.append((emp_id, d, hrs, rate, hrs * rate, ""))
+            if rnd.random() < 0.3:
+                d = (month_start + timedelta(days=rnd.randrange(span))).isoformat()
+                amount = float(rnd.choice([500, 1000, 2500]))
+                adv_rows.append((emp_id, d, amount, 1, ""))
+
+    with db.transaction() as conn:
+        c = conn.cursor()
+        c.executemany(
+            "INSERT INTO employees (name, hourly_rate, start_date, is_active) VALUES (?, ?, ?, 1)",
+            [
+                (
+                    f"Personel {i:05d}",
+                    round(rnd.uniform(80, 250), 2),
+                    (date(year - 3, 1, 1) + timedelta(days=rnd.randint(0, 3 * 365 + 60))).isoformat(),
+                )
+                for i in range(employees)
+            ],
+        )
+
+        c.executemany(
+            "INSERT INTO attendance_logs (employee_id, date, type, hours, note) VALUES (?, ?, ?, ?, ?)",
+            att_rows,
+        )
+        c.executemany(
+            "INSERT INTO overtimes (employee_id, date, hours, rate, total, description) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ot_rows,
+        )
+        db.add_advance_bulk(adv_rows)
+
+
+def _legacy_payroll_sums(year, month):
+    """Eski SalaryTab yaklaşımı: personel başına 3 ayrı SUM sorgusu."""
+    month_start, month_end = month_date_range(year, month)
+    params = (month_start.isoformat(), month_end.isoformat())
+    conn = db.get_conn()
+    c = conn.cursor()
+    c.execute("SELECT id FROM employees ORDER BY name")
+    result = {}
+    for (emp_id,) in c.fetchall():
+        sums = []
+        for sql in (
+            "SELECT COALESCE(SUM(hours), 0) FROM attendance_logs "
+            "WHERE employee_id = ? AND date >= ? AND date < ?",
+            "SELECT COALESCE(SUM(total), 0) FROM overtimes "
+            "WHERE employee_id = ? AND date >= ? AND date < ?",
+            "SELECT COALESCE(SUM(amount), 0) FROM advances "
+            "WHERE employee_id = ? AND date >= ? AND date < ?",
+        ):
+            c.execute(sql, (emp_id,) + params)
+            sums.append(float(c.fetchone()[0] or 0))
+        result[emp_id] = tuple(sums)
+    conn.close()
+    return result
+
+
+def bench_payroll(employees):
+    from payroll import calculate_monthly_payroll
+
+    year, month = 2025, 3
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "bench.db"), employees=employees,
+                        year=year, months=(month,))
+
+        legacy_time, legacy = _timed(_legacy_payroll_sums, year, month)
+        engine_time, rows = _timed(calculate_monthly_payroll, year, month)
+
+        for r in rows:
+            expected = legacy[r["employee_id"]]
+            got = (r["missing_hours"], r["overtime"], r["advance"])
+            assert all(abs(a - b) < 1e-6 for a, b in zip(expected, got)), r["employee_id"]
+
+        db.close_connection()
+
+    print(f"payroll: {employees} personel x 1 ay")
+    print(f"  eski (personel başına 3 sorgu): {legacy_time * 1000:8.1f} ms")
+    print(f"  calculate_monthly_payroll     : {engine_time * 1000:8.1f} ms")
+
+
+def _write_attendance_workbook(path, rows, employees, seed=7):
+    """İçe aktarma ölçümü için örnek devamsızlık Excel'i yazar (~%1 hatalı satır)."""
+    from openpyxl import Workbook
+
+    rnd = random.Random(seed)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Devamsızlık")
+    ws.append(["Personel", "Tarih", "Tür", "Eksik Saat", "Not"])
+    start = date(2025, 1, 1)
+    for i in range(rows):
+        name = f"Personel {rnd.randrange(employees):05d}"
+        d = start + timedelta(days=rnd.randrange(365))
+        if i % 100 == 99:
+            name = "Bilinmeyen Kişi"
+        ws.append([name, d, rnd.choice(["Saatlik", "Tam gün", "Rapor"]), 2, "import"])
+    wb.save(path)
+
+
+def bench_excel_import(rows):
+    from excel_import import import_attendance_excel
+
+    employees = 600
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "bench.db"), employees=employees, months=())
+        xlsx = os.path.join(tmp, "devamsizlik.xlsx")
+        _write_attendance_workbook(xlsx, rows, employees)
+
+        name_to_id = {name: emp_id for emp_id, name, _, _ in db.get_active_employees()}
+
+        elapsed, report = _timed(import_attendance_excel, xlsx, name_to_id)
+
+        # Bellek ölçümü ayrı turda: tracemalloc süreyi ciddi yavaşlatır
+        build_sample_db(os.path.join(tmp, "bench_mem.db"), employees=employees, months=())
+        tracemalloc.start()
+        import_attendance_excel(xlsx, name_to_id)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        db.close_connection()
+
+    print(f"excel-import: {rows} satır")
+    print(f"  süre          : {elapsed:8.2f} s ({rows / elapsed:,.0f} satır/s)")
+    print(f"  aktarılan     : {report.imported}, hatalı: {report.skipped}")
+    print(f"  tepe bellek   : {peak / 1024 / 1024:8.1f} MB (tracemalloc)")
+
+
+def check_monthly_summary(employees):
+    """Trigger'larla güncellenen özet tabloyu tam yeniden hesapla karşılaştırır.
+
+    Örnek veriye rastgele ekleme / güncelleme / silme uygulanır; ardından
+    özet tablo kopyalanıp rebuild_monthly_summary() sonucu ile kıyaslanır.
+    """
+    rnd = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "summary.db"), employees=employees,
+                        months=(1, 2, 3))
+        c = db.connection().cursor()
+
+        def ids(table):
+            c.execute(f"SELECT id FROM {table}")
+            return [row[0] for row in c.fetchall()]
+
+        att_ids, ot_ids, adv_ids = ids("attendance_logs"), ids("overtimes"), ids("advances")
+        t0 = time.perf_counter()
+        for att_id in rnd.sample(att_ids, len(att_ids) // 10):
+            db.update_attendance(att_id, rnd.randint(1, employees), "2025-02-11", "HOUR_LOSS", 1.5, "")
+        for ot_id in rnd.sample(ot_ids, len(ot_ids) // 10):
+            db.delete_overtime(ot_id)
+        for adv_id in rnd.sample(adv_ids, len(adv_ids) // 2):
+            db.update_advance(adv_id, rnd.randint(1, employees), "2025-03-09", 750.0,
+                              rnd.randint(1, 6), 750.0, "")
+        for adv_id in rnd.sample(adv_ids, len(adv_ids) // 10):
+            db.delete_advance(adv_id)
+        for _ in range(len(adv_ids) // 10):
+            db.add_advance(rnd.randint(1, employees), "2025-02-14", 1000.0, rnd.randint(1, 12))
+        for _ in range(len(ot_ids) // 10):
+            db.add_overtime(rnd.randint(1, employees), "2025-01-20", 2.0, 150.0, 300.0)
+        writes_time = time.perf_counter() - t0
+
+        c.execute("CREATE TEMP TABLE summary_before AS SELECT * FROM monthly_employee_summary")
+        rebuild_time, _ = _timed(db.rebuild_monthly_summary)
+        c.execute("""
+            SELECT COUNT(*) FROM (
+                SELECT a.employee_id FROM monthly_employee_summary a
+                LEFT JOIN summary_before b USING (employee_id, year, month)
+                WHERE b.employee_id IS NULL
+                   OR abs(a.missing_hours - b.missing_hours) > 1e-6
+                   OR abs(a.overtime_hours - b.overtime_hours) > 1e-6
+                   OR abs(a.overtime_total - b.overtime_total) > 1e-6
+                   OR abs(a.advance_total - b.advance_total) > 1e-6
+            )
+        """)
+        mismatches = c.fetchone()[0]
+        db.close_connection()
+
+    print(f"summary: {employees} personel x 3 ay")
+    print(f"  tekil yazımlar (trigger'lı) : {writes_time * 1000:8.1f} ms")
+    print(f"  rebuild_monthly_summary     : {rebuild_time * 1000:8.1f} ms")
+    if mismatches:
+        sys.exit(f"{mismatches} özet satırı yeniden hesapla uyuşmuyor.")
+    print("  özet tablo tutarlı")
+
+
+def check_advance_ledger():
+    """Avans düzenlemesi işlenmiş taksitleri yeniden kesilir hale getirmemeli.
+
+    300 TL / 3 taksitlik avansın Ocak kesintisi işlenir; sadece açıklaması
+    değişen avansta Ocak ikinci kez kesilmemeli, işlenmiş taksiti olan
+    avansın planı (tutar / taksit) değiştirilememeli.
+    """
+    from payroll import post_advance_cuts
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "ledger.db"), employees=1, months=())
+        adv_id = db.add_advance(1, "2025-01-10", 300.0, 3)
+
+        assert post_advance_cuts(2025, 1) == (1, 100.0)
+        assert db.get_advance_by_id(adv_id)[5] == 200.0
+
+        db.update_advance(adv_id, 1, "2025-01-10", 300.0, 3, 200.0, "açıklama değişti")
+        assert [row[4] for row in db.get_advance_installments(adv_id)] == [1, 0, 0]
+        assert post_advance_cuts(2025, 1) == (0, 0)
+        assert db.get_advance_by_id(adv_id)[5] == 200.0
+
+        try:
+            db.update_advance(adv_id, 1, "2025-01-10", 600.0, 3, 500.0, "")
+            raise AssertionError("işlenmiş taksitli avansın planı değiştirilebildi")
+        except ValueError:
+            pass
+        assert db.get_advance_by_id(adv_id)[3] == 300.0
+
+        assert post_advance_cuts(2025, 2) == (1, 100.0)
+        assert db.get_advance_by_id(adv_id)[5] == 100.0
+
+        # İşlenmemiş avansın planı değiştirilebilir; taksitler yeniden üretilir
+        other_id = db.add_advance(1, "2025-03-05", 500.0, 2)
+        db.update_advance(other_id, 1, "2025-03-05", 600.0, 3, 600.0, "")
+        assert [row[3] for row in db.get_advance_installments(other_id)] == [200.0, 200.0, 200.0]
+        db.close_connection()
+
+    print("advance-ledger: düzenleme işlenmiş taksitleri korudu, ikinci kesinti yapılmadı")
+
+
+def bench_yearly_performance(employees):
+    """Şirket geneli yıllık performans: personel başına çağrı vs tek geçiş."""
+    from payroll import calculate_company_year_performance, calculate_year_performance
+
+    year = 2025
+    today = date(2025, 12, 31)
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "bench.db"), employees=employees,
+                        year=year, months=range(1, 13))
+        settings = db.get_settings()
+
+        per_emp_time, per_emp = _timed(
+            lambda: {
+                emp_id: calculate_year_performance(emp_id, year, settings, today)
+                for emp_id in range(1, employees + 1)
+            }
+        )
+        batch_time, batch = _timed(calculate_company_year_performance, year, settings, today)
+        db.close_connection()
+
+    assert all(per_emp[e["employee_id"]] == e["rows"] for e in batch)
+    print(f"yearly-performance: {employees} personel x 12 ay")
+    print(f"  personel başına calculate_year_performance: {per_emp_time * 1000:8.1f} ms")
+    print(f"  calculate_company_year_performance        : {batch_time * 1000:8.1f} ms")
+
+
+def bench_pdf(employees):
+    """Bordro PDF'i: sayfa/saniye ve tepe bellek (tracemalloc, ayrı tur)."""
+    from payroll import calculate_monthly_payroll
+    from pdf_reports import write_payroll_pdf
+
+    year, month = 2025, 3
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "bench.db"), employees=employees,
+                        year=year, months=(month,))
+        rows = calculate_monthly_payroll(year, month)
+        pdf_path = os.path.join(tmp, "bordro.pdf")
+
+        elapsed, pages = _timed(write_payroll_pdf, pdf_path, iter(rows), f"{month:02d}/{year}")
+        size_mb = os.path.getsize(pdf_path) / 1024 / 1024
+
+        tracemalloc.start()
+        write_payroll_pdf(pdf_path, iter(rows), f"{month:02d}/{year}")
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        db.close_connection()
+
+    print(f"pdf: {employees} personel bordrosu")
+    print(f"  süre        : {elapsed:8.2f} s, {pages} sayfa ({pages / elapsed:,.1f} sayfa/s)")
+    print(f"  dosya       : {size_mb:8.2f} MB")
+    print(f"  tepe bellek : {peak / 1024 / 1024:8.1f} MB (tracemalloc)")
+
+
+def bench_batch_payroll(employees, months):
+    """Ay aralığı bordrosu (CSV'ye): tek süreç ile süreç havuzu karşılaştırması."""
+    from batch_payroll import month_span, run_batch_payroll
+
+    span = month_span((2024, 1), (2024 + (months - 1) // 12, (months - 1) % 12 + 1))
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "bench.db"), employees=employees, months=span)
+
+        outputs = {}
+        timings = {}
+        for label, workers in (("tek süreç", 1), (f"havuz ({os.cpu_count()} CPU)", None)):
+            path = os.path.join(tmp, f"batch_{workers}.csv")
+            timings[label], (month_count, rows) = _timed(
+                run_batch_payroll, path, span[0], span[-1], workers=workers
+            )
+            with open(path, "rb") as f:
+                outputs[label] = f.read()
+        db.close_connection()
+
+    assert len(set(outputs.values())) == 1, "tek süreç ve havuz çıktıları farklı"
+    print(f"batch-payroll: {employees} personel x {month_count} ay = {rows} satır (CSV)")
+    for label, seconds in timings.items():
+        print(f"  {label:<20}: {seconds:7.2f} s ({rows / seconds:,.0f} satır/s)")
+    print("  çıktılar birebir aynı")
+
+
+def bench_backup(employees, months):
+    """Online yedek: süre, sayfa sayısı ve yedek sürerken yazan thread'in gecikmesi."""
+    import threading
+
+    from backup import backup_database, verify_backup
+
+    span = [(2025, m) for m in range(1, months + 1)]
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "bench.db"), employees=employees, months=span)
+        db_mb = os.path.getsize(db.DB_NAME) / 1024 / 1024
+
+        # Yedek sürerken ayrı bir thread sürekli küçük yazma işlemleri yapar
+        stop = threading.Event()
+        latencies = []
+
+        def writer():
+            n = 0
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                with db.transaction() as conn:
+                    conn.execute(
+                        "INSERT INTO attendance_logs (employee_id, date, type, hours, note) "
+                        "VALUES (?, '2025-06-01', 'HOUR_LOSS', 1.0, 'bench')",
+                        (n % employees + 1,),
+                    )
+                latencies.append(time.perf_counter() - t0)
+                n += 1
+                time.sleep(0.002)
+            db.close_connection()
+
+        results = {}
+        for label, name, compress in (("düz (.db)", "yedek.db", False),
+                                      ("gzip (.db.gz)", "yedek.db.gz", True)):
+            latencies.clear()
+            stop.clear()
+            thread = threading.Thread(target=writer)
+            thread.start()
+            try:
+                result = backup_database(os.path.join(tmp, name), compress=compress)
+            finally:
+                stop.set()
+                thread.join()
+            verify_time, problems = _timed(verify_backup, result.path)
+            assert not problems, problems
+            results[label] = (result, len(latencies), max(latencies, default=0.0), verify_time)
+        db.close_connection()
+
+    print(f"backup: {employees} personel x {months} ay, veritabanı {db_mb:.1f} MB")
+    for label, (result, writes, worst, verify_time) in results.items():
+        print(f"  {label:<14}: {result.seconds:6.2f} s, {result.pages} sayfa, "
+              f"{result.size / 1024 / 1024:6.1f} MB, doğrulama {verify_time:5.2f} s")
+        print(f"  {'':<14}  yedek sırasında {writes} yazma, en uzun {worst * 1000:.1f} ms")
+
+
+def _legacy_dashboard_draw(names, total_hours_list, missing_hours_list):
+    """Eski DashboardTab çizimi: her seferinde yeni Figure + tight_layout + draw."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(9, 4), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    x = range(len(names))
+    for pos, values in ((121, total_hours_list), (122, missing_hours_list)):
+        ax = fig.add_subplot(pos)
+        ax.bar(x, values)
+        ax.set_xticks(list(x))
+        ax.set_xticklabels(names, rotation=45, ha="right")
+    fig.tight_layout()
+    canvas.draw()
+
+
+def bench_dashboard(employees, months):
+    """Dashboard grafiği: eski tam çizim, yerinde güncelleme ve önbellekten gösterim (Agg)."""
+    from payroll import month_hours_overview
+    from ui_dashboard import DashboardChart, _CachedChart
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "bench.db"), employees=employees,
+                        months=range(1, months + 1))
+        data = {}
+        for m in range(1, months + 1):
+            overview = month_hours_overview(2025, m)
+            data[m] = (tuple(r[0] for r in overview), [r[1] for r in overview],
+                       [r[2] for r in overview])
+        db.close_connection()
+
+    legacy = [_timed(_legacy_dashboard_draw, *data[m])[0] for m in data]
+
+    chart = DashboardChart()
+    entries = {m: _CachedChart(data[m]) for m in data}
+    first = [_timed(chart.show, entries[m], *data[m])[0] for m in data]
+    cached = [_timed(chart.show, entries[m], *data[m])[0] for m in data]
+
+    print(f"dashboard: {employees} personel, {months} ay (ay başına ortanca)")
+    print(f"  eski (yeni Figure + tight_layout) : {statistics.median(legacy) * 1000:8.1f} ms")
+    print(f"  kalıcı canvas, yerinde güncelleme  : {statistics.median(first[1:] or first) * 1000:8.1f} ms")
+    print(f"  önbellekten (restore_region/blit)  : {statistics.median(cached) * 1000:8.1f} ms")
+
+
+def bench_trends(employees, months):
+    """Çok aylık eğilim: tek sorgu + numpy ile ay başına calculate_monthly_payroll karşılaştırması."""
+    import numpy as np
+
+    from payroll import calculate_monthly_payroll, monthly_trends
+    from ui_dashboard import TrendChart
+
+    span = [(2023 + i // 12, i % 12 + 1) for i in range(months)]
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "bench.db"), employees=employees, months=span)
+        today = date(2026, 1, 1)
+
+        trend_time, trends = _timed(monthly_trends, span[0], span[-1], today=today)
+
+        t0 = time.perf_counter()
+        expected = {"missing_hours": [], "overtime_total": [], "advance_total": [], "net_salary": []}
+        for year, month in span:
+            rows = calculate_monthly_payroll(year, month, today=today)
+            expected["missing_hours"].append(sum(r["missing_hours"] for r in rows))
+            expected["overtime_total"].append(sum(r["overtime"] for r in rows))
+            expected["advance_total"].append(sum(r["advance"] for r in rows))
+            expected["net_salary"].append(sum(r["net_salary"] for r in rows))
+        per_month_time = time.perf_counter() - t0
+        db.close_connection()
+
+    for field, values in expected.items():
+        assert np.allclose(getattr(trends, field), values), field
+
+    chart = TrendChart()
+    first_draw, _ = _timed(chart.show, trends)
+    redraw, _ = _timed(chart.show, trends)
+
+    print(f"trends: {employees} personel x {months} ay")
+    print(f"  monthly_trends (tek sorgu + numpy)  : {trend_time * 1000:8.1f} ms")
+    print(f"  ay başına calculate_monthly_payroll : {per_month_time * 1000:8.1f} ms")
+    print(f"  grafik ilk çizim / güncelleme (Agg)  : {first_draw * 1000:8.1f} / {redraw * 1000:.1f} ms")
+    print("  toplamlar aylık bordro ile aynı")
+
+
+def bench_payroll_runs(employees):
+    """Dönem kapanışı: snapshot okuma süresi, kapanış sonrası değişikliklere
+    karşı değişmezlik ve UPDATE engeli (trigger) kontrolü."""
+    import sqlite3
+
+    from payroll import close_period, monthly_payroll, recompute_period, reopen_period
+
+    year, month = 2025, 3
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "bench.db"), employees=employees, months=[(year, month)])
+        today = date(2026, 1, 1)
+
+        live_time, live = _timed(monthly_payroll, year, month, today=today)
+        close_time, closed = _timed(close_period, year, month, today=today)
+        read_time, snapshot = _timed(monthly_payroll, year, month, today=today)
+
+        assert snapshot.is_closed and not snapshot.stale
+        assert [r["net_salary"] for r in snapshot.rows] == [r["net_salary"] for r in live.rows]
+        assert snapshot.totals == live.totals
+
+        # Kapanıştan sonra ücret ve ayar değişikliği snapshot'ı etkilemez
+        db.update_employee(1, "Personel 1", 999.0, "2020-01-01", 1)
+        db.update_settings(8.0, 2.0, 1)
+        after = monthly_payroll(year, month, today=today)
+        assert after.rows == snapshot.rows and after.stale
+        assert after.settings == snapshot.settings
+        changed = monthly_payroll(year, month, today=today, live=True)
+        assert changed.totals != snapshot.totals
+
+        try:
+            db.connection().execute(
+                "UPDATE payroll_run_rows SET net_salary = 0 WHERE year=? AND month=?", (year, month)
+            )
+            raise AssertionError("kapanmış dönem satırı güncellenebildi")
+        except sqlite3.IntegrityError:
+            db.connection().rollback()
+
+        try:
+            close_period(year, month, today=today)
+            raise AssertionError("dönem iki kez kapatılabildi")
+        except ValueError:
+            pass
+
+        recompute_time, recomputed = _timed(recompute_period, year, month, today=today)
+        assert recomputed.totals == changed.totals and not recomputed.stale
+        assert reopen_period(year, month) and not monthly_payroll(year, month, today=today).is_closed
+        db.close_connection()
+
+    print(f"payroll-runs: {employees} personel, {month:02d}/{year}")
+    print(f"  canlı hesap (calculate_monthly_payroll) : {live_time * 1000:8.1f} ms")
+    print(f"  dönemi kapatma (hesap + snapshot yazma)  : {close_time * 1000:8.1f} ms")
+    print(f"  kapalı dönemi okuma (snapshot)           : {read_time * 1000:8.1f} ms")
+    print(f"  yeniden hesapla (aç + kapat)             : {recompute_time * 1000:8.1f} ms")
+    print("  snapshot ücret / ayar değişikliğinden etkilenmedi, UPDATE engellendi")
+
+
+_FIRST_NAMES = [
+    "Ahmet", "Ayşe", "Çağla", "Emre", "Elif", "Gökhan", "Gülşen", "Hüseyin", "Işıl", "İbrahim",
+    "İpek", "Kemal", "Mehmet", "Merve", "Oğuz", "Özge", "Şükrü", "Şeyma", "Ümit", "Zeynep",
+]
+_LAST_NAMES = [
+    "Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Öztürk", "Aydın", "Özdemir", "Arslan",
+    "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Koç", "Kurt", "Özkan", "Şimşek", "Işık",
+]
+
+
+def bench_employee_search(names, seed=7):
+    """Personel seçici: önek indeksi kurulumu ve tuş başına arama süresi.
+
+    Rastgele isimler harf harf yazılır (isim başı ve soyadı); her tuşta
+    EmployeeDirectory.search çağrılır. Sonuçlar düz tarama ile karşılaştırılır.
+    """
+    from employee_directory import SEARCH_LIMIT, get_employee_directory
+    from utils import search_key
+
+    rnd = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_NAME = os.path.join(tmp, "bench.db")
+        db.init_db()
+        with db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO employees (name, hourly_rate, start_date, is_active) VALUES (?, ?, ?, 1)",
+                [
+                    (f"{rnd.choice(_FIRST_NAMES)} {rnd.choice(_LAST_NAMES)}{rnd.randrange(1000)}",
+                     100.0, "2020-01-01")
+                    for _ in range(names)
+                ],
+            )
+
+        directory = get_employee_directory()
+        build_time, _ = _timed(directory.active_labels)
+        employees = directory.active()
+
+        timings = []
+        for emp in rnd.sample(employees, 200):
+            for word in (emp.name, emp.name.split()[-1]):
+                typed = ""
+                for ch in word.upper() if rnd.random() < 0.3 else word.lower():
+                    typed += ch
+                    t0 = time.perf_counter()
+                    found = directory.search(typed)
+                    timings.append(time.perf_counter() - t0)
+                    assert directory.label(emp.id) in found or len(found) == SEARCH_LIMIT
+
+        # Düz tarama ile aynı adaylar (sınırın altında kalan sorgular için)
+        for query in ("ış", "SEYMA", "ozdemir 1", "çağla k"):
+            key = search_key(query)
+            expected = {
+                directory.label(e.id) for e in employees
+                if any(" ".join(search_key(e.name).split()[i:]).startswith(key)
+                       for i in range(len(e.name.split())))
+            }
+            found = directory.search(query, limit=len(employees))
+            assert set(found) == expected, query
+        db.close_connection()
+
+    timings.sort()
+    print(f"employee-search: {names} isim, {len(timings)} tuş")
+    print(f"  dizin + önek indeksi kurulumu : {build_time * 1000:8.1f} ms")
+    print(f"  tuş başına arama (medyan)     : {statistics.median(timings) * 1000:8.3f} ms")
+    print(f"  tuş başına arama (p99 / max)  : {timings[int(len(timings) * 0.99)] * 1000:8.3f}"
+          f" / {timings[-1] * 1000:.3f} ms")
+    print("  sonuçlar düz tarama ile aynı")
+
+
+_NOTE_WORDS = [
+    "rapor", "raporlu", "doktor", "hastane", "izin", "düğün", "cenaze", "trafik", "geç",
+    "kaynak", "şantiye", "boya", "montaj", "sevkiyat", "sayım", "bayram", "kira", "okul",
+    "acil", "bakım", "gece", "hafta", "sonu", "tamir", "nöbet", "ihale", "teslim",
+]
+
+
+def bench_search(employees, months):
+    """Global arama: FTS5 indeksi ile LIKE taraması karşılaştırması.
+
+    Örnek veritabanındaki kayıtların ~%10'unun notu / açıklaması rastgele
+    kelimelerle güncellenir (indeks trigger'larla güncel kalır); sonuçlar
+    Python'da kelime öneki kontrolüyle doğrulanır.
+    """
+    import re
+
+    from db import SEARCH_SOURCES, search_records
+
+    rnd = random.Random(3)
+    span = [(2024 + i // 12, i % 12 + 1) for i in range(months)]
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "bench.db"), employees=employees, months=span)
+
+        t0 = time.perf_counter()
+        records = 0
+        with db.transaction() as conn:
+            for _, _, table, column in SEARCH_SOURCES:
+                ids = [row[0] for row in conn.execute(f"SELECT id FROM {table}") if rnd.random() < 0.1]
+                conn.executemany(
+                    f"UPDATE {table} SET {column} = ? WHERE id = ?",
+                    [(" ".join(rnd.sample(_NOTE_WORDS, rnd.randint(1, 4))), row_id) for row_id in ids],
+                )
+                records += len(ids)
+        index_time = time.perf_counter() - t0
+
+        queries = ["rapor", "kayn", "şantiye", "SANTIYE", "gece nöbet", "düğün izin"]
+        fts_times, like_times = [], []
+        for query in queries:
+            # Arama penceresindeki gibi ilk SEARCH_RESULT_LIMIT sonuç
+            fts_times.append(_timed(search_records, query)[0])
+            hits = search_records(query, limit=records)
+
+            # Beklenen: her sorgu kelimesi, metindeki bir kelimenin öneki
+            words = [search_word(w) for w in re.findall(r"\w+", query)]
+            expected = set()
+            like_t0 = time.perf_counter()
+            for kind, _, table, column in SEARCH_SOURCES:
+                like = " AND ".join(f"{column} LIKE ?" for _ in words)
+                rows = db.connection().execute(
+                    f"SELECT id, {column} FROM {table} WHERE {like}", [f"%{w}%" for w in words]
+                ).fetchall()
+                like_times.append(time.perf_counter() - like_t0)
+                like_t0 = time.perf_counter()
+            for kind, _, table, column in SEARCH_SOURCES:
+                for row_id, text in db.connection().execute(f"SELECT id, {column} FROM {table}"):
+                    tokens = [search_word(t) for t in re.findall(r"\w+", text or "")]
+                    if all(any(t.startswith(w) for t in tokens) for w in words):
+                        expected.add((kind, row_id))
+            assert {(h.kind, h.record_id) for h in hits} == expected, query
+        db.close_connection()
+
+    print(f"search: {records} notlu kayıt, {len(queries)} sorgu")
+    print(f"  notların yazılması (trigger ile indeksleme) : {index_time * 1000:8.1f} ms")
+    print(f"  FTS5 arama (sorgu başına, ilk 200 sonuç)    : {statistics.median(fts_times) * 1000:8.1f} ms")
+    print(f"  LIKE taraması (sorgu başına)                : {sum(like_times) / len(queries) * 1000:8.1f} ms")
+    print("  sonuçlar kelime öneki kontrolüyle aynı")
+
+
+class _ListTree:
+    """DataGrid ölçümleri için Treeview'un kullanılan kısmı (ekran gerektirmez)."""
+
+    def __init__(self):
+        self.items = {}
+        self.order = []
+
+    def configure(self, **kwargs):
+        pass
+
+    def insert(self, parent, index, iid, values):
+        self.items[iid] = values
+        self.order.insert(len(self.order) if index == "end" else index, iid)
+
+    def item(self, iid, values):
+        self.items[iid] = values
+
+    def delete(self, *iids):
+        for iid in iids:
+            del self.items[iid]
+            self.order.remove(iid)
+
+    def get_children(self):
+        return tuple(self.order)
+
+    def move(self, iid, parent, index):
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+
+def bench_attendance_bulk(employees, marks):
+    """Toplu devamsızlık girişi: kayıt başına form kaydı + ay listesinin
+    yeniden yüklenmesi ile tek transaction + sadece yeni satırların listeye
+    eklenmesi (DataGrid.upsert_rows) karşılaştırması."""
+    from data_grid import DataGrid, date_desc_key
+
+    year, month = 2025, 3
+    month_start, month_end = (d.isoformat() for d in month_date_range(year, month))
+    rnd = random.Random(5)
+    rows = [
+        (emp_id, date(year, month, rnd.randint(1, 28)).isoformat(), rnd.choice(ATTENDANCE_TYPES[1:]), 0.0, "")
+        for emp_id in rnd.sample(range(1, employees + 1), marks)
+    ]
+
+    def list_rows():
+        return [
+            (str(att_id), (d_str, name, typ, hrs, note or ""))
+            for att_id, _, d_str, name, typ, hrs, note
+            in db.iter_attendance_list(month_start, month_end).fetchall()
+        ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "bench.db"), employees=employees, months=[(year, month)])
+        last_id = db.connection().execute("SELECT MAX(id) FROM attendance_logs").fetchone()[0]
+
+        # Eski akış: her kayıt ayrı commit + ayın tüm listesi yeniden
+        grid = DataGrid(_ListTree())
+        grid.set_rows(list_rows())
+        t0 = time.perf_counter()
+        for row in rows:
+            db.add_attendance(*row)
+            grid.set_rows(list_rows())
+        single_time = time.perf_counter() - t0
+        expected = grid.rows
+
+        with db.transaction() as conn:
+            conn.execute("DELETE FROM attendance_logs WHERE id > ?", (last_id,))
+
+        # Toplu giriş: tek executemany + sadece yeni satırlar
+        grid = DataGrid(_ListTree())
+        grid.set_rows(list_rows())
+        t0 = time.perf_counter()
+        new_ids = db.add_attendance_batch(rows)
+        grid.upsert_rows(
+            ((str(att_id), (d_str, name, typ, hrs, note or ""))
+             for att_id, _, d_str, name, typ, hrs, note in db.get_attendance_list_rows(new_ids)),
+            key=date_desc_key,
+        )
+        bulk_time = time.perf_counter() - t0
+
+        assert len(new_ids) == marks
+        # Yeni id'ler farklı; içerik tam yenilemedekiyle aynı, sıralama korunmuş olmalı
+        assert sorted(v for _, v in grid.rows) == sorted(v for _, v in expected)
+        keys = [date_desc_key(values) for _, values in grid.rows]
+        assert keys == sorted(keys)
+        assert {iid for iid, _ in grid.rows} == {iid for iid, _ in list_rows()}
+        assert grid.tree.order == [iid for iid, _ in grid.rows[:grid._shown_count]]
+        db.close_connection()
+
+    print(f"attendance-bulk: {employees} personel, {marks} kayıt, {len(expected)} satırlık ay listesi")
+    print(f"  kayıt başına kaydet + listeyi yenile : {single_time * 1000:8.1f} ms")
+    print(f"  toplu kaydet + sadece yeni satırlar  : {bulk_time * 1000:8.1f} ms")
+    print("  liste sırası ve içeriği tam yenileme ile aynı")
+
+
+def bench_overtime_bulk(employees, shift):
+    """Toplu mesai: kişi başına form kaydı (ayar okuma + ücret + commit +
+    listenin yeniden yüklenmesi) ile tek geçişte hesap + tek transaction
+    karşılaştırması; tutarlar overtime_amount ile birebir aynı olmalı."""
+    from data_grid import DataGrid, date_desc_key
+    from employee_directory import get_employee_directory
+    from payroll import overtime_amount, post_overtime_batch, prepare_overtime_batch
+
+    year, month = 2025, 3
+    month_start, month_end = (d.isoformat() for d in month_date_range(year, month))
+    date_str, hours = date(year, month, 14).isoformat(), 3.0
+
+    def list_rows():
+        return [
+            (str(ot_id), (d_str, name, hrs, rate, total, desc or ""))
+            for ot_id, d_str, name, hrs, rate, total, desc, _
+            in db.iter_overtime_list(month_start, month_end).fetchall()
+        ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "bench.db"), employees=employees, months=[(year, month)])
+        team = random.Random(9).sample(get_employee_directory().active(), shift)
+        last_id = db.connection().execute("SELECT MAX(id) FROM overtimes").fetchone()[0]
+
+        # Eski akış: her kişi için ayarlar + ücret + ayrı commit + tüm liste
+        grid = DataGrid(_ListTree())
+        grid.set_rows(list_rows())
+        t0 = time.perf_counter()
+        for emp in team:
+            rate, total = overtime_amount(hours, emp.hourly_rate, db.get_settings())
+            db.add_overtime(emp.id, date_str, hours, rate, total, "vardiya")
+            grid.set_rows(list_rows())
+        single_time = time.perf_counter() - t0
+        expected = grid.rows
+
+        with db.transaction() as conn:
+            conn.execute("DELETE FROM overtimes WHERE id > ?", (last_id,))
+
+        grid = DataGrid(_ListTree())
+        grid.set_rows(list_rows())
+        t0 = time.perf_counter()
+        batch = prepare_overtime_batch(team, date_str, hours)
+        preview_time = time.perf_counter() - t0
+        new_ids = post_overtime_batch(batch, "vardiya")
+        grid.upsert_rows(
+            ((str(ot_id), (d_str, name, hrs, rate, total, desc or ""))
+             for ot_id, d_str, name, hrs, rate, total, desc, _ in db.get_overtime_list_rows(new_ids)),
+            key=date_desc_key,
+        )
+        bulk_time = time.perf_counter() - t0
+
+        assert len(new_ids) == shift
+        for emp, (emp_id, _, _, rate, total) in zip(team, batch.rows):
+            assert emp_id == emp.id and (rate, total) == overtime_amount(hours, emp.hourly_rate)
+        assert batch.total == sum(row[4] for row in batch.rows)
+        assert sorted(v for _, v in grid.rows) == sorted(v for _, v in expected)
+        keys = [date_desc_key(values) for _, values in grid.rows]
+        assert keys == sorted(keys)
+        db.close_connection()
+
+    print(f"overtime-bulk: {shift} kişilik vardiya x {hours:g} saat, {len(expected)} satırlık ay listesi")
+    print(f"  kişi başına kaydet + listeyi yenile    : {single_time * 1000:8.1f} ms")
+    print(f"  önizleme (tek geçişte ücret + toplam)  : {preview_time * 1000:8.3f} ms")
+    print(f"  toplu kaydet + sadece yeni satırlar    : {bulk_time * 1000:8.1f} ms")
+    print(f"  toplam maliyet {batch.total:.2f}; tutarlar overtime_amount ile aynı")
+
+
+def search_word(word):
+    """FTS5 unicode61 remove_diacritics ile aynı sadeleştirme (karşılaştırma için)."""
+    import unicodedata
+
+    decomposed = unicodedata.normalize("NFD", word.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+# Ayrı bir Python sürecinde çalışır: tepe RSS süreç başına ölçülebildiği için
+# her yöntem kendi sürecinde koşar.
+_EXCEL_EXPORT_PROBE = r"""
+import json, sys, time, tracemalloc
+import db
+from payroll import overtime_report_rows, write_overtime_year_xlsx
+from work_calendar import MONTH_NAMES_TR
+
+db.DB_NAME, mode, out_path, year = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4])
+trace = sys.argv[5] == "trace"
+if trace:
+    tracemalloc.start()
+
+t0 = time.perf_counter()
+if mode == "stream":
+    rows = write_overtime_year_xlsx(out_path, year)
+else:
+    # Eski yöntem: fetchall + bellekte Workbook()
+    from openpyxl import Workbook
+    wb = Workbook()
+    wb.remove(wb.active)
+    rows = 0
+    for m in range(1, 13):
+        ws = wb.create_sheet(f"{MONTH_NAMES_TR[m - 1]} {year}")
+        ws.append(["Tarih", "Personel", "Saat", "Ücret", "Toplam", "Açıklama"])
+        data = list(overtime_report_rows(year, m))
+        for vals in data:
+            ws.append(list(vals))
+        rows += len(data)
+    wb.save(out_path)
+elapsed = time.perf_counter() - t0
+peak_heap = tracemalloc.get_traced_memory()[1] if trace else None
+
+try:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = peak if sys.platform == "darwin" else peak * 1024
+except ImportError:
+    peak = None
+print(json.dumps({"rows": rows, "seconds": elapsed, "peak_rss": peak, "peak_heap": peak_heap}))
+"""
+
+
+def bench_excel_export(rows):
+    """Yıllık mesai Excel'i (ay başına bir sayfa): satır/saniye ve tepe RSS.
+
+    write_only + cursor akışı ile eski fetchall + bellekte Workbook yöntemi
+    karşılaştırılır. RSS, SQLite'ın mmap / sayfa önbelleğini de içerir; Python
+    yığınındaki tepe ayrıca (tracemalloc, süre ölçülmeyen ikinci turda) verilir.
+    """
+    year = 2025
+    employees = max(1, rows // 24)  # personel başına ayda ~2 mesai
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_sample_db(db_path, employees=employees, year=year, months=range(1, 13))
+        db.close_connection()
+
+        def probe(mode, trace):
+            out = subprocess.run(
+                [sys.executable, "-c", _EXCEL_EXPORT_PROBE, db_path, mode,
+                 os.path.join(tmp, f"{mode}.xlsx"), str(year), "trace" if trace else "-"],
+                cwd=here, capture_output=True, text=True, check=True,
+            ).stdout
+            return json.loads(out.strip().splitlines()[-1])
+
+        for mode in ("legacy", "stream"):
+            results[mode] = probe(mode, trace=False)
+            results[mode]["peak_heap"] = probe(mode, trace=True)["peak_heap"]
+
+    def mb(value):
+        return f"{value / 1024 / 1024:6.1f} MB" if value else "     -"
+
+    print(f"excel-export: {results['stream']['rows']} mesai satırı, 12 sayfa")
+    for mode, label in (("legacy", "bellekte Workbook"), ("stream", "write_only akış ")):
+        r = results[mode]
+        print(f"  {label}: {r['seconds']:7.2f} s ({r['rows'] / r['seconds']:,.0f} satır/s), "
+              f"tepe RSS {mb(r['peak_rss'])}, tepe Python yığını {mb(r['peak_heap'])}")
+
+
+# Ayrı bir Python sürecinde çalışır: soğuk import + ilk çizim süresi.
+_STARTUP_PROBE = r"""
+import json, os, sys, tempfile, time
+t0 = time.perf_counter()
+import patron_app
+import db
+t_import = time.perf_counter() - t0
+
+result = {"import": t_import, "first_frame": None, "all_tabs": None}
+heavy = ("matplotlib", "tkcalendar", "openpyxl", "reportlab")
+result["loaded_at_import"] = [m for m in heavy if m in sys.modules]
+
+if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_NAME = os.path.join(tmp, "startup.db")
+        db.init_db()
+        t0 = time.perf_counter()
+        app = patron_app.PatronApp(role="PATRON")
+        app.update()
+        result["first_frame"] = time.perf_counter() - t0
+        result["loaded_at_first_frame"] = [m for m in heavy if m in sys.modules]
+        t0 = time.perf_counter()
+        for attr, _, _, _ in patron_app.TAB_SPECS:
+            app.ensure_tab(attr)
+        app.update()
+        result["all_tabs"] = time.perf_counter() - t0
+        app.on_close()
+        db.close_connection()
+
+print(json.dumps(result))
+"""
+
+
+def bench_startup(repeat):
+    """Açılış süresi: patron_app import'u ve ilk pencerenin çizilmesi.
+
+    Her tur yeni bir Python sürecinde ölçülür (import önbelleği yok); medyan
+    raporlanır. Ekran (DISPLAY) yoksa sadece import süresi ölçülür.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _STARTUP_PROBE],
+            cwd=here, capture_output=True, text=True, check=True,
+        ).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+
+    def median_ms(key):
+        values = [r[key] for r in runs if r[key] is not None]
+        return f"{statistics.median(values) * 1000:8.1f} ms" if values else "     (ekran yok)"
+
+    print(f"startup: {repeat} tur (medyan)")
+    print(f"  patron_app import           : {median_ms('import')}")
+    print(f"  PatronApp -> ilk çizim      : {median_ms('first_frame')}")
+    print(f"  tüm sekmelerin kurulması    : {median_ms('all_tabs')}")
+    print(f"  import'ta yüklenen ağır modüller: {', '.join(runs[-1]['loaded_at_import']) or '-'}")
+    if "loaded_at_first_frame" in runs[-1]:
+        print(f"  ilk çizimde yüklenen ağır modüller: "
+              f"{', '.join(runs[-1]['loaded_at_first_frame']) or '-'}")
+
+
+def _naive_working_days(start, end, include_weekends):
+    """Eski yöntem: [start, end) arası gün gün sayım."""
+    d = start
+    count = 0
+    while d < end:
+        if include_weekends or d.weekday() < 5:
+            count += 1
+        d += timedelta(days=1)
+    return count
+
+
+def check_working_days(cases, seed=1):
+    """work_calendar'ı rastgele aralıklarda gün gün sayım ile karşılaştırır.
+
+    Tekil, ay bazlı ve toplu (matris) hesapların hepsi kontrol edilir;
+    uyuşmazlık olursa hata kodu ile çıkar.
+    """
+    import work_calendar as wc
+
+    rnd = random.Random(seed)
+    base = date(1990, 1, 1)
+    failures = 0
+
+    # 1) Rastgele [start, end) aralıkları
+    for _ in range(cases):
+        start = base + timedelta(days=rnd.randrange(20000))
+        end = start + timedelta(days=rnd.randrange(-10, 800))
+        weekends = rnd.random() < 0.5
+        expected = _naive_working_days(start, end, weekends)
+        got = wc.count_working_days(start, end, weekends)
+        if got != expected:
+            failures += 1
+            print(f"[HATA] {start}..{end} hafta sonu={weekends}: {got} != {expected}")
+
+    # 2) Personel x ay matrisi (bugün kesintisi dahil)
+    today = date(2025, 6, 18)
+    starts = [
+        (date(2023, 1, 1) + timedelta(days=rnd.randrange(1000))).isoformat()
+        for _ in range(min(cases, 2000))
+    ] + [None, "", "geçersiz"]
+    periods = [(y, m) for y in (2024, 2025) for m in range(1, 13)]
+    for weekends in (False, True):
+        matrix = wc.working_days_matrix(starts, periods, weekends, today)
+        for start_str, row in zip(starts, matrix):
+            start_dt = wc.parse_start_date(start_str)
+            for (y, m), got in zip(periods, row):
+                expected = 0
+                if start_dt is not None:
+                    m_start, _ = wc.month_date_range(y, m)
+                    expected = _naive_working_days(
+                        max(start_dt, m_start), wc.month_period_end(y, m, today), weekends
+                    )
+                single = wc.working_days_for_month(start_str, y, m, weekends, today)
+                if not (got == single == expected):
+                    failures += 1
+                    print(f"[HATA] {start_str} {m:02d}/{y}: matris={got} tekil={single} beklenen={expected}")
+
+    checked_cells = len(starts) * len(periods) * 2
+
+    # Süre karşılaştırması: 10k personel x 12 ay
+    starts = [
+        (date(2020, 1, 1) + timedelta(days=rnd.randrange(2000))).isoformat() for _ in range(10000)
+    ]
+    periods = [(2025, m) for m in range(1, 13)]
+    naive_time, _ = _timed(
+        lambda: [
+            [
+                _naive_working_days(
+                    max(wc.parse_start_date(s), wc.month_date_range(y, m)[0]),
+                    wc.month_period_end(y, m, today), False,
+                )
+                for y, m in periods
+            ]
+            for s in starts
+        ]
+    )
+    matrix_time, _ = _timed(wc.working_days_matrix, starts, periods, False, today)
+
+    print(f"working-days: {cases} rastgele aralık + {checked_cells} personel/ay hücresi kontrol edildi")
+    print(f"  gün gün döngü (10k x 12 ay)   : {naive_time * 1000:8.1f} ms")
+    print(f"  working_days_matrix          : {matrix_time * 1000:8.1f} ms")
+
+    if failures:
+        sys.exit(f"{failures} uyuşmazlık bulundu.")
+
+
+# (açıklama, sorgu, planda geçmesi gereken index)
+HOT_QUERY_PLANS = [
+    (
+        "personel+ay devamsızlık toplamı",
+        "SELECT COALESCE(SUM(hours), 0) FROM attendance_logs "
+        "WHERE employee_id = ? AND date >= ? AND date < ?",
+        "COVERING INDEX idx_attendance_emp_date",
+    ),
+    (
+        "personel+ay mesai toplamı",
+        "SELECT COALESCE(SUM(hours), 0), COALESCE(SUM(total), 0) FROM overtimes "
+        "WHERE employee_id = ? AND date >= ? AND date < ?",
+        "COVERING INDEX idx_overtimes_emp_date",
+    ),
+    (
+        "personel+ay avans toplamı",
+        "SELECT COALESCE(SUM(amount), 0) FROM advances "
+        "WHERE employee_id = ? AND date >= ? AND date < ?",
+        "COVERING INDEX idx_advances_emp_date",
+    ),
+    (
+        "personel yıllık özet",
+        "SELECT month, missing_hours, overtime_hours, overtime_total, advance_total "
+        "FROM monthly_employee_summary WHERE employee_id=? AND year=?",
+        "PRIMARY KEY",
+    ),
+    (
+        "get_attendance_for_month",
+        "SELECT date, type, hours FROM attendance_logs "
+        "WHERE employee_id=? AND date>=? AND date<?",
+        "idx_attendance_emp_date",
+    ),
+    (
+        "get_overtime_for_month",
+        "SELECT date, hours, rate, total FROM overtimes "
+        "WHERE employee_id=? AND date>=? AND date<?",
+        "idx_overtimes_emp_date",
+    ),
+    (
+        "devamsızlık aylık liste",
+        "SELECT a.id, a.date, e.name, a.type, a.hours, a.note FROM attendance_logs a "
+        "JOIN employees e ON e.id = a.employee_id WHERE a.date >= ? AND a.date < ? "
+        "ORDER BY a.date DESC, e.name",
+        "idx_attendance_date_emp",
+    ),
+    (
+        "mesai aylık liste",
+        "SELECT o.id, o.date, e.name, o.hours, o.rate, o.total, o.description FROM overtimes o "
+        "JOIN employees e ON e.id = o.employee_id WHERE o.date >= ? AND o.date < ? "
+        "ORDER BY o.date DESC, e.name",
+        "idx_overtimes_date_emp",
+    ),
+    (
+        "avans aylık liste",
+        "SELECT a.id, e.name, a.date, a.amount, a.description FROM advances a "
+        "JOIN employees e ON e.id = a.employee_id WHERE a.date >= ? AND a.date < ? "
+        "ORDER BY a.date DESC, e.name",
+        "idx_advances_date_emp",
+    ),
+    (
+        "ayın avans taksitleri",
+        "SELECT a.id, a.date, a.amount, a.installments, a.remaining "
+        "FROM advance_installments i JOIN advances a ON a.id = i.advance_id "
+        "WHERE i.year = ? AND i.month = ? AND i.posted = 0 ORDER BY a.id",
+        "idx_installments_period",
+    ),
+]
+
+
+def check_query_plans():
+    """Sık kullanılan tarih aralıklı sorguların index kullandığını doğrular.
+
+    EXPLAIN QUERY PLAN çıktısında beklenen index yoksa (tam tablo taraması)
+    hata kodu ile çıkar; migration'lar değiştiğinde regresyon kontrolü olarak çalıştırın.
+    """
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        build_sample_db(os.path.join(tmp, "plans.db"), employees=200)
+        c = db.connection().cursor()
+        c.execute("ANALYZE")
+        for label, sql, expected in HOT_QUERY_PLANS:
+            params = (1, "2025-01-01", "2025-02-01")[-sql.count("?"):]
+            c.execute("EXPLAIN QUERY PLAN " + sql, params)
+            plan = " | ".join(row[3] for row in c.fetchall())
+            ok = expected in plan
+            failures += not ok
+            print(f"[{'OK' if ok else 'HATA'}] {label}: {plan}")
+        db.close_connection()
+
+    if failures:
+        sys.exit(f"{failures} sorgu beklenen index'i kullanmıyor.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Personel Takip performans ölçümleri")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("payroll", help="Aylık maaş hesaplama motoru")
+    p.add_argument("--employees", type=int, default=10000)
+
+    sub.add_parser("query-plans", help="Tarih aralıklı sorguların index kullanımı")
+
+    p = sub.add_parser("excel-import", help="Devamsızlık Excel içe aktarımı")
+    p.add_argument("--rows", type=int, default=50000)
+
+    p = sub.add_parser("working-days", help="Çalışma günü formülü doğruluk + süre kontrolü")
+    p.add_argument("--cases", type=int, default=20000)
+
+    p = sub.add_parser("summary", help="Aylık özet tablosu tutarlılığı")
+    p.add_argument("--employees", type=int, default=2000)
+
+    sub.add_parser("advance-ledger", help="Avans düzenlemesinde taksit defteri tutarlılığı")
+
+    p = sub.add_parser("yearly-performance", help="Şirket geneli yıllık performans")
+    p.add_argument("--employees", type=int, default=2000)
+
+    p = sub.add_parser("startup", help="Açılış süresi (import + ilk çizim)")
+    p.add_argument("--repeat", type=int, default=5)
+
+    p = sub.add_parser("pdf", help="Bordro PDF üretimi")
+    p.add_argument("--employees", type=int, default=5000)
+
+    p = sub.add_parser("excel-export", help="Excel dışa aktarımı (write_only akış)")
+    p.add_argument("--rows", type=int, default=100000)
+
+    p = sub.add_parser("batch-payroll", help="Ay aralığı için toplu bordro")
+    p.add_argument("--employees", type=int, default=2000)
+    p.add_argument("--months", type=int, default=24)
+
+    p = sub.add_parser("backup", help="Online veritabanı yedeği")
+    p.add_argument("--employees", type=int, default=5000)
+    p.add_argument("--months", type=int, default=12)
+
+    p = sub.add_parser("dashboard", help="Dashboard grafiği çizimi")
+    p.add_argument("--employees", type=int, default=300)
+    p.add_argument("--months", type=int, default=6)
+
+    p = sub.add_parser("trends", help="Çok aylık eğilim grafiği")
+    p.add_argument("--employees", type=int, default=1000)
+    p.add_argument("--months", type=int, default=36)
+
+    p = sub.add_parser("payroll-runs", help="Dönem kapanışı (snapshot) okuma ve değişmezlik")
+    p.add_argument("--employees", type=int, default=5000)
+
+    p = sub.add_parser("employee-search", help="Personel seçici önek araması")
+    p.add_argument("--names", type=int, default=10000)
+
+    p = sub.add_parser("search", help="Not / açıklama tam metin araması (FTS5)")
+    p.add_argument("--employees", type=int, default=2000)
+    p.add_argument("--months", type=int, default=24)
+
+    p = sub.add_parser("attendance-bulk", help="Toplu devamsızlık girişi (tek transaction)")
+    p.add_argument("--employees", type=int, default=2000)
+    p.add_argument("--marks", type=int, default=40)
+
+    p = sub.add_parser("overtime-bulk", help="Toplu mesai (tek geçişte ücret, tek transaction)")
+    p.add_argument("--employees", type=int, default=2000)
+    p.add_argument("--shift", type=int, default=60)
+
+    args = parser.parse_args()
+    if args.bench == "payroll":
+        bench_payroll(args.employees)
+    elif args.bench == "query-plans":
+        check_query_plans()
+    elif args.bench == "excel-import":
+        bench_excel_import(args.rows)
+    elif args.bench == "working-days":
+        check_working_days(args.cases)
+    elif args.bench == "summary":
+        check_monthly_summary(args.employees)
+    elif args.bench == "advance-ledger":
+        check_advance_ledger()
+    elif args.bench == "yearly-performance":
+        bench_yearly_performance(args.employees)
+    elif args.bench == "startup":
+        bench_startup(args.repeat)
+    elif args.bench == "pdf":
+        bench_pdf(args.employees)
+    elif args.bench == "excel-export":
+        bench_excel_export(args.rows)
+    elif args.bench == "batch-payroll":
+        bench_batch_payroll(args.employees, args.months)
+    elif args.bench == "backup":
+        bench_backup(args.employees, args.months)
+    elif args.bench == "dashboard":
+        bench_dashboard(args.employees, args.months)
+    elif args.bench == "trends":
+        bench_trends(args.employees, args.months)
+    elif args.bench == "payroll-runs":
+        bench_payroll_runs(args.employees)
+    elif args.bench == "employee-search":
+        bench_employee_search(args.names)
+    elif args.bench == "search":
+        bench_search(args.employees, args.months)
+    elif args.bench == "attendance-bulk":
+        bench_attendance_bulk(args.employees, args.marks)
+    elif args.bench == "overtime-bulk":
+        bench_overtime_bulk(args.employees, args.shift)
+
+
+if __name__ == "__main__":
+    main()
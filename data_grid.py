@@ -0,0 +1,214 @@
+"""ttk.Treeview için sayfalı / fark bazlı liste yardımcısı.
+
+Büyük listelerde tüm satırları Treeview'a tek tek eklemek (ve yenilemede tek
+tek silmek) saniyeler sürer. DataGrid:
+- Satırların tamamını bellekte tutar, Treeview'a sadece ilk sayfayı ekler;
+  liste sonuna yaklaşıldıkça (kaydırma) sıradaki sayfa eklenir.
+- Yenilemede sadece değişen iid'lere dokunur: silinenler tek delete(*iids)
+  çağrısıyla kaldırılır, değeri değişen satırlar item() ile güncellenir,
+  yeni satırlar eklenir. Fark çok büyükse tablo tek seferde temizlenip
+  yeniden doldurulur.
+
+Kullanım:
+    self.grid = DataGrid(self.tree)
+    self.grid.set_rows([(str(row_id), (değer1, değer2, ...)), ...])
+"""
+from datetime import date
+
+# İlk açılışta ve her kaydırmada eklenen satır sayısı
+PAGE_SIZE = 200
+
+# Görünen alanın bu oranı geçilince sıradaki sayfa eklenir
+LOAD_MORE_THRESHOLD = 0.9
+
+# Değişen satır oranı bunu aşarsa fark yerine tam yenileme yapılır
+FULL_REFRESH_RATIO = 0.5
+
+
+def date_desc_key(values):
+    """upsert_rows için sıra anahtarı: ilk sütun tarih (yeniden eskiye), sonra
+    ikinci sütun (isim); "ORDER BY date DESC, name" ile sıralı listeler için."""
+    return -date.fromisoformat(values[0]).toordinal(), values[1]
+
+
+class DataGrid:
+    def __init__(self, tree, page_size=PAGE_SIZE, scrollbar=None):
+        self.tree = tree
+        self.page_size = page_size
+        self.scrollbar = scrollbar
+
+        self.rows = []            # [(iid, values), ...] – tüm satırlar
+        self._positions = {}      # iid -> rows içindeki sıra
+        self._shown = {}          # Treeview'da olan iid -> values
+        self._shown_count = 0     # rows'un ilk kaç satırı Treeview'da
+        self._load_pending = False
+
+        tree.configure(yscrollcommand=self._on_yscroll)
+
+    # -------------------------------------------------
+    #   Dış API
+    # -------------------------------------------------
+    def set_rows(self, rows):
+        """Listeyi verilen satırlarla günceller (iid'ler benzersiz olmalı).
+
+        Daha önce kaydırılarak yüklenmiş satır sayısı korunur; böylece bir
+        kayıt düzenlendikten sonra liste başa sarmaz.
+        """
+        self.rows = list(rows)
+        self._positions = {iid: i for i, (iid, _) in enumerate(self.rows)}
+
+        target = min(len(self.rows), max(self.page_size, self._shown_count))
+        wanted = self.rows[:target]
+
+        changed = sum(
+            1 for iid, values in wanted if self._shown.get(iid) != tuple(values)
+        )
+        removed = [iid for iid in self._shown if iid not in self._positions
+                   or self._positions[iid] >= target]
+
+        if not self._shown or changed + len(removed) > FULL_REFRESH_RATIO * max(target, 1):
+            self._replace_all(wanted)
+        else:
+            self._apply_diff(wanted, removed)
+
+        self._shown_count = target
+
+    def upsert_rows(self, rows, key=None):
+        """Sadece verilen satırları günceller / ekler; liste yeniden kurulmaz.
+
+        Var olan iid'lerin değerleri yerinde değişir (sıraları değişmez). Yeni
+        iid'ler, liste key(values)'a göre artan sıralı kabul edilip ikili
+        aramayla yerine konur (key yoksa sona eklenir). Treeview'a sadece
+        yüklü sayfalara düşen satırlar eklenir.
+        """
+        tree = self.tree
+        new_rows = []
+        for iid, values in rows:
+            values = tuple(values)
+            pos = self._positions.get(iid)
+            if pos is None:
+                new_rows.append((iid, values))
+                continue
+            self.rows[pos] = (iid, values)
+            if iid in self._shown and self._shown[iid] != values:
+                tree.item(iid, values=values)
+                self._shown[iid] = values
+
+        for iid, values in new_rows:
+            pos = self._insert_position(values, key)
+            # Liste tamamen yüklüyse sona düşen satır da gösterilir
+            fully_shown = self._shown_count == len(self.rows)
+            self.rows.insert(pos, (iid, values))
+            if pos < self._shown_count or fully_shown:
+                tree.insert("", pos, iid=iid, values=values)
+                self._shown[iid] = values
+                self._shown_count += 1
+
+        if new_rows:
+            self._positions = {iid: i for i, (iid, _) in enumerate(self.rows)}
+
+    def clear(self):
+        self.rows = []
+        self._positions = {}
+        self._clear_tree()
+
+    def ensure_loaded(self, iid):
+        """iid henüz Treeview'a eklenmediyse, onu da içine alacak kadar sayfa ekler."""
+        pos = self._positions.get(iid)
+        if pos is None:
+            return False
+        if pos >= self._shown_count:
+            self._append_until(pos + 1)
+        return True
+
+    def values(self, iid):
+        pos = self._positions.get(iid)
+        return None if pos is None else self.rows[pos][1]
+
+    def all_values(self):
+        """Tüm satırların değerleri (Treeview'a eklenmemiş olanlar dahil)."""
+        return [values for _, values in self.rows]
+
+    def __len__(self):
+        return len(self.rows)
+
+    # -------------------------------------------------
+    #   Treeview güncelleme
+    # -------------------------------------------------
+    def _clear_tree(self):
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self._shown = {}
+        self._shown_count = 0
+
+    def _replace_all(self, wanted):
+        self._clear_tree()
+        insert = self.tree.insert
+        for iid, values in wanted:
+            insert("", "end", iid=iid, values=values)
+            self._shown[iid] = tuple(values)
+
+    def _apply_diff(self, wanted, removed):
+        tree = self.tree
+        if removed:
+            tree.delete(*removed)
+            for iid in removed:
+                del self._shown[iid]
+
+        for index, (iid, values) in enumerate(wanted):
+            values = tuple(values)
+            old = self._shown.get(iid)
+            if old is None:
+                tree.insert("", index, iid=iid, values=values)
+                self._shown[iid] = values
+            elif old != values:
+                tree.item(iid, values=values)
+                self._shown[iid] = values
+
+        # Sıra değiştiyse sadece yerinde olmayan satırlar taşınır
+        current = list(tree.get_children())
+        for index, (iid, _) in enumerate(wanted):
+            if current[index] != iid:
+                current.remove(iid)
+                current.insert(index, iid)
+                tree.move(iid, "", index)
+
+    def _append_until(self, count):
+        count = min(count, len(self.rows))
+        insert = self.tree.insert
+        for iid, values in self.rows[self._shown_count:count]:
+            insert("", "end", iid=iid, values=values)
+            self._shown[iid] = tuple(values)
+        self._shown_count = max(self._shown_count, count)
+
+    def _insert_position(self, values, key):
+        if key is None:
+            return len(self.rows)
+        target = key(values)
+        rows = self.rows
+        lo, hi = 0, len(rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if target < key(rows[mid][1]):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def _on_yscroll(self, first, last):
+        if self.scrollbar is not None:
+            self.scrollbar.set(first, last)
+        if (
+            float(last) >= LOAD_MORE_THRESHOLD
+            and self._shown_count < len(self.rows)
+            and not self._load_pending
+        ):
+            # after_idle: yscrollcommand içinden Treeview'u değiştirmemek için
+            self._load_pending = True
+            self.tree.after_idle(self._load_next_page)
+
+    def _load_next_page(self):
+        self._load_pending = False
+        if self._shown_count < len(self.rows):
+            self._append_until(self._shown_count + self.page_size)
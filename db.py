@@ -1,17 +1,184 @@
+import os
+import re
 import sqlite3
 import hashlib
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from itertools import islice
 
 DB_NAME = "patron_app.db"
 
+# Her bağlantı açılışında bir kez uygulanan ayarlar.
+# journal_mode=WAL dosyaya kalıcı yazılır; diğerleri bağlantı başınadır.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA cache_size=-20000",      # ~20 MB sayfa önbelleği
+    "PRAGMA mmap_size=268435456",    # 256 MB bellek eşlemeli okuma
+)
+
+# Salt okunur bağlantılar (toplu hesap worker'ları) için; WAL modu dosyada
+# zaten kalıcı olduğundan journal_mode tekrar ayarlanmaz.
+READ_ONLY_PRAGMAS = (
+    "PRAGMA query_only=ON",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Toplu yazmalarda executemany başına satır sayısı
+BULK_CHUNK_SIZE = 1000
+
+# "id IN (...)" sorgularında tek seferde gönderilen en fazla id
+# (eski SQLite sürümlerinin 999 parametre sınırının altında)
+IN_CHUNK_SIZE = 500
+
+# Thread başına tek, uzun ömürlü bağlantı (sqlite3 bağlantıları thread'ler
+# arasında paylaşılamaz).
+_local = threading.local()
+
 
 def get_conn():
-    return sqlite3.connect(DB_NAME)
+    """Yeni, bağımsız bir bağlantı açar (kapatmak çağırana aittir).
 
+    Normal CRUD işlemleri için connection() / transaction() kullanın;
+    bu fonksiyon ayrı bir bağlantıya ihtiyaç duyan yerler içindir.
+    """
+    conn = sqlite3.connect(DB_NAME)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
 
-def init_db():
+
+def connection():
+    """Bu thread'e ait kalıcı bağlantıyı döndürür; yoksa açar.
+
+    Dönen bağlantı kapatılmamalıdır. DB_NAME değişirse yeniden açılır.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.db_name == DB_NAME:
+        return conn
+
+    close_connection()
     conn = get_conn()
-    c = conn.cursor()
+    _local.conn = conn
+    _local.db_name = DB_NAME
+    _local.tx_depth = 0
+    return conn
+
+
+def open_read_only():
+    """Bu thread'in kalıcı bağlantısını salt okunur (mode=ro) açar.
+
+    Sonraki connection() çağrıları bu bağlantıyı döndürür. Paralel okuma yapan
+    worker süreçleri içindir; yazma denemesi sqlite3.OperationalError verir.
+    """
+    from urllib.request import pathname2url
+
+    close_connection()
+    uri = "file:" + pathname2url(os.path.abspath(DB_NAME)) + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    for pragma in READ_ONLY_PRAGMAS:
+        conn.execute(pragma)
+    _local.conn = conn
+    _local.db_name = DB_NAME
+    _local.tx_depth = 0
+    return conn
+
+
+def close_connection():
+    """Bu thread'in kalıcı bağlantısını kapatır (uygulama kapanışı vb.)."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+    _local.conn = None
+    _local.db_name = None
+    _local.tx_depth = 0
+
+
+@contextmanager
+def transaction():
+    """Yazma işlemleri için transaction.
+
+    with transaction() as conn:
+        conn.execute(...)
+
+    Blok hatasız biterse commit, hata olursa rollback yapılır.
+    İç içe kullanılabilir; sadece en dıştaki blok commit eder.
+    """
+    conn = connection()
+    if _local.tx_depth > 0:
+        _local.tx_depth += 1
+        try:
+            yield conn
+        finally:
+            _local.tx_depth -= 1
+        return
 
+    _local.tx_depth = 1
+    try:
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _local.tx_depth = 0
+
+
+def _insert_bulk(sql, rows):
+    """rows'u parça parça executemany ile tek transaction'da yazar."""
+    rows = iter(rows)
+    count = 0
+    with transaction() as conn:
+        while True:
+            chunk = list(islice(rows, BULK_CHUNK_SIZE))
+            if not chunk:
+                break
+            conn.executemany(sql, chunk)
+            count += len(chunk)
+    return count
+
+
+# ------------ ŞEMA / MIGRATION ------------ #
+
+
+def init_db():
+    """Şemayı son sürüme getirir.
+
+    Veritabanının şema sürümü PRAGMA user_version'da tutulur; sadece henüz
+    uygulanmamış migration'lar sırayla, tek transaction içinde çalıştırılır.
+    """
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("PRAGMA user_version")
+        version = c.fetchone()[0]
+        for target, migrate in enumerate(MIGRATIONS[version:], start=version + 1):
+            migrate(c)
+            c.execute(f"PRAGMA user_version = {target}")
+    invalidate_settings()
+
+
+def schema_version():
+    c = connection().cursor()
+    c.execute("PRAGMA user_version")
+    return c.fetchone()[0]
+
+
+def _column_exists(c, table, column):
+    c.execute(f"PRAGMA table_info({table})")
+    return any(row[1] == column for row in c.fetchall())
+
+
+def _migration_1_base_schema(c):
+    """Temel tablolar + varsayılan ayarlar.
+
+    user_version takibinden önce oluşturulmuş veritabanlarında tablolar zaten
+    vardır; eksik olabilecek description sütunları burada tamamlanır.
+    """
     # PERSONELLER
     c.execute("""
     CREATE TABLE IF NOT EXISTS employees (
@@ -83,81 +250,684 @@ def init_db():
             (10.0, 1.5, 1),  # 10 saat / 1.5 mesai / hafta sonu dahil
         )
 
-    # Eski veritabanı için sütun ekleme denemeleri (varsa hata vermez)
-    try:
+    # Eski veritabanı: description sütunu yoksa ekle
+    if not _column_exists(c, "advances", "description"):
         c.execute("ALTER TABLE advances ADD COLUMN description TEXT")
-    except sqlite3.OperationalError:
-        pass
 
-    try:
+    if not _column_exists(c, "overtimes", "description"):
         c.execute("ALTER TABLE overtimes ADD COLUMN description TEXT")
+
+
+def _migration_2_date_range_indexes(c):
+    """Tarih aralıklı sorgular için index'ler.
+
+    (employee_id, date, ...) : personel + ay toplamları (maaş, performans, dashboard);
+                               toplanan sütunlar da index'te olduğu için tabloya gidilmez.
+    (date, employee_id)      : aylık liste ekranları (tüm personel, tarih aralığı).
+    """
+    c.execute("""
+    CREATE INDEX IF NOT EXISTS idx_attendance_emp_date
+    ON attendance_logs (employee_id, date, hours)
+    """)
+    c.execute("""
+    CREATE INDEX IF NOT EXISTS idx_attendance_date_emp
+    ON attendance_logs (date, employee_id)
+    """)
+
+    c.execute("""
+    CREATE INDEX IF NOT EXISTS idx_overtimes_emp_date
+    ON overtimes (employee_id, date, hours, total)
+    """)
+    c.execute("""
+    CREATE INDEX IF NOT EXISTS idx_overtimes_date_emp
+    ON overtimes (date, employee_id)
+    """)
+
+    c.execute("""
+    CREATE INDEX IF NOT EXISTS idx_advances_emp_date
+    ON advances (employee_id, date, amount)
+    """)
+    c.execute("""
+    CREATE INDEX IF NOT EXISTS idx_advances_date_emp
+    ON advances (date, employee_id)
+    """)
+
+
+def _migration_3_monthly_summary(c):
+    """Personel x ay özet tablosu + onu güncel tutan trigger'lar.
+
+    Her devamsızlık / mesai / avans yazımında ilgili (personel, yıl, ay)
+    satırına sadece fark eklenir; raporlar ham kayıtları taramak yerine
+    personel başına ay başına tek satır okur.
+    """
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS monthly_employee_summary (
+        employee_id INTEGER NOT NULL,
+        year INTEGER NOT NULL,
+        month INTEGER NOT NULL,
+        missing_hours REAL NOT NULL DEFAULT 0,
+        overtime_hours REAL NOT NULL DEFAULT 0,
+        overtime_total REAL NOT NULL DEFAULT 0,
+        advance_total REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (employee_id, year, month)
+    ) WITHOUT ROWID
+    """)
+
+    # kaynak tablo -> (UPDATE OF sütunları, [(özet sütunu, kaynak ifadesi)])
+    sources = {
+        "attendance_logs": ("employee_id, date, hours", [("missing_hours", "COALESCE({r}.hours, 0)")]),
+        "overtimes": ("employee_id, date, hours, total", [
+            ("overtime_hours", "{r}.hours"),
+            ("overtime_total", "{r}.total"),
+        ]),
+        "advances": ("employee_id, date, amount", [("advance_total", "{r}.amount")]),
+    }
+
+    def upsert(columns, ref, sign):
+        names = ", ".join(col for col, _ in columns)
+        values = ", ".join(f"{sign}({expr.format(r=ref)})" for _, expr in columns)
+        updates = ", ".join(f"{col} = ROUND({col} + excluded.{col}, 6)" for col, _ in columns)
+        return f"""
+            INSERT INTO monthly_employee_summary (employee_id, year, month, {names})
+            VALUES ({ref}.employee_id, CAST(substr({ref}.date, 1, 4) AS INTEGER),
+                    CAST(substr({ref}.date, 6, 2) AS INTEGER), {values})
+            ON CONFLICT (employee_id, year, month) DO UPDATE SET {updates};
+        """
+
+    for table, (watched, columns) in sources.items():
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_summary_insert
+        AFTER INSERT ON {table}
+        BEGIN {upsert(columns, "NEW", "+")} END
+        """)
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_summary_delete
+        AFTER DELETE ON {table}
+        BEGIN {upsert(columns, "OLD", "-")} END
+        """)
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_summary_update
+        AFTER UPDATE OF {watched} ON {table}
+        BEGIN {upsert(columns, "OLD", "-")} {upsert(columns, "NEW", "+")} END
+        """)
+
+    # Bu sürümde taksit tablosu henüz yok; avanslar verildiği aya yazılır
+    _rebuild_monthly_summary(
+        c, _SUMMARY_REBUILD_TEMPLATE.format(advance_source=_ADVANCE_SOURCE_BY_DATE)
+    )
+
+
+def _migration_4_backup_settings(c):
+    """Otomatik yedek ayarları (tek satır). directory boşsa DB'nin yanındaki
+    'yedekler' klasörü kullanılır (bkz. backup.default_backup_dir)."""
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS backup_settings (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        enabled INTEGER NOT NULL,
+        directory TEXT NOT NULL,
+        interval_hours REAL NOT NULL,
+        keep_count INTEGER NOT NULL,
+        compress INTEGER NOT NULL
+    )
+    """)
+    c.execute(
+        "INSERT OR IGNORE INTO backup_settings "
+        "(id, enabled, directory, interval_hours, keep_count, compress) VALUES (1, ?, ?, ?, ?, ?)",
+        DEFAULT_BACKUP_CONFIG,
+    )
+
+
+def _migration_5_data_versions(c):
+    """Veri sürüm sayaçları: önbellekler (örn. dashboard) anahtarlarına katar.
+
+    scope 'YYYY-MM': o ayın özet satırı (devamsızlık / mesai / avans) her
+    değiştiğinde artar; scope 'employees': personel tablosu değiştiğinde.
+    Sayaçlar trigger'larla güncellenir; okuyan taraf sadece karşılaştırır.
+    """
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS data_versions (
+        scope TEXT PRIMARY KEY,
+        version INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """)
+
+    def bump(scope_expr):
+        return f"""
+            INSERT INTO data_versions (scope, version) VALUES ({scope_expr}, 1)
+            ON CONFLICT (scope) DO UPDATE SET version = version + 1;
+        """
+
+    for event, ref in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_summary_version_{event.lower()}
+        AFTER {event} ON monthly_employee_summary
+        BEGIN {bump(f"printf('%04d-%02d', {ref}.year, {ref}.month)")} END
+        """)
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_employees_version_{event.lower()}
+        AFTER {event} ON employees
+        BEGIN {bump("'employees'")} END
+        """)
+
+
+def _migration_6_advance_installments(c):
+    """Avans taksit defteri.
+
+    Avans kaydedilirken taksit planı bir kez üretilir (ay başına bir satır).
+    Aylık özetin advance_total sütunu artık avansın verildiği aydan değil,
+    taksitlerin düştüğü aydan beslenir; bordro o ayın kesintisini özetten
+    okur. posted: kesinti işlendi mi (avansın 'remaining' bakiyesine
+    yansıtıldı mı, bkz. payroll.post_advance_cuts).
+
+    Mevcut avanslar için plan, kayıtlı taksit sayısından üretilir.
+    """
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS advance_installments (
+        advance_id INTEGER NOT NULL REFERENCES advances (id) ON DELETE CASCADE,
+        seq INTEGER NOT NULL,
+        employee_id INTEGER NOT NULL,
+        year INTEGER NOT NULL,
+        month INTEGER NOT NULL,
+        amount REAL NOT NULL,
+        posted INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (advance_id, seq)
+    ) WITHOUT ROWID
+    """)
+
+    # Ayın kesintileri (bordro / toplu işleme): (yıl, ay) ile index'ten okunur
+    c.execute("""
+    CREATE INDEX IF NOT EXISTS idx_installments_period
+    ON advance_installments (year, month, employee_id, amount, posted)
+    """)
+
+    for event in ("insert", "delete", "update"):
+        c.execute(f"DROP TRIGGER IF EXISTS trg_advances_summary_{event}")
+
+    def upsert(ref, sign):
+        return f"""
+            INSERT INTO monthly_employee_summary (employee_id, year, month, advance_total)
+            VALUES ({ref}.employee_id, {ref}.year, {ref}.month, {sign}{ref}.amount)
+            ON CONFLICT (employee_id, year, month) DO UPDATE SET
+                advance_total = ROUND(advance_total + excluded.advance_total, 6);
+        """
+
+    c.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_installments_summary_insert
+    AFTER INSERT ON advance_installments
+    BEGIN {upsert("NEW", "+")} END
+    """)
+    c.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_installments_summary_delete
+    AFTER DELETE ON advance_installments
+    BEGIN {upsert("OLD", "-")} END
+    """)
+    c.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_installments_summary_update
+    AFTER UPDATE OF employee_id, year, month, amount ON advance_installments
+    BEGIN {upsert("OLD", "-")} {upsert("NEW", "+")} END
+    """)
+
+    c.execute("SELECT id, employee_id, date, amount, installments FROM advances")
+    c.executemany(INSERT_INSTALLMENT_SQL, [
+        inst
+        for adv_id, emp_id, date_str, amount, installments in c.fetchall()
+        for inst in installment_plan(adv_id, emp_id, date_str, amount, installments)
+    ])
+    _rebuild_monthly_summary(c)
+
+
+def _migration_7_payroll_runs(c):
+    """Kapanmış dönem bordroları (snapshot).
+
+    payroll_runs: dönem başına bir satır; kapanış zamanı, hesapta kullanılan
+    ayarlar, kapanıştaki veri sürümü (bkz. data_version) ve toplamlar.
+    payroll_run_rows: o anki bordro satırları, ekrandaki sırayla (seq).
+    Snapshot değiştirilemez; dönem yeniden açılınca (satırlar silinir) ve
+    tekrar kapatılınca yeniden yazılır.
+    """
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS payroll_runs (
+        year INTEGER NOT NULL,
+        month INTEGER NOT NULL,
+        closed_at TEXT NOT NULL,
+        daily_hours REAL NOT NULL,
+        overtime_coef REAL NOT NULL,
+        include_weekends INTEGER NOT NULL,
+        employees_version INTEGER NOT NULL,
+        month_version INTEGER NOT NULL,
+        total_salary REAL NOT NULL,
+        total_overtime REAL NOT NULL,
+        total_advance REAL NOT NULL,
+        total_net REAL NOT NULL,
+        PRIMARY KEY (year, month)
+    ) WITHOUT ROWID
+    """)
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS payroll_run_rows (
+        year INTEGER NOT NULL,
+        month INTEGER NOT NULL,
+        seq INTEGER NOT NULL,
+        employee_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        hourly_rate REAL NOT NULL,
+        days INTEGER NOT NULL,
+        theoretical_hours REAL NOT NULL,
+        missing_hours REAL NOT NULL,
+        total_hours REAL NOT NULL,
+        salary REAL NOT NULL,
+        overtime REAL NOT NULL,
+        advance REAL NOT NULL,
+        net_salary REAL NOT NULL,
+        PRIMARY KEY (year, month, seq),
+        FOREIGN KEY (year, month) REFERENCES payroll_runs (year, month) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    """)
+
+    for table in ("payroll_runs", "payroll_run_rows"):
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_frozen
+        BEFORE UPDATE ON {table}
+        BEGIN SELECT RAISE(ABORT, 'Kapanmış dönem bordrosu değiştirilemez'); END
+        """)
+
+
+
+# Tam metin araması yapılan alanlar: (kayıt türü, fts tablosu, kaynak tablo, metin sütunu)
+SEARCH_SOURCES = (
+    ("attendance", "attendance_fts", "attendance_logs", "note"),
+    ("overtime", "overtimes_fts", "overtimes", "description"),
+    ("advance", "advances_fts", "advances", "description"),
+)
+
+
+def _fts5_available(c):
+    try:
+        c.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x)")
     except sqlite3.OperationalError:
-        pass
+        return False
+    c.execute("DROP TABLE temp._fts5_probe")
+    return True
 
-    conn.commit()
-    conn.close()
 
+def _migration_8_search_index(c):
+    """Not / açıklama alanları için FTS5 tam metin indeksi.
 
-def get_settings():
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("SELECT daily_hours, overtime_coef, include_weekends FROM settings WHERE id=1")
+    Her kaynak tablo için 'external content' bir FTS5 tablosu: metin
+    kaynak tabloda kalır, FTS tablosu sadece indeksi tutar (rowid = kayıt
+    id). Trigger'lar ekleme / güncelleme / silmede indeksi günceller.
+    Sadece boş olmayan metinler indekslenir (kayıtların çoğunun notu yok;
+    toplu içe aktarım boş satırlar için FTS'e yazmaz).
+
+    unicode61 + remove_diacritics: büyük/küçük harf ve Türkçe işaretler
+    ('ş' -> 's') yok sayılır. Önek sorguları ('kay*') terim indeksinde
+    aralık taramasıdır; ayrı prefix indeksi yazmaları yavaşlattığı için
+    eklenmedi.
+
+    SQLite FTS5'siz derlenmişse tablolar oluşturulmaz; search_records
+    LIKE ile taramaya düşer.
+    """
+    if not _fts5_available(c):
+        return
+
+    for _, fts, table, column in SEARCH_SOURCES:
+        c.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {column},
+            content='{table}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """)
+        # 'delete' komutu indekslenmiş metnin aynısıyla çağrılmalı; boş
+        # metin hiç indekslenmediği için silinmez de.
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert
+        AFTER INSERT ON {table} WHEN new.{column} <> ''
+        BEGIN
+            INSERT INTO {fts} (rowid, {column}) VALUES (new.id, new.{column});
+        END
+        """)
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete
+        AFTER DELETE ON {table} WHEN old.{column} <> ''
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column});
+        END
+        """)
+        c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_update AFTER UPDATE OF {column} ON {table}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {column})
+            SELECT 'delete', old.id, old.{column} WHERE old.{column} <> '';
+            INSERT INTO {fts} (rowid, {column})
+            SELECT new.id, new.{column} WHERE new.{column} <> '';
+        END
+        """)
+        c.execute(f"""
+            INSERT INTO {fts} (rowid, {column})
+            SELECT id, {column} FROM {table} WHERE {column} <> ''
+        """)
+
+
+# Sıra önemli: listedeki n. fonksiyon şemayı n. sürüme getirir.
+# Yeni değişiklik = listenin sonuna yeni migration; eskileri değiştirilmez.
+MIGRATIONS = [
+    _migration_1_base_schema,
+    _migration_2_date_range_indexes,
+    _migration_3_monthly_summary,
+    _migration_4_backup_settings,
+    _migration_5_data_versions,
+    _migration_6_advance_installments,
+    _migration_7_payroll_runs,
+    _migration_8_search_index,
+]
+
+
+# ------------ AYLIK ÖZET ------------ #
+
+_SUMMARY_REBUILD_TEMPLATE = """
+    INSERT INTO monthly_employee_summary
+        (employee_id, year, month, missing_hours, overtime_hours, overtime_total, advance_total)
+    SELECT employee_id, year, month,
+           ROUND(SUM(missing_hours), 6), ROUND(SUM(overtime_hours), 6),
+           ROUND(SUM(overtime_total), 6), ROUND(SUM(advance_total), 6)
+    FROM (
+        SELECT employee_id, CAST(substr(date, 1, 4) AS INTEGER) AS year,
+               CAST(substr(date, 6, 2) AS INTEGER) AS month,
+               COALESCE(hours, 0) AS missing_hours, 0 AS overtime_hours,
+               0 AS overtime_total, 0 AS advance_total
+        FROM attendance_logs
+        UNION ALL
+        SELECT employee_id, CAST(substr(date, 1, 4) AS INTEGER),
+               CAST(substr(date, 6, 2) AS INTEGER), 0, hours, total, 0
+        FROM overtimes
+        UNION ALL
+        {advance_source}
+    )
+    GROUP BY employee_id, year, month
+"""
+
+# Avans kesintisinin kaynağı. Migration 6'ya kadar avans, verildiği ayda tek
+# seferde düşülüyordu; sonrasında taksit tablosundaki ay / tutar kullanılır.
+_ADVANCE_SOURCE_BY_DATE = """
+        SELECT employee_id, CAST(substr(date, 1, 4) AS INTEGER),
+               CAST(substr(date, 6, 2) AS INTEGER), 0, 0, 0, amount
+        FROM advances
+"""
+_ADVANCE_SOURCE_BY_INSTALLMENT = """
+        SELECT employee_id, year, month, 0, 0, 0, amount
+        FROM advance_installments
+"""
+
+REBUILD_MONTHLY_SUMMARY_SQL = _SUMMARY_REBUILD_TEMPLATE.format(
+    advance_source=_ADVANCE_SOURCE_BY_INSTALLMENT
+)
+
+
+def _rebuild_monthly_summary(c, sql=REBUILD_MONTHLY_SUMMARY_SQL):
+    c.execute("DELETE FROM monthly_employee_summary")
+    c.execute(sql)
+
+
+def rebuild_monthly_summary():
+    """Özet tabloyu ham kayıtlardan baştan hesaplar (onarım için).
+
+    Geri dönen: oluşan özet satırı sayısı.
+    """
+    with transaction() as conn:
+        c = conn.cursor()
+        _rebuild_monthly_summary(c)
+        c.execute("SELECT COUNT(*) FROM monthly_employee_summary")
+        return c.fetchone()[0]
+
+
+def summary_month_bounds():
+    """Hareket olan ilk ve son ay: ((yıl, ay), (yıl, ay)); hiç kayıt yoksa None."""
+    c = connection().cursor()
+    c.execute("""
+        SELECT MIN(year * 12 + month - 1), MAX(year * 12 + month - 1)
+        FROM monthly_employee_summary
+    """)
+    first, last = c.fetchone()
+    if first is None:
+        return None
+    return (first // 12, first % 12 + 1), (last // 12, last % 12 + 1)
+
+
+def get_employee_year_summary(emp_id, year):
+    """Personelin yıl içindeki özet satırları: {ay: (eksik saat, mesai saat, mesai tutar, avans)}"""
+    c = connection().cursor()
+    c.execute("""
+    SELECT month, missing_hours, overtime_hours, overtime_total, advance_total
+    FROM monthly_employee_summary
+    WHERE employee_id=? AND year=?
+    """, (emp_id, year))
+    return {row[0]: row[1:] for row in c.fetchall()}
+
+
+def data_version(year, month):
+    """(personel sürümü, ay sürümü); ay ya da personel verisi değişince değişir.
+
+    Hesap sonuçlarını önbelleğe alan yerler anahtara ekler (bkz.
+    _migration_5_data_versions). Hiç değişiklik görmemiş kapsam 0'dır.
+    """
+    c = connection().cursor()
+    c.execute(
+        "SELECT scope, version FROM data_versions WHERE scope IN ('employees', ?)",
+        (f"{year:04d}-{month:02d}",),
+    )
+    versions = dict(c.fetchall())
+    return versions.get("employees", 0), versions.get(f"{year:04d}-{month:02d}", 0)
+
+
+# ------------ DÖNEM KAPANIŞI ------------ #
+
+PayrollRun = namedtuple(
+    "PayrollRun",
+    "year month closed_at settings data_version total_salary total_overtime total_advance total_net",
+)
+
+# Snapshot satırının sütunları; payroll satır sözlüğünün anahtarlarıyla aynı
+PAYROLL_RUN_ROW_KEYS = (
+    "employee_id", "name", "hourly_rate", "days", "theoretical_hours", "missing_hours",
+    "total_hours", "salary", "overtime", "advance", "net_salary",
+)
+
+
+def get_payroll_run(year, month):
+    """Kapanmış dönemin başlık bilgisi (PayrollRun); dönem açıksa None."""
+    c = connection().cursor()
+    c.execute("""
+        SELECT closed_at, daily_hours, overtime_coef, include_weekends,
+               employees_version, month_version,
+               total_salary, total_overtime, total_advance, total_net
+        FROM payroll_runs
+        WHERE year=? AND month=?
+    """, (year, month))
     row = c.fetchone()
-    conn.close()
     if row is None:
-        return 10.0, 1.5, 1
-    return row  # (daily_hours, overtime_coef, include_weekends)
+        return None
+    closed_at, daily_hours, overtime_coef, include_weekends, emp_v, month_v, *totals = row
+    return PayrollRun(
+        year, month, closed_at, Settings(daily_hours, overtime_coef, include_weekends),
+        (emp_v, month_v), *totals,
+    )
+
+
+def get_payroll_run_rows(year, month):
+    """Snapshot satırları, kapanıştaki sırayla: [{PAYROLL_RUN_ROW_KEYS}, ...]"""
+    c = connection().cursor()
+    c.execute(f"""
+        SELECT {", ".join(PAYROLL_RUN_ROW_KEYS)}
+        FROM payroll_run_rows
+        WHERE year=? AND month=?
+        ORDER BY seq
+    """, (year, month))
+    return [dict(zip(PAYROLL_RUN_ROW_KEYS, row)) for row in c.fetchall()]
+
+
+def save_payroll_run(year, month, closed_at, settings, version, totals, rows):
+    """Dönemi kapatır: başlık + satırlar tek transaction'da yazılır.
+
+    totals: (maaş, mesai, avans, net) toplamları. Dönem zaten kapalıysa
+    sqlite3.IntegrityError fırlatılır.
+    """
+    with transaction() as conn:
+        conn.execute("""
+            INSERT INTO payroll_runs
+                (year, month, closed_at, daily_hours, overtime_coef, include_weekends,
+                 employees_version, month_version,
+                 total_salary, total_overtime, total_advance, total_net)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (year, month, closed_at, *settings, *version, *totals))
+        conn.executemany(f"""
+            INSERT INTO payroll_run_rows (year, month, seq, {", ".join(PAYROLL_RUN_ROW_KEYS)})
+            VALUES (?, ?, ?, {", ".join("?" * len(PAYROLL_RUN_ROW_KEYS))})
+        """, [
+            (year, month, seq) + tuple(r[key] for key in PAYROLL_RUN_ROW_KEYS)
+            for seq, r in enumerate(rows, start=1)
+        ])
+
+
+def delete_payroll_run(year, month):
+    """Dönemi yeniden açar (snapshot silinir); dönem kapalı değilse False."""
+    with transaction() as conn:
+        conn.execute("DELETE FROM payroll_run_rows WHERE year=? AND month=?", (year, month))
+        cur = conn.execute("DELETE FROM payroll_runs WHERE year=? AND month=?", (year, month))
+        return cur.rowcount > 0
+
+
+def get_payroll_runs():
+    """Kapanmış dönemler, en yeniden eskiye: [(yıl, ay, kapanış, net toplam), ...]"""
+    c = connection().cursor()
+    c.execute("""
+        SELECT year, month, closed_at, total_net
+        FROM payroll_runs
+        ORDER BY year DESC, month DESC
+    """)
+    return c.fetchall()
+
+
+# ------------ AYARLAR ------------ #
+
+Settings = namedtuple("Settings", "daily_hours overtime_coef include_weekends")
+
+DEFAULT_SETTINGS = Settings(10.0, 1.5, 1)
+
+# DB dosyası -> Settings. Ayar satırı sadece ilk erişimde okunur;
+# update_settings önbelleği günceller ve dinleyicilere haber verir.
+_settings_cache = {}
+_settings_listeners = []
+
+
+def get_settings():
+    """(daily_hours, overtime_coef, include_weekends) döndürür.
+
+    Değer bellekte tutulur; ilk çağrı dışında veritabanına gidilmez.
+    Alanlara isimle de erişilebilir: get_settings().daily_hours
+    """
+    settings = _settings_cache.get(DB_NAME)
+    if settings is None:
+        c = connection().cursor()
+        c.execute("SELECT daily_hours, overtime_coef, include_weekends FROM settings WHERE id=1")
+        row = c.fetchone()
+        settings = Settings(*row) if row is not None else DEFAULT_SETTINGS
+        _settings_cache[DB_NAME] = settings
+    return settings
+
+
+def invalidate_settings():
+    """Önbelleği boşaltır (DB dışarıdan değiştiyse, örn. yedekten dönüş)."""
+    _settings_cache.pop(DB_NAME, None)
+
+
+def add_settings_listener(callback):
+    """Ayarlar kaydedildiğinde callback(Settings) çağrılır."""
+    _settings_listeners.append(callback)
+
+
+def remove_settings_listener(callback):
+    if callback in _settings_listeners:
+        _settings_listeners.remove(callback)
 
 
 def update_settings(daily_hours, overtime_coef, include_weekends):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute(
-        "UPDATE settings SET daily_hours=?, overtime_coef=?, include_weekends=? WHERE id=1",
-        (daily_hours, overtime_coef, include_weekends),
-    )
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute(
+            "UPDATE settings SET daily_hours=?, overtime_coef=?, include_weekends=? WHERE id=1",
+            (daily_hours, overtime_coef, include_weekends),
+        )
+
+    settings = Settings(float(daily_hours), float(overtime_coef), int(include_weekends))
+    _settings_cache[DB_NAME] = settings
+    for callback in list(_settings_listeners):
+        callback(settings)
+
+
+# ------------ YEDEK AYARLARI ------------ #
+
+BackupConfig = namedtuple("BackupConfig", "enabled directory interval_hours keep_count compress")
+
+# Varsayılan: günde bir otomatik yedek, son 14 yedek saklanır, sıkıştırmalı
+DEFAULT_BACKUP_CONFIG = BackupConfig(1, "", 24.0, 14, 1)
+
+
+def get_backup_config():
+    c = connection().cursor()
+    c.execute("""
+        SELECT enabled, directory, interval_hours, keep_count, compress
+        FROM backup_settings WHERE id=1
+    """)
+    row = c.fetchone()
+    return BackupConfig(*row) if row is not None else DEFAULT_BACKUP_CONFIG
+
+
+def update_backup_config(enabled, directory, interval_hours, keep_count, compress):
+    config = BackupConfig(int(enabled), directory or "", float(interval_hours),
+                          int(keep_count), int(compress))
+    with transaction() as conn:
+        conn.execute("""
+            INSERT INTO backup_settings (id, enabled, directory, interval_hours, keep_count, compress)
+            VALUES (1, ?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                enabled=excluded.enabled, directory=excluded.directory,
+                interval_hours=excluded.interval_hours, keep_count=excluded.keep_count,
+                compress=excluded.compress
+        """, config)
+    return config
 
 
 # ------------ EMPLOYEE CRUD ------------ #
 
 
 def add_employee(name, rate, start_date, active):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("""
-    INSERT INTO employees (name, hourly_rate, start_date, is_active)
-    VALUES (?, ?, ?, ?)
-    """, (name, rate, start_date, active))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("""
+        INSERT INTO employees (name, hourly_rate, start_date, is_active)
+        VALUES (?, ?, ?, ?)
+        """, (name, rate, start_date, active))
 
 
 def update_employee(emp_id, name, rate, start_date, active):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("""
-    UPDATE employees
-    SET name=?, hourly_rate=?, start_date=?, is_active=?
-    WHERE id=?
-    """, (name, rate, start_date, active, emp_id))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("""
+        UPDATE employees
+        SET name=?, hourly_rate=?, start_date=?, is_active=?
+        WHERE id=?
+        """, (name, rate, start_date, active, emp_id))
 
 
 def get_all_employees():
-    conn = get_conn()
-    c = conn.cursor()
+    c = connection().cursor()
     c.execute("SELECT id, name, hourly_rate, start_date, is_active FROM employees")
     rows = c.fetchall()
-    conn.close()
     return rows
 
 
 def get_active_employees():
-    conn = get_conn()
-    c = conn.cursor()
+    c = connection().cursor()
     c.execute("""
         SELECT id, name, hourly_rate, start_date
         FROM employees
@@ -165,7 +935,6 @@ def get_active_employees():
         ORDER BY name
     """)
     rows = c.fetchall()
-    conn.close()
     return rows
 
 
@@ -173,114 +942,309 @@ def get_active_employees():
 
 
 def add_attendance(emp_id, date_str, type_code, hours, note):
-    conn = get_conn()
-    c = conn.cursor()
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("""
+        INSERT INTO attendance_logs (employee_id, date, type, hours, note)
+        VALUES (?, ?, ?, ?, ?)
+        """, (emp_id, date_str, type_code, hours, note))
+
+
+def add_attendance_bulk(rows):
+    """Çok sayıda devamsızlık kaydını tek transaction'da yazar.
+
+    rows: (emp_id, date_str, type_code, hours, note) üreten herhangi bir iterable
+    (generator olabilir; BULK_CHUNK_SIZE'lık parçalar halinde tüketilir).
+    Hata olursa hiçbir kayıt yazılmaz. Geri dönen: yazılan kayıt sayısı.
+    """
+    return _insert_bulk("""
+        INSERT INTO attendance_logs (employee_id, date, type, hours, note)
+        VALUES (?, ?, ?, ?, ?)
+    """, rows)
+
+
+def add_attendance_batch(rows):
+    """Toplu giriş tablosunun kayıtlarını tek executemany ile, tek transaction'da yazar.
+
+    rows: (emp_id, date_str, type_code, hours, note) listesi. Geri dönen: yeni
+    kayıtların id'leri (liste sadece bu satırlarla yenilenir). transaction()
+    BEGIN IMMEDIATE ile açıldığından araya başka yazan giremez; yeni kayıtlar
+    yazımdan önceki en büyük id'den büyük olanlardır.
+    """
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("SELECT COALESCE(MAX(id), 0) FROM attendance_logs")
+        last_id = c.fetchone()[0]
+        c.executemany("""
+            INSERT INTO attendance_logs (employee_id, date, type, hours, note)
+            VALUES (?, ?, ?, ?, ?)
+        """, rows)
+        c.execute("SELECT id FROM attendance_logs WHERE id > ? ORDER BY id", (last_id,))
+        return [row[0] for row in c.fetchall()]
+
+
+_ATTENDANCE_LIST_SELECT = """
+    SELECT a.id, a.employee_id, a.date, e.name, a.type, a.hours, a.note
+    FROM attendance_logs a
+    JOIN employees e ON e.id = a.employee_id
+"""
+
+
+def iter_attendance_list(start_date, end_date, emp_id=None):
+    """Devamsızlık listesi: (id, personel id, tarih, personel, tür, saat, not).
+
+    Tarihe göre yeniden eskiye, aynı günde isim sırasıyla; cursor döndürür.
+    """
+    query = _ATTENDANCE_LIST_SELECT + " WHERE a.date >= ? AND a.date < ?"
+    params = [start_date, end_date]
+    if emp_id is not None:
+        query += " AND a.employee_id = ?"
+        params.append(emp_id)
+    query += " ORDER BY a.date DESC, e.name"
+
+    c = connection().cursor()
+    c.execute(query, params)
+    return c
+
+
+def get_attendance_list_rows(att_ids):
+    """iter_attendance_list satırları, sadece verilen kayıt id'leri için."""
+    att_ids = list(att_ids)
+    rows = []
+    c = connection().cursor()
+    for i in range(0, len(att_ids), IN_CHUNK_SIZE):
+        chunk = att_ids[i:i + IN_CHUNK_SIZE]
+        marks = ",".join("?" * len(chunk))
+        c.execute(_ATTENDANCE_LIST_SELECT + f" WHERE a.id IN ({marks})", chunk)
+        rows.extend(c.fetchall())
+    return rows
+
+
+def get_attendance_marks(start_date, end_date):
+    """Toplu giriş tablosu için aralıktaki kayıtlar: (personel id, tarih, tür, saat)."""
+    c = connection().cursor()
     c.execute("""
-    INSERT INTO attendance_logs (employee_id, date, type, hours, note)
-    VALUES (?, ?, ?, ?, ?)
-    """, (emp_id, date_str, type_code, hours, note))
-    conn.commit()
-    conn.close()
+    SELECT employee_id, date, type, hours FROM attendance_logs
+    WHERE date >= ? AND date < ?
+    ORDER BY employee_id, date, id
+    """, (start_date, end_date))
+    return c.fetchall()
 
 
 def get_attendance_for_month(emp_id, start_date, end_date):
-    conn = get_conn()
-    c = conn.cursor()
+    c = connection().cursor()
     c.execute("""
     SELECT date, type, hours FROM attendance_logs
     WHERE employee_id=? AND date>=? AND date<?
     """, (emp_id, start_date, end_date))
     rows = c.fetchall()
-    conn.close()
     return rows
 
 
 def update_attendance(att_id, employee_id, date_str, type_code, hours, note):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("""
-        UPDATE attendance_logs
-        SET employee_id=?, date=?, type=?, hours=?, note=?
-        WHERE id=?
-    """, (employee_id, date_str, type_code, hours, note, att_id))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("""
+            UPDATE attendance_logs
+            SET employee_id=?, date=?, type=?, hours=?, note=?
+            WHERE id=?
+        """, (employee_id, date_str, type_code, hours, note, att_id))
 
 
 def delete_attendance(att_id):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("DELETE FROM attendance_logs WHERE id=?", (att_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("DELETE FROM attendance_logs WHERE id=?", (att_id,))
 
 
 # ------------ ADVANCE ------------ #
 
 
-def add_advance(emp_id, date_str, amount, installments, description=""):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("""
-    INSERT INTO advances (employee_id, date, amount, installments, remaining, description)
+INSERT_INSTALLMENT_SQL = """
+    INSERT INTO advance_installments (advance_id, seq, employee_id, year, month, amount)
     VALUES (?, ?, ?, ?, ?, ?)
-    """, (emp_id, date_str, amount, installments, amount, description))
-    conn.commit()
-    conn.close()
+"""
+
+
+def installment_plan(adv_id, emp_id, date_str, amount, installments):
+    """Avansın taksit satırları: verildiği aydan başlayarak ayda bir taksit.
+
+    Taksitler kuruşa yuvarlanır; yuvarlama farkı son taksitte kapanır, böylece
+    taksitlerin toplamı tutara eşittir. installments < 1 ise 1 sayılır.
+    """
+    count = max(int(installments or 1), 1)
+    per_installment = round(float(amount) / count, 2)
+    first = int(date_str[:4]) * 12 + int(date_str[5:7]) - 1
+    rows = []
+    for seq in range(1, count + 1):
+        index = first + seq - 1
+        value = per_installment if seq < count else round(float(amount) - per_installment * (count - 1), 2)
+        rows.append((adv_id, seq, emp_id, index // 12, index % 12 + 1, value))
+    return rows
+
+
+def _write_installments(c, adv_id, emp_id, date_str, amount, installments):
+    c.execute("DELETE FROM advance_installments WHERE advance_id=?", (adv_id,))
+    c.executemany(INSERT_INSTALLMENT_SQL, installment_plan(adv_id, emp_id, date_str, amount, installments))
+
+
+def add_advance(emp_id, date_str, amount, installments, description=""):
+    """Avansı ve taksit planını tek transaction'da yazar; geri dönen: avans id."""
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("""
+        INSERT INTO advances (employee_id, date, amount, installments, remaining, description)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """, (emp_id, date_str, amount, installments, amount, description))
+        adv_id = c.lastrowid
+        _write_installments(c, adv_id, emp_id, date_str, amount, installments)
+    return adv_id
+
+
+def add_advance_bulk(rows):
+    """Çok sayıda avansı (ve taksit planlarını) tek transaction'da yazar.
+
+    rows: (emp_id, date_str, amount, installments, description) iterable'ı.
+    Geri dönen: yazılan avans sayısı.
+    """
+    count = 0
+    with transaction() as conn:
+        c = conn.cursor()
+        for emp_id, date_str, amount, installments, description in rows:
+            c.execute("""
+            INSERT INTO advances (employee_id, date, amount, installments, remaining, description)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """, (emp_id, date_str, amount, installments, amount, description))
+            c.executemany(
+                INSERT_INSTALLMENT_SQL,
+                installment_plan(c.lastrowid, emp_id, date_str, amount, installments),
+            )
+            count += 1
+    return count
 
 
 def get_advances(emp_id):
     """Maaş hesaplamasında kullanılan sade liste (açıklamasız)."""
-    conn = get_conn()
-    c = conn.cursor()
+    c = connection().cursor()
     c.execute("""
     SELECT id, date, amount, installments, remaining
     FROM advances
     WHERE employee_id=? AND remaining>0
     """, (emp_id,))
     rows = c.fetchall()
-    conn.close()
     return rows
 
 
 def update_advance_remaining(adv_id, new_remaining):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("UPDATE advances SET remaining=? WHERE id=?", (new_remaining, adv_id))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("UPDATE advances SET remaining=? WHERE id=?", (new_remaining, adv_id))
+
+
+def mark_advance_cuts_posted(year, month, updates):
+    """Ayın kesintilerini işler: bakiyeler toplu güncellenir, taksitler işaretlenir.
+
+    updates: calculate_advance_cut'ın döndürdüğü [(avans id, yeni kalan), ...]
+    Çağıranın transaction'ı varsa ona katılır (bkz. payroll.post_advance_cuts).
+    """
+    with transaction() as conn:
+        conn.executemany(
+            "UPDATE advances SET remaining=? WHERE id=?",
+            [(new_remaining, adv_id) for adv_id, new_remaining in updates],
+        )
+        conn.execute(
+            "UPDATE advance_installments SET posted=1 WHERE year=? AND month=? AND posted=0",
+            (year, month),
+        )
 
 
 def update_advance(adv_id, employee_id, date_str, amount, installments, remaining, description):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("""
-        UPDATE advances
-        SET employee_id=?, date=?, amount=?, installments=?, remaining=?, description=?
-        WHERE id=?
-    """, (employee_id, date_str, amount, installments, remaining, description, adv_id))
-    conn.commit()
-    conn.close()
+    """Avansı günceller.
+
+    Tutar, tarih ve taksit sayısı değişmediyse taksit defterine dokunulmaz
+    (işlenmiş taksitler işlenmiş kalır; sadece taksitlerin personeli
+    güncellenir). Plan değişiyorsa taksitler yeniden üretilir; işlenmiş
+    (maaştan kesilmiş) taksit varsa plan değiştirilemez, ValueError.
+    """
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("SELECT date, amount, installments FROM advances WHERE id=?", (adv_id,))
+        old = c.fetchone()
+        same_plan = old is not None and (
+            old[0] == date_str
+            and float(old[1]) == float(amount)
+            and max(int(old[2] or 1), 1) == max(int(installments or 1), 1)
+        )
+        if not same_plan:
+            c.execute(
+                "SELECT COUNT(*) FROM advance_installments WHERE advance_id=? AND posted=1",
+                (adv_id,),
+            )
+            if c.fetchone()[0]:
+                raise ValueError(
+                    "Taksitleri maaştan kesilmeye başlanmış avansın tutarı, tarihi "
+                    "ya da taksit sayısı değiştirilemez."
+                )
+
+        c.execute("""
+            UPDATE advances
+            SET employee_id=?, date=?, amount=?, installments=?, remaining=?, description=?
+            WHERE id=?
+        """, (employee_id, date_str, amount, installments, remaining, description, adv_id))
+        if same_plan:
+            c.execute(
+                "UPDATE advance_installments SET employee_id=? WHERE advance_id=?",
+                (employee_id, adv_id),
+            )
+        else:
+            _write_installments(c, adv_id, employee_id, date_str, amount, installments)
 
 
 def delete_advance(adv_id):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("DELETE FROM advances WHERE id=?", (adv_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        c = conn.cursor()
+        # Taksitler ON DELETE CASCADE ile silinir; foreign_keys kapalı bir
+        # bağlantıdan silinse de özet tutarlı kalsın diye açıkça silinir.
+        c.execute("DELETE FROM advance_installments WHERE advance_id=?", (adv_id,))
+        c.execute("DELETE FROM advances WHERE id=?", (adv_id,))
+
+
+def get_advance_installments(adv_id):
+    """Avansın taksit planı: [(sıra, yıl, ay, tutar, işlendi), ...]"""
+    c = connection().cursor()
+    c.execute("""
+        SELECT seq, year, month, amount, posted
+        FROM advance_installments
+        WHERE advance_id=?
+        ORDER BY seq
+    """, (adv_id,))
+    return c.fetchall()
+
+
+def get_month_advance_cuts(year, month, unposted_only=False):
+    """Ayın taksitlerinin düştüğü avanslar, calculate_advance_cut girdisi olarak.
+
+    [(avans id, tarih, tutar, taksit sayısı, kalan), ...]
+    """
+    c = connection().cursor()
+    c.execute(f"""
+        SELECT a.id, a.date, a.amount, a.installments, a.remaining
+        FROM advance_installments i
+        JOIN advances a ON a.id = i.advance_id
+        WHERE i.year=? AND i.month=? {"AND i.posted=0" if unposted_only else ""}
+        ORDER BY a.id
+    """, (year, month))
+    return c.fetchall()
 
 
 def get_advance_by_id(adv_id):
-    conn = get_conn()
-    c = conn.cursor()
+    c = connection().cursor()
     c.execute("""
         SELECT id, employee_id, date, amount, installments, remaining, description
         FROM advances
         WHERE id=?
     """, (adv_id,))
     row = c.fetchone()
-    conn.close()
     return row
 
 
@@ -288,45 +1252,164 @@ def get_advance_by_id(adv_id):
 
 
 def add_overtime(emp_id, date_str, hours, rate, total, description=""):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("""
-    INSERT INTO overtimes (employee_id, date, hours, rate, total, description)
-    VALUES (?, ?, ?, ?, ?, ?)
-    """, (emp_id, date_str, hours, rate, total, description))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("""
+        INSERT INTO overtimes (employee_id, date, hours, rate, total, description)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """, (emp_id, date_str, hours, rate, total, description))
 
 
 def get_overtime_for_month(emp_id, start_date, end_date):
     """Maaş hesaplaması için; açıklamaya ihtiyaç yok."""
-    conn = get_conn()
-    c = conn.cursor()
+    c = connection().cursor()
     c.execute("""
     SELECT date, hours, rate, total
     FROM overtimes
     WHERE employee_id=? AND date>=? AND date<?
     """, (emp_id, start_date, end_date))
     rows = c.fetchall()
-    conn.close()
+    return rows
+
+
+def add_overtime_batch(rows):
+    """Toplu mesaiyi tek executemany ile, tek transaction'da yazar.
+
+    rows: (emp_id, date_str, hours, rate, total, description) iterable'ı.
+    Geri dönen: yeni kayıtların id'leri (bkz. add_attendance_batch).
+    """
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("SELECT COALESCE(MAX(id), 0) FROM overtimes")
+        last_id = c.fetchone()[0]
+        c.executemany("""
+            INSERT INTO overtimes (employee_id, date, hours, rate, total, description)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+        c.execute("SELECT id FROM overtimes WHERE id > ? ORDER BY id", (last_id,))
+        return [row[0] for row in c.fetchall()]
+
+
+_OVERTIME_LIST_SELECT = """
+    SELECT o.id, o.date, e.name, o.hours, o.rate, o.total, o.description, o.employee_id
+    FROM overtimes o
+    JOIN employees e ON e.id = o.employee_id
+"""
+
+
+def iter_overtime_list(start_date, end_date, emp_id=None):
+    """Mesai listesi / raporu: (id, tarih, personel, saat, ücret, toplam, açıklama, personel id).
+
+    Cursor döndürür; satırlar okundukça gelir. Dışa aktarımda fetchall
+    yapmadan doğrudan dosyaya akıtılabilir.
+    """
+    query = _OVERTIME_LIST_SELECT + " WHERE o.date >= ? AND o.date < ?"
+    params = [start_date, end_date]
+    if emp_id is not None:
+        query += " AND o.employee_id = ?"
+        params.append(emp_id)
+    query += " ORDER BY o.date DESC, e.name"
+
+    c = connection().cursor()
+    c.execute(query, params)
+    return c
+
+
+def get_overtime_list_rows(ot_ids):
+    """iter_overtime_list satırları, sadece verilen kayıt id'leri için."""
+    ot_ids = list(ot_ids)
+    rows = []
+    c = connection().cursor()
+    for i in range(0, len(ot_ids), IN_CHUNK_SIZE):
+        chunk = ot_ids[i:i + IN_CHUNK_SIZE]
+        marks = ",".join("?" * len(chunk))
+        c.execute(_OVERTIME_LIST_SELECT + f" WHERE o.id IN ({marks})", chunk)
+        rows.extend(c.fetchall())
     return rows
 
 
 def update_overtime(ot_id, employee_id, date_str, hours, rate, total, description):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("""
-        UPDATE overtimes
-        SET employee_id=?, date=?, hours=?, rate=?, total=?, description=?
-        WHERE id=?
-    """, (employee_id, date_str, hours, rate, total, description, ot_id))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("""
+            UPDATE overtimes
+            SET employee_id=?, date=?, hours=?, rate=?, total=?, description=?
+            WHERE id=?
+        """, (employee_id, date_str, hours, rate, total, description, ot_id))
 
 
 def delete_overtime(ot_id):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("DELETE FROM overtimes WHERE id=?", (ot_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        c = conn.cursor()
+        c.execute("DELETE FROM overtimes WHERE id=?", (ot_id,))
+
+
+# ------------ ARAMA ------------ #
+
+SearchHit = namedtuple("SearchHit", "kind record_id employee_id name date text rank")
+
+# Global aramada döndürülen en fazla sonuç
+SEARCH_RESULT_LIMIT = 200
+
+# snippet(): eşleşen kelimenin çevresinden gösterilen kelime sayısı
+SNIPPET_TOKENS = 12
+
+
+def fts_query(text):
+    """Kullanıcı metnini FTS5 sorgusuna çevirir: her kelime önek olarak
+    aranır, kelimelerin hepsi geçmeli ('kayn ara' -> '"kayn"* "ara"*').
+    Kelime yoksa None."""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _search_index_exists(c):
+    c.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (SEARCH_SOURCES[0][1],))
+    return c.fetchone() is not None
+
+
+def search_records(text, limit=SEARCH_RESULT_LIMIT, kinds=None):
+    """Devamsızlık notları, mesai ve avans açıklamalarında arama.
+
+    Sonuçlar FTS5 bm25 skoruna göre (en ilgili önce, eşitlikte yeni tarih
+    önce) sıralanır; metin alanı eşleşen kısmı «» ile işaretlenmiş
+    özettir. kinds: sadece bu kayıt türleri ('attendance', 'overtime',
+    'advance'). Geri dönen: [SearchHit, ...]
+    """
+    query = fts_query(text)
+    if query is None:
+        return []
+    sources = [src for src in SEARCH_SOURCES if kinds is None or src[0] in kinds]
+    if not sources:
+        return []
+
+    c = connection().cursor()
+    if _search_index_exists(c):
+        parts = [f"""
+            SELECT '{kind}', t.id, t.employee_id, e.name, t.date,
+                   snippet({fts}, 0, '«', '»', '…', {SNIPPET_TOKENS}), bm25({fts})
+            FROM {fts}
+            JOIN {table} t ON t.id = {fts}.rowid
+            JOIN employees e ON e.id = t.employee_id
+            WHERE {fts} MATCH :query
+        """ for kind, fts, table, column in sources]
+        params = {"query": query, "limit": limit}
+    else:
+        # FTS5 yoksa: her kelime metin içinde geçmeli (LIKE, tam tarama)
+        words = re.findall(r"\w+", text)
+        params = {f"w{i}": f"%{word}%" for i, word in enumerate(words)}
+        params["limit"] = limit
+        parts = [f"""
+            SELECT '{kind}', t.id, t.employee_id, e.name, t.date, t.{column}, 0
+            FROM {table} t
+            JOIN employees e ON e.id = t.employee_id
+            WHERE {" AND ".join(f"t.{column} LIKE :w{i}" for i in range(len(words)))}
+        """ for kind, fts, table, column in sources]
+
+    c.execute(
+        " UNION ALL ".join(parts) + " ORDER BY 7, 5 DESC LIMIT :limit",
+        params,
+    )
+    return [SearchHit(*row) for row in c.fetchall()]
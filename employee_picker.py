@@ -0,0 +1,109 @@
+"""Yazdıkça daralan personel seçici (devamsızlık, mesai, avans formları).
+
+Düzenlenebilir bir ttk.Combobox: her tuşta açılır listenin değerleri
+ortak personel dizininin önek aramasıyla (EmployeeDirectory.search)
+değiştirilir; binlerce isim arasında kaydırmak yerine birkaç harf yazılır.
+
+- Aşağı ok / liste düğmesi daraltılmış listeyi açar.
+- Enter ilk adayı seçer; odak çıkınca tek aday kaldıysa o seçilir.
+- Seçim her durumda <<ComboboxSelected>> üretir (readonly combobox gibi).
+"""
+from tkinter import ttk
+
+from employee_directory import get_employee_directory
+
+# Değer listesini değiştirmeyen tuşlar
+_NAVIGATION_KEYS = {
+    "Up", "Down", "Left", "Right", "Home", "End", "Prior", "Next",
+    "Return", "KP_Enter", "Escape", "Tab", "ISO_Left_Tab",
+    "Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R",
+}
+
+
+class EmployeePicker(ttk.Combobox):
+    def __init__(self, master, directory=None, **kwargs):
+        kwargs.setdefault("width", 30)
+        super().__init__(master, **kwargs)
+        self.directory = directory or get_employee_directory()
+        self._query = None
+
+        self.bind("<KeyRelease>", self._on_key)
+        self.bind("<Return>", self._on_return)
+        self.bind("<KP_Enter>", self._on_return)
+        self.bind("<FocusOut>", self._on_focus_out)
+
+    # ---- Dış API ----
+
+    def refresh(self):
+        """Dizin değişince çağrılır: tam liste yüklenir, geçerli seçim korunur,
+        yoksa ilk personel seçilir."""
+        labels = self._show(self.directory.active_labels())
+        if self.get() in labels:
+            return
+        self.reset()
+
+    def reset(self):
+        """Filtreyi kaldırır ve ilk personeli seçer (form temizlenince)."""
+        labels = self._show(self.directory.active_labels())
+        if labels:
+            self.current(0)
+        else:
+            self.set("")
+
+    def selected_employee(self):
+        """Seçili / yazılı personel (Employee); boşsa ya da çözülemiyorsa None."""
+        text = self.get()
+        return self.directory.resolve(text) if text else None
+
+    def set_employee(self, emp_id):
+        """Personeli id ile seçer (listeden kayıt seçilince)."""
+        label = self.directory.label(emp_id)
+        if label:
+            self.set(label)
+        return bool(label)
+
+    # ---- Olaylar ----
+
+    def _show(self, labels):
+        self["values"] = labels
+        return labels
+
+    def _on_key(self, event):
+        if event.keysym in _NAVIGATION_KEYS:
+            return
+        query = self.get()
+        if query == self._query:
+            return
+        self._query = query
+        self._show(self.directory.search(query))
+
+    def _choose(self, label):
+        self._query = label
+        self.set(label)
+        self.icursor("end")
+        self.event_generate("<<ComboboxSelected>>")
+
+    def _on_return(self, event):
+        text = self.get()
+        emp = self.directory.resolve(text)
+        if emp is not None:
+            self._choose(self.directory.label(emp.id))
+        else:
+            candidates = self.directory.search(text, limit=1)
+            if candidates:
+                self._choose(candidates[0])
+        return "break"
+
+    def _on_focus_out(self, event):
+        text = self.get()
+        if not text:
+            return
+        emp = self.directory.resolve(text)
+        if emp is not None:
+            label = self.directory.label(emp.id)
+            if label != text:
+                self._choose(label)
+            return
+        candidates = self.directory.search(text, limit=2)
+        if len(candidates) == 1:
+            self._choose(candidates[0])
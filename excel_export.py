@@ -0,0 +1,167 @@
+"""Excel dışa aktarımı (openpyxl write_only modu).
+
+Satırlar bir iterator'dan (tercihen doğrudan bir DB cursor'ından) okunup
+sayfaya akıtılır; çalışma kitabı bellekte kurulmaz, her satır yazıldığı anda
+diske serileştirilir. Bellek kullanımı satır sayısından bağımsızdır.
+
+₺ ve saat sütunları hücre biçimiyle yazılır; değerler Excel'de sayı olarak
+kalır (toplanabilir, sıralanabilir). Bir dosyada birden fazla sayfa (örn. her
+ay için bir sayfa) açılabilir.
+
+openpyxl sadece bu modül import edildiğinde yüklenir; arayüz modülleri bu
+modülü dışa aktarım anında (arka plan işinde) import etmelidir.
+"""
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+MONEY_FORMAT = '#,##0.00 "₺"'
+HOURS_FORMAT = "0.00"
+
+# Kaç satırda bir iptal / ilerleme kontrolü yapılır
+PROGRESS_EVERY = 500
+
+# Excel sayfa adında kullanılamayan karakterler ve azami uzunluk
+_INVALID_TITLE_CHARS = str.maketrans({ch: "-" for ch in "[]:*?/\\"})
+_MAX_TITLE_LEN = 31
+
+
+class ExcelColumn:
+    """Sayfa sütunu: başlık, hücre biçimi (None = Genel) ve genişlik."""
+
+    __slots__ = ("title", "number_format", "width")
+
+    def __init__(self, title, number_format=None, width=None):
+        self.title = title
+        self.number_format = number_format
+        self.width = width
+
+
+def text_column(title, width=18):
+    return ExcelColumn(title, None, width)
+
+
+def money_column(title, width=15):
+    return ExcelColumn(title, MONEY_FORMAT, width)
+
+
+def hours_column(title, width=12):
+    return ExcelColumn(title, HOURS_FORMAT, width)
+
+
+class ExcelSheet:
+    """Tek bir write_only sayfası; append() ile satır satır yazılır."""
+
+    def __init__(self, export, title, columns):
+        self.export = export
+        self.ws = export.wb.create_sheet(_sheet_title(title))
+        self.rows_written = 0
+
+        for idx, col in enumerate(columns, start=1):
+            if col.width:
+                self.ws.column_dimensions[get_column_letter(idx)].width = col.width
+        self.ws.freeze_panes = "A2"
+
+        header = []
+        for col in columns:
+            cell = WriteOnlyCell(self.ws, col.title)
+            cell.font = export.header_font
+            header.append(cell)
+        self.ws.append(header)
+
+        # Sadece biçimli sütunlar hücre nesnesine sarılır; diğer değerler
+        # olduğu gibi yazılır.
+        self._formats = [
+            (idx, col.number_format)
+            for idx, col in enumerate(columns)
+            if col.number_format
+        ]
+
+    def append(self, values):
+        if self._formats:
+            values = list(values)
+            for idx, number_format in self._formats:
+                value = values[idx]
+                if isinstance(value, (int, float)):
+                    cell = WriteOnlyCell(self.ws, value)
+                    cell.number_format = number_format
+                    values[idx] = cell
+        self.ws.append(values)
+        self.rows_written += 1
+        self.export._row_done()
+
+    def append_rows(self, rows):
+        for values in rows:
+            self.append(values)
+        return self.rows_written
+
+
+class ExcelExport:
+    """write_only çalışma kitabı.
+
+    export = ExcelExport(path, task=task, total=len(rows))
+    export.sheet("Bordro", columns).append_rows(rows)
+    export.save()
+
+    Sayfalar aynı anda açık tutulup sırayla doldurulabilir (örn. özet + detay).
+    """
+
+    def __init__(self, file_path, task=None, total=None):
+        self.file_path = file_path
+        self.wb = Workbook(write_only=True)
+        self.header_font = Font(bold=True)
+        self.task = task
+        self.total = total
+        self.rows_written = 0
+
+    def sheet(self, title, columns):
+        return ExcelSheet(self, title, columns)
+
+    def write_sheet(self, title, columns, rows):
+        """Yeni bir sayfa açıp rows'u yazar; yazılan satır sayısını döndürür."""
+        return self.sheet(title, columns).append_rows(rows)
+
+    def save(self):
+        # write_only kitap en az bir sayfa ister
+        if not self.wb.worksheets:
+            self.wb.create_sheet("Sayfa1")
+        self.wb.save(self.file_path)
+        return self.rows_written
+
+    def _row_done(self):
+        self.rows_written += 1
+        if self.task is not None and self.rows_written % PROGRESS_EVERY == 0:
+            self.task.check_cancelled()
+            self.task.report(self.rows_written, self.total)
+
+
+def _sheet_title(title):
+    return str(title).translate(_INVALID_TITLE_CHARS)[:_MAX_TITLE_LEN] or "Sayfa"
+
+
+def write_single_sheet(file_path, title, columns, rows, task=None, total=None):
+    """Tek sayfalık dosya; yazılan satır sayısını döndürür."""
+    export = ExcelExport(file_path, task=task, total=total)
+    export.write_sheet(title, columns, rows)
+    return export.save()
+
+
+def write_monthly_sheets(file_path, columns, months, task=None, total=None, skip_empty=True):
+    """Her ay için ayrı sayfa. months: (sayfa_adı, satır_iterator) ikilileri.
+
+    skip_empty=True ise hiç satırı olmayan ayların sayfası açılmaz (sayfa,
+    ilk satır geldiğinde oluşturulur). Yazılan toplam satır sayısını döndürür.
+    """
+    export = ExcelExport(file_path, task=task, total=total)
+    for title, rows in months:
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            if not skip_empty:
+                export.sheet(title, columns)
+            continue
+        sheet = export.sheet(title, columns)
+        sheet.append(first)
+        sheet.append_rows(rows)
+    return export.save()
@@ -0,0 +1,179 @@
+"""Devamsızlık Excel içe aktarımı.
+
+Dosya openpyxl read_only modunda satır satır okunur, her satır bir
+generator içinde ayrıştırılır/doğrulanır ve geçerli kayıtlar parça parça
+executemany ile tek transaction'da yazılır. Bellek kullanımı dosya boyutundan
+bağımsızdır (sadece hata listesi büyür).
+"""
+from datetime import date, datetime
+
+from db import add_attendance_bulk
+
+ATTENDANCE_TYPE_CODES = ["HOUR_LOSS", "FULL_ABSENCE", "FREE_LEAVE", "ANNUAL_LEAVE", "REPORT"]
+
+DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y")
+
+
+class ImportReport:
+    """İçe aktarma sonucu: başarılı sayısı + satır bazlı hata listesi."""
+
+    def __init__(self):
+        self.imported = 0
+        self.errors = []          # [(excel_satır_no, personel, mesaj), ...]
+        self.unknown_emps = set()
+
+    @property
+    def skipped(self):
+        return len(self.errors)
+
+    def add_error(self, row_no, name, message):
+        self.errors.append((row_no, name, message))
+
+
+def find_columns(header_row):
+    """Başlık satırından sütun indekslerini (0 tabanlı) bulur."""
+    header_map = {}
+    for idx, val in enumerate(header_row):
+        if not val:
+            continue
+        key = str(val).strip().lower()
+        header_map.setdefault(key, idx)
+
+    def find_col(possible_keys):
+        for k in possible_keys:
+            for h, col_idx in header_map.items():
+                if k in h:
+                    return col_idx
+        return None
+
+    return {
+        "person": find_col(["personel", "isim", "ad"]),
+        "date": find_col(["tarih", "date"]),
+        "type": find_col(["tür", "tur", "type"]),
+        "hours": find_col(["eksik saat", "saat", "hours"]),
+        "note": find_col(["not", "açıklama", "aciklama", "note"]),
+    }
+
+
+def parse_date(value):
+    """Excel hücresindeki tarihi 'YYYY-AA-GG' metnine çevirir; olmazsa None."""
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, str):
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(value.strip(), fmt).strftime("%Y-%m-%d")
+            except ValueError:
+                continue
+    return None
+
+
+def parse_type(value):
+    """Serbest metin türü (örn. 'Tam gün', 'rapor') tür koduna çevirir."""
+    type_code = "HOUR_LOSS"
+    if value:
+        t_str = str(value).strip().upper()
+        if "HOUR" in t_str or "SAAT" in t_str:
+            type_code = "HOUR_LOSS"
+        elif "FULL" in t_str or "TAM" in t_str:
+            type_code = "FULL_ABSENCE"
+        elif "FREE" in t_str or "ÜCRETSİZ" in t_str:
+            type_code = "FREE_LEAVE"
+        elif "ANNUAL" in t_str or "YILLIK" in t_str:
+            type_code = "ANNUAL_LEAVE"
+        elif "RAPOR" in t_str or "REPORT" in t_str:
+            type_code = "REPORT"
+        elif t_str in ATTENDANCE_TYPE_CODES:
+            type_code = t_str
+    return type_code
+
+
+def parse_hours(value):
+    if value is None or str(value).strip() == "":
+        return 0.0
+    try:
+        return float(str(value).replace(",", "."))
+    except ValueError:
+        return 0.0
+
+
+def iter_attendance_records(rows, cols, emp_name_to_id, report, first_row_no=2):
+    """Ham satırlardan (values_only tuple) geçerli kayıtlar üretir.
+
+    Geçersiz satırlar report'a yazılır ve atlanır.
+    Üretilen kayıt: (employee_id, date_str, type_code, hours, note)
+    """
+    col_person = cols["person"]
+    col_date = cols["date"]
+    col_type = cols["type"]
+    col_hours = cols["hours"]
+    col_note = cols["note"]
+
+    def cell(row, idx):
+        if idx is None or idx >= len(row):
+            return None
+        return row[idx]
+
+    for row_no, row in enumerate(rows, start=first_row_no):
+        name_val = cell(row, col_person)
+        date_val = cell(row, col_date)
+
+        # Tamamen boş satır
+        if (name_val is None or str(name_val).strip() == "") and not date_val:
+            continue
+
+        name_str = str(name_val).strip() if name_val else ""
+        if not name_str:
+            report.add_error(row_no, "", "Personel adı boş")
+            continue
+
+        emp_id = emp_name_to_id.get(name_str)
+        if not emp_id:
+            report.unknown_emps.add(name_str)
+            report.add_error(row_no, name_str, "Tanımlı olmayan personel")
+            continue
+
+        date_str = parse_date(date_val)
+        if date_str is None:
+            report.add_error(row_no, name_str, f"Geçersiz tarih: {date_val!r}")
+            continue
+
+        type_code = parse_type(cell(row, col_type))
+
+        hours_val = parse_hours(cell(row, col_hours))
+        if type_code != "HOUR_LOSS":
+            hours_val = 0.0
+
+        note_val = ""
+        n_val = cell(row, col_note)
+        if n_val:
+            note_val = str(n_val).strip()
+
+        yield emp_id, date_str, type_code, hours_val, note_val
+
+
+def import_attendance_excel(file_path, emp_name_to_id):
+    """Excel dosyasını okuyup devamsızlık kayıtlarını tek transaction'da yazar.
+
+    Başlık satırında en az 'Personel' ve 'Tarih' olmalıdır; yoksa ValueError.
+    Geri dönen: ImportReport
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        rows = ws.iter_rows(values_only=True)
+
+        header = next(rows, None) or ()
+        cols = find_columns(header)
+        if cols["person"] is None or cols["date"] is None:
+            raise ValueError("Excel başlıkları bulunamadı (en az 'Personel' ve 'Tarih' olmalı).")
+
+        report = ImportReport()
+        records = iter_attendance_records(rows, cols, emp_name_to_id, report)
+        report.imported = add_attendance_bulk(records)
+    finally:
+        wb.close()
+
+    return report
@@ -1,15 +1,35 @@
+import importlib
+import multiprocessing
 import tkinter as tk
-from tkinter import ttk, simpledialog
-
-from db import init_db
-from ui_dashboard import DashboardTab
-from ui_employees import EmployeesTab
-from ui_attendance import AttendanceTab
-from ui_advance import AdvanceTab
-from ui_overtime import OvertimeTab
-from ui_salary import SalaryTab
-from ui_settings import SettingsTab
-from ui_performance import PerformanceTab
+from tkinter import ttk, messagebox, simpledialog
+
+from db import init_db, close_connection
+from task_runner import get_task_runner
+
+# (öznitelik, sekme başlığı, modül, sınıf) – notebook'taki sırayla.
+# Sekmeler ilk seçildiklerinde kurulur; modülleri (ve matplotlib, tkcalendar
+# gibi ağır bağımlılıkları) de o an import edilir.
+TAB_SPECS = [
+    ("tab_dashboard", "Dashboard", "ui_dashboard", "DashboardTab"),
+    ("tab_employees", "Personeller", "ui_employees", "EmployeesTab"),
+    ("tab_attendance", "Devamsızlık", "ui_attendance", "AttendanceTab"),
+    ("tab_advance", "Avans", "ui_advance", "AdvanceTab"),
+    ("tab_overtime", "Mesai", "ui_overtime", "OvertimeTab"),
+    ("tab_salary", "Aylık Saat / Maaş", "ui_salary", "SalaryTab"),
+    ("tab_performance", "Performans (PPM)", "ui_performance", "PerformanceTab"),
+    ("tab_settings", "Ayarlar", "ui_settings", "SettingsTab"),
+]
+
+# Global aramada kayıt türü -> kaydın açılacağı sekme (bkz. ui_search.py)
+SEARCH_HIT_TABS = {
+    "attendance": "tab_attendance",
+    "overtime": "tab_overtime",
+    "advance": "tab_advance",
+}
+
+# Otomatik yedek kontrolü: açılıştan sonra ilk kontrol ve sonraki aralık (ms)
+AUTO_BACKUP_FIRST_CHECK_MS = 60 * 1000
+AUTO_BACKUP_CHECK_MS = 15 * 60 * 1000
 
 
 class RoleDialog(simpledialog.Dialog):
@@ -37,18 +57,28 @@ class RoleDialog(simpledialog.Dialog):
 
 
 class PatronApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, role=None):
         super().__init__()
 
         self.current_role = "OFIS"  # varsayılan
         self.notebook = None
         self.role_label = None
+        self.auto_backup_task = None
+        self.search_dialog = None
+
+        # Sekme yer tutucuları (Frame) ve kurulmuş sekmeler: öznitelik -> nesne
+        self.tab_placeholders = {}
+        for attr, _, _, _ in TAB_SPECS:
+            setattr(self, attr, None)
 
         self.title("Personel Takip - Devamsızlık, Avans, Mesai ve Maaş Hesaplama")
         self.geometry("1150x680")
 
-        # Rol seçimi
-        self.ask_for_role()
+        # Rol seçimi (role verilirse sorulmaz; ölçüm / otomasyon için)
+        if role in ("PATRON", "OFIS"):
+            self.current_role = role
+        else:
+            self.ask_for_role()
 
         # Arayüzü kur
         self.build_ui()
@@ -56,6 +86,9 @@ class PatronApp(tk.Tk):
         # Rol yetkilerini uygula (maaş saklama vb.)
         self.apply_role_permissions()
 
+        # Zamanlanmış otomatik yedek (bkz. backup.py)
+        self.after(AUTO_BACKUP_FIRST_CHECK_MS, self.check_auto_backup)
+
     # ------------------------------------------------------------------ #
     # Rol yönetimi
     # ------------------------------------------------------------------ #
@@ -94,29 +127,154 @@ class PatronApp(tk.Tk):
         )
         self.role_label.pack(side="right")
 
+        # Global arama (notlar / açıklamalar); Ctrl+F ile de açılır
+        ttk.Button(header, text="Ara", command=self.open_search)\
+            .pack(side="right", padx=(5, 20))
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(header, textvariable=self.search_var, width=28)
+        search_entry.pack(side="right")
+        search_entry.bind("<Return>", lambda e: self.open_search())
+        self.bind_all("<Control-f>", lambda e: self.open_search())
+
+        # Alt durum çubuğu (arka plan işleri) – notebook'tan önce yerleşmeli
+        self.build_status_bar()
+
         # Sekmeler
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill="both", expand=True, padx=10, pady=10)
 
-        # Sekme nesneleri
-        self.tab_dashboard = DashboardTab(self.notebook)
-        self.tab_employees = EmployeesTab(self.notebook)
-        self.tab_attendance = AttendanceTab(self.notebook)
-        self.tab_advance = AdvanceTab(self.notebook)
-        self.tab_overtime = OvertimeTab(self.notebook)
-        self.tab_salary = SalaryTab(self.notebook)
-        self.tab_settings = SettingsTab(self.notebook)
-        self.tab_performance = PerformanceTab(self.notebook)
-
-        # Dashboard en başta olacak şekilde ekle
-        self.notebook.add(self.tab_dashboard, text="Dashboard")
-        self.notebook.add(self.tab_employees, text="Personeller")
-        self.notebook.add(self.tab_attendance, text="Devamsızlık")
-        self.notebook.add(self.tab_advance, text="Avans")
-        self.notebook.add(self.tab_overtime, text="Mesai")
-        self.notebook.add(self.tab_salary, text="Aylık Saat / Maaş")
-        self.notebook.add(self.tab_performance, text="Performans (PPM)")
-        self.notebook.add(self.tab_settings, text="Ayarlar")
+        # Her sekme için boş bir yer tutucu eklenir; gerçek sekme ilk
+        # seçildiğinde (<<NotebookTabChanged>>) bunun içine kurulur.
+        for attr, text, _, _ in TAB_SPECS:
+            placeholder = ttk.Frame(self.notebook)
+            self.tab_placeholders[attr] = placeholder
+            self.notebook.add(placeholder, text=text)
+
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        # İlk sekme, pencere ilk kez çizildikten sonra kurulur
+        self.after_idle(self.on_tab_changed)
+
+    def on_tab_changed(self, event=None):
+        selected = self.notebook.select()
+        if not selected:
+            return
+        index = self.notebook.index(selected)
+        self.ensure_tab(TAB_SPECS[index][0])
+
+    def ensure_tab(self, attr):
+        """Sekme henüz kurulmadıysa kurar ve rol kısıtlamalarını uygular."""
+        tab = getattr(self, attr)
+        if tab is not None:
+            return tab
+
+        _, _, module_name, class_name = next(spec for spec in TAB_SPECS if spec[0] == attr)
+        tab_class = getattr(importlib.import_module(module_name), class_name)
+
+        placeholder = self.tab_placeholders[attr]
+        tab = tab_class(placeholder)
+        tab.pack(fill="both", expand=True)
+        setattr(self, attr, tab)
+
+        self.apply_tab_permissions(attr, tab)
+        return tab
+
+    def open_search(self):
+        """Arama penceresini açar; üstteki kutuda metin varsa onu arar."""
+        from ui_search import SearchDialog
+
+        if self.search_dialog is None:
+            self.search_dialog = SearchDialog(self, self.open_search_hit)
+        self.search_dialog.show(self.search_var.get().strip())
+
+    def open_search_hit(self, hit):
+        """Arama sonucunu kendi sekmesinde gösterir (sekme gerekirse kurulur)."""
+        attr = SEARCH_HIT_TABS[hit.kind]
+        self.notebook.select(self.tab_placeholders[attr])
+        tab = self.ensure_tab(attr)
+        if not tab.show_record(hit.record_id, hit.date):
+            messagebox.showwarning("Arama", "Kayıt bulunamadı (silinmiş olabilir).")
+
+    def build_status_bar(self):
+        """Arka planda çalışan işlerin durumu, ilerlemesi ve iptal butonu."""
+        status = ttk.Frame(self)
+        status.pack(side="bottom", fill="x", padx=10, pady=(0, 5))
+
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(status, textvariable=self.status_var, foreground="gray")\
+            .pack(side="left")
+
+        self.status_cancel_btn = ttk.Button(
+            status, text="İptal", command=lambda: self.task_runner.cancel_all()
+        )
+        self.status_progress = ttk.Progressbar(status, length=180, mode="determinate")
+
+        self.task_runner = get_task_runner(self)
+        self.task_runner.add_listener(self.on_tasks_changed)
+
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_tasks_changed(self, active_tasks):
+        if not active_tasks:
+            self.status_var.set("")
+            self.status_progress.stop()
+            self.status_progress.config(mode="determinate", value=0)
+            self.status_progress.pack_forget()
+            self.status_cancel_btn.pack_forget()
+            return
+
+        task = active_tasks[-1]
+        text = task.description or "İşlem sürüyor"
+        if len(active_tasks) > 1:
+            text += f" (+{len(active_tasks) - 1} iş)"
+        self.status_var.set(text + "…")
+
+        if task.total:
+            self.status_progress.stop()
+            self.status_progress.config(mode="determinate", maximum=task.total, value=task.done)
+        elif str(self.status_progress.cget("mode")) != "indeterminate":
+            self.status_progress.config(mode="indeterminate")
+            self.status_progress.start(15)
+        self.status_cancel_btn.pack(side="right")
+        self.status_progress.pack(side="right", padx=5)
+
+    def on_close(self):
+        self.task_runner.shutdown()
+        self.destroy()
+
+    # ------------------------------------------------------------------ #
+    # Otomatik yedek
+    # ------------------------------------------------------------------ #
+    def check_auto_backup(self):
+        """Zamanı geldiyse arka planda yedek alır; her AUTO_BACKUP_CHECK_MS'de bir çağrılır."""
+        from backup import auto_backup_due, run_auto_backup
+        from db import get_backup_config
+
+        self.after(AUTO_BACKUP_CHECK_MS, self.check_auto_backup)
+        if self.auto_backup_task is not None:
+            return
+
+        config = get_backup_config()
+        try:
+            due = auto_backup_due(config)
+        except OSError:
+            due = True  # klasör okunamıyorsa yedek alma denemesi hatayı gösterir
+        if not due:
+            return
+
+        def finished(_result=None):
+            self.auto_backup_task = None
+
+        def failed(e):
+            finished()
+            messagebox.showwarning("Otomatik Yedek", f"Otomatik yedek alınamadı:\n{e}")
+
+        self.auto_backup_task = self.task_runner.submit(
+            lambda task: run_auto_backup(config, task=task),
+            description="Otomatik yedek alınıyor",
+            on_done=finished,
+            on_error=failed,
+            on_cancel=finished,
+        )
 
     # ------------------------------------------------------------------ #
     # Rol bazlı yetkiler
@@ -126,134 +284,166 @@ class PatronApp(tk.Tk):
         Patron harici (OFIS) kullanıcılar için:
           - Personeller sekmesinde saatlik ücret sütununu gizle ve giriş alanını kilitle
           - Mesai sekmesinde mesai saatlik ücret ve toplam mesai ücreti sütunlarını gizle
-          - Aylık Saat / Maaş sekmesinde tüm para kolonlarını + kasa özetini gizle
+          - Aylık Saat / Maaş sekmesinde tüm para kolonlarını + kasa özetini gizle,
+            dönem kapat / aç / yeniden hesapla butonlarını kaldır
           - Performans (PPM) sekmesinde mesai tutarı ve net maaş kolonlarını gizle
+          - Dashboard eğiliminde sadece saat serilerini çiz (maliyet / bordro yok)
 
         Amaç:
           Ofis personeli devamsızlık, avans ve mesai saatlerini girebilsin,
           fakat personelin ne kadar kazandığını göremesin.
+
+        Sekmeler ilk açılışta kurulduğu için kısıtlamalar sekme kurulurken
+        (ensure_tab -> apply_tab_permissions) uygulanır; burada sadece o ana
+        kadar kurulmuş sekmeler elden geçirilir.
         """
 
         # Başlıkta rol metnini güncelle
         if self.role_label is not None:
             self.role_label.config(text=self.role_display_text())
 
+        for attr, _, _, _ in TAB_SPECS:
+            tab = getattr(self, attr)
+            if tab is not None:
+                self.apply_tab_permissions(attr, tab)
+
+    def apply_tab_permissions(self, attr, tab):
         # Patron ise her şeyi görsün – ekstra kısıtlama yok.
         if self.current_role == "PATRON":
             return
 
         # --------------------------------------------------------------
-        # Yardımcı: treeview içindeki "para" kolonlarını gizleyen fonksiyon
+        # 0) Dashboard eğiliminde mesai maliyeti / net bordro çizilmesin
         # --------------------------------------------------------------
-        def hide_money_columns_in_tree(tree: ttk.Treeview):
-            try:
-                cols = tree["columns"]
-            except Exception:
-                return
-
-            for col in cols:
-                info = tree.heading(col)
-                text = str(info.get("text", "")).strip()
-                lower = text.lower()
-
-                # Avans kolonlarını BILEREK bırakıyoruz (ofis avansı görebilmeli)
-                # Sadece maaş / ücret / net / mesai tutarı gibi kazanç kolonlarını gizliyoruz.
-                is_money = (
-                    ("maaş" in lower)
-                    or ("ücret" in lower)
-                    or ("tutar" in lower)
-                    or ("net" in lower)
-                    or ("kasadan" in lower)
-                    or ("₺" in lower)
-                    or ("kazanç" in lower)
-                    # "Mesai" ama "saat" geçmiyorsa genelde para kolonu oluyor (Aylık Saat / Maaş'taki 'Mesai')
-                    or ("mesai" in lower and "saat" not in lower and "saatlik" not in lower)
-                )
-
-                if is_money:
-                    tree.column(col, width=0, stretch=False)
-                    tree.heading(col, text="")
-
-        def hide_money_in_all_treeviews(root_widget: tk.Widget):
-            """Verilen sekme içindeki tüm Treeview'lerde para kolonlarını gizle."""
-            def walk(w):
-                if isinstance(w, ttk.Treeview):
-                    hide_money_columns_in_tree(w)
-                for child in w.winfo_children():
-                    walk(child)
-            walk(root_widget)
+        if attr == "tab_dashboard":
+            tab.hide_money()
 
         # --------------------------------------------------------------
         # 1) Personeller sekmesinde saatlik ücret sütununu gizle + girişini kilitle
         # --------------------------------------------------------------
-        try:
-            hide_money_in_all_treeviews(self.tab_employees)
-
-            # Saatlik ücret girişini kilitle:
-            # "Saatlik Ücret" yazan label'ı bulup, aynı satırdaki Entry'yi disable yapıyoruz.
-            def disable_hourly_rate_entry(widget):
-                for child in widget.winfo_children():
-                    try:
-                        if isinstance(child, ttk.Label):
-                            txt = str(child.cget("text")).lower()
-                            if "saatlik" in txt and "ücret" in txt:
-                                info = child.grid_info()
-                                if info:
-                                    row = int(info.get("row", 0))
-                                    col = int(info.get("column", 0))
-                                    parent = child.master
-                                    for sib in parent.winfo_children():
-                                        if isinstance(sib, ttk.Entry):
-                                            sinfo = sib.grid_info()
-                                            if (
-                                                sinfo
-                                                and int(sinfo.get("row", -1)) == row
-                                                and int(sinfo.get("column", -1)) == col + 1
-                                            ):
-                                                sib.configure(state="disabled")
-                        # derine in
-                        disable_hourly_rate_entry(child)
-                    except Exception:
-                        disable_hourly_rate_entry(child)
-
-            disable_hourly_rate_entry(self.tab_employees)
-        except Exception:
-            pass
+        elif attr == "tab_employees":
+            try:
+                hide_money_in_all_treeviews(tab)
+                disable_hourly_rate_entry(tab)
+            except Exception:
+                pass
 
         # --------------------------------------------------------------
         # 2) Mesai sekmesinde mesai saatlik ücret ve toplam mesai ücreti sütunlarını gizle
         #    (Heading'lerinde 'ücret', '₺', 'tutar' vs. geçen kolonlar gizleniyor)
         # --------------------------------------------------------------
-        try:
-            hide_money_in_all_treeviews(self.tab_overtime)
-        except Exception:
-            pass
+        elif attr == "tab_overtime":
+            try:
+                hide_money_in_all_treeviews(tab)
+            except Exception:
+                pass
+            tab.hide_money()
 
         # --------------------------------------------------------------
-        # 3) Aylık Saat / Maaş sekmesinde tüm para kolonlarını + kasa özetini gizle
+        # 3) Aylık Saat / Maaş sekmesinde tüm para kolonlarını + kasa özetini gizle,
+        #    dönem kapanışı (snapshot + avans kesintisi yazar) sadece patronda
         # --------------------------------------------------------------
-        try:
-            hide_money_in_all_treeviews(self.tab_salary)
+        elif attr == "tab_salary":
+            tab.lock_period_actions()
+            try:
+                hide_money_in_all_treeviews(tab)
 
-            # Kasa özetini gizle / maskele
-            for attr in ("total_salary_var", "total_overtime_var", "total_net_var"):
-                var = getattr(self.tab_salary, attr, None)
-                if isinstance(var, tk.StringVar):
-                    var.set("Gizli")
-        except Exception:
-            pass
+                # Kasa özetini gizle / maskele
+                for var_name in ("total_salary_var", "total_overtime_var", "total_net_var"):
+                    var = getattr(tab, var_name, None)
+                    if isinstance(var, tk.StringVar):
+                        var.set("Gizli")
+            except Exception:
+                pass
 
         # --------------------------------------------------------------
         # 4) Performans (PPM) sekmesinde mesai tutarı ve net maaş kolonlarını gizle
         #    (Başlıktaki 'Mesai Tutarı', 'Net Maaş', 'Ücret', 'Maaş', '₺' vb.)
         # --------------------------------------------------------------
+        elif attr == "tab_performance":
+            try:
+                hide_money_in_all_treeviews(tab)
+            except Exception:
+                pass
+
+
+# ---------------------------------------------------------------------- #
+# Rol kısıtlaması yardımcıları
+# ---------------------------------------------------------------------- #
+def hide_money_columns_in_tree(tree: ttk.Treeview):
+    """Treeview içindeki "para" kolonlarını gizler."""
+    try:
+        cols = tree["columns"]
+    except Exception:
+        return
+
+    for col in cols:
+        info = tree.heading(col)
+        text = str(info.get("text", "")).strip()
+        lower = text.lower()
+
+        # Avans kolonlarını BILEREK bırakıyoruz (ofis avansı görebilmeli)
+        # Sadece maaş / ücret / net / mesai tutarı gibi kazanç kolonlarını gizliyoruz.
+        is_money = (
+            ("maaş" in lower)
+            or ("ücret" in lower)
+            or ("tutar" in lower)
+            or ("net" in lower)
+            or ("kasadan" in lower)
+            or ("₺" in lower)
+            or ("kazanç" in lower)
+            # "Mesai" ama "saat" geçmiyorsa genelde para kolonu oluyor (Aylık Saat / Maaş'taki 'Mesai')
+            or ("mesai" in lower and "saat" not in lower and "saatlik" not in lower)
+        )
+
+        if is_money:
+            tree.column(col, width=0, stretch=False)
+            tree.heading(col, text="")
+
+
+def hide_money_in_all_treeviews(root_widget: tk.Widget):
+    """Verilen sekme içindeki tüm Treeview'lerde para kolonlarını gizle."""
+    def walk(w):
+        if isinstance(w, ttk.Treeview):
+            hide_money_columns_in_tree(w)
+        for child in w.winfo_children():
+            walk(child)
+    walk(root_widget)
+
+
+def disable_hourly_rate_entry(widget):
+    """Saatlik ücret girişini kilitle:
+    "Saatlik Ücret" yazan label'ı bulup, aynı satırdaki Entry'yi disable yapıyoruz.
+    """
+    for child in widget.winfo_children():
         try:
-            hide_money_in_all_treeviews(self.tab_performance)
+            if isinstance(child, ttk.Label):
+                txt = str(child.cget("text")).lower()
+                if "saatlik" in txt and "ücret" in txt:
+                    info = child.grid_info()
+                    if info:
+                        row = int(info.get("row", 0))
+                        col = int(info.get("column", 0))
+                        parent = child.master
+                        for sib in parent.winfo_children():
+                            if isinstance(sib, ttk.Entry):
+                                sinfo = sib.grid_info()
+                                if (
+                                    sinfo
+                                    and int(sinfo.get("row", -1)) == row
+                                    and int(sinfo.get("column", -1)) == col + 1
+                                ):
+                                    sib.configure(state="disabled")
+            # derine in
+            disable_hourly_rate_entry(child)
         except Exception:
-            pass
+            disable_hourly_rate_entry(child)
 
 
 if __name__ == "__main__":
+    # Toplu bordro süreç havuzu kullanır (paketlenmiş exe'de gerekli)
+    multiprocessing.freeze_support()
     init_db()
     app = PatronApp()
     app.mainloop()
+    close_connection()
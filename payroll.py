@@ -0,0 +1,929 @@
+"""Bordro / mesai / performans hesapları (arayüzden bağımsız servis katmanı).
+
+Fonksiyonlar veritabanını okur ve sonuç döndürür (istisnalar: avans
+kesintilerini işleyen post_advance_cuts, dönem kapanışı close_period /
+reopen_period ve toplu mesai post_overtime_batch); Tkinter'a dokunmaz.
+Sekmeler bu modülün ince görünümleridir; aynı hesaplar ve dışa aktarımlar
+komut satırından da çalıştırılabilir:
+
+    python -m payroll monthly 2025 3 [--out bordro.xlsx|.csv|.pdf] [--live]
+    python -m payroll close 2025 3          (reopen / recompute / runs)
+    python -m payroll performance 2025 --employee 12 [--out rapor.xlsx|.pdf]
+    python -m payroll company-performance 2025 --out performans.xlsx
+    python -m payroll overtime 2025 [--month 3] --out mesai.xlsx
+    python -m payroll batch --from 2024-01 --to 2025-12 --out bordro.csv
+"""
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from db import (
+    Settings,
+    add_overtime_batch,
+    connection,
+    data_version,
+    delete_payroll_run,
+    get_month_advance_cuts,
+    get_payroll_run,
+    get_payroll_run_rows,
+    get_settings,
+    iter_overtime_list,
+    mark_advance_cuts_posted,
+    save_payroll_run,
+    transaction,
+)
+from utils import calculate_advance_cut
+from work_calendar import (
+    MONTH_NAMES_TR,
+    month_date_range,
+    month_period_end,
+    parse_start_date,
+    working_days_batch,
+    working_days_matrix,
+)
+
+
+# ---- Sonuç nesneleri ----
+
+@dataclass
+class PayrollTotals:
+    """Bordro satırlarının para toplamları (kasa özeti)."""
+    salary: float = 0.0
+    overtime: float = 0.0
+    advance: float = 0.0
+    net_salary: float = 0.0
+
+    @classmethod
+    def from_rows(cls, rows):
+        totals = cls()
+        for r in rows:
+            totals.salary += r["salary"]
+            totals.overtime += r["overtime"]
+            totals.advance += r["advance"]
+            totals.net_salary += r["net_salary"]
+        return totals
+
+
+@dataclass
+class MonthlyPayroll:
+    """Bir ayın bordrosu: hesapta kullanılan ayarlar, satırlar ve toplamlar.
+
+    closed_at doluysa satırlar kapanmış dönemin snapshot'ından okunmuştur;
+    stale, kapanıştan sonra o ayın kayıtlarının ya da personel bilgilerinin
+    değiştiğini gösterir (snapshot yine de değişmez).
+    """
+    year: int
+    month: int
+    settings: Settings
+    rows: list
+    totals: PayrollTotals
+    closed_at: str = None
+    stale: bool = False
+
+    @property
+    def period_text(self):
+        return f"{self.month:02d}/{self.year}"
+
+    @property
+    def is_closed(self):
+        return self.closed_at is not None
+
+
+@dataclass
+class OvertimeBatch:
+    """Toplu mesai önizlemesi: kaydedilmeden önce satırlar ve toplam maliyet.
+
+    rows: (personel id, isim, saatlik ücret, mesai saatlik ücreti, toplam)
+    """
+    date: str
+    hours: float
+    settings: Settings
+    rows: list
+    total: float
+
+    def __len__(self):
+        return len(self.rows)
+
+
+@dataclass
+class YearPerformance:
+    """Bir personelin yıllık performansı: ay satırları ve yıl toplamları."""
+    employee_id: int
+    name: str
+    year: int
+    rows: list
+    totals: dict
+
+
+# ---- Aylık bordro ----
+
+# Tüm personelin ay içi toplamları monthly_employee_summary'den okunur
+# (personel başına tek satır; bkz. db._migration_3_monthly_summary).
+# Hareketi olmayan personel LEFT JOIN ile 0 gelir.
+MONTHLY_TOTALS_SQL = """
+    SELECT
+        e.id,
+        e.name,
+        e.hourly_rate,
+        e.start_date,
+        COALESCE(s.missing_hours, 0),
+        COALESCE(s.overtime_total, 0),
+        COALESCE(s.advance_total, 0)
+    FROM employees e
+    LEFT JOIN monthly_employee_summary s
+        ON s.employee_id = e.id AND s.year = :year AND s.month = :month
+    ORDER BY e.name
+"""
+
+
+def calculate_monthly_payroll(year, month, today=None, settings=None):
+    """Seçilen ay için tüm personelin maaş satırlarını hesaplar.
+
+    Devamsızlık, mesai ve avans toplamları aylık özet tablosundan tek sorgu
+    ile okunur; personel başına ayrı sorgu atılmaz.
+
+    settings verilmezse güncel ayarlar (get_settings) kullanılır.
+
+    Geri dönen liste SalaryTab.last_rows ile aynı yapıdadır:
+        {"employee_id", "name", "hourly_rate", "days", "theoretical_hours",
+         "missing_hours", "total_hours", "salary", "overtime", "advance",
+         "net_salary"}
+    """
+    daily_hours, overtime_coef, include_weekends = settings or get_settings()
+
+    c = connection().cursor()
+    c.execute(MONTHLY_TOTALS_SQL, {"year": year, "month": month})
+    totals = c.fetchall()
+
+    # Çalışma günleri tüm personel için tek seferde (kapalı formül) hesaplanır
+    days_list = working_days_batch(
+        [row[3] for row in totals], year, month, include_weekends, today
+    )
+    rows = []
+
+    for (emp_id, name, hourly_rate, start_str, missing, overtime, advance), work_days in zip(
+        totals, days_list
+    ):
+        # Teorik saat = x * günlük saat
+        theoretical_hours = work_days * daily_hours
+        missing_hours = float(missing or 0)
+
+        # Toplam çalışma saati = teorik - devamsızlık
+        total_hours = max(theoretical_hours - missing_hours, 0)
+
+        # Maaş = toplam saat * saatlik ücret
+        salary = total_hours * float(hourly_rate)
+        overtime_total = float(overtime or 0)
+        advance_total = float(advance or 0)
+        net_salary = salary + overtime_total - advance_total
+
+        rows.append({
+            "employee_id": emp_id,
+            "name": name,
+            "hourly_rate": float(hourly_rate),
+            "days": work_days,
+            "theoretical_hours": theoretical_hours,
+            "missing_hours": missing_hours,
+            "total_hours": total_hours,
+            "salary": salary,
+            "overtime": overtime_total,
+            "advance": advance_total,
+            "net_salary": net_salary,
+        })
+
+    return rows
+
+
+def monthly_payroll(year, month, settings=None, today=None, live=False):
+    """Ayın bordrosu; geri dönen: MonthlyPayroll.
+
+    Dönem kapatılmışsa snapshot okunur (hesap yapılmaz, settings yok
+    sayılır; kapanıştaki ayarlar döner). live=True ise her durumda canlı
+    kayıtlardan calculate_monthly_payroll ile hesaplanır.
+    """
+    if not live:
+        closed = closed_payroll(year, month)
+        if closed is not None:
+            return closed
+    settings = settings or get_settings()
+    rows = calculate_monthly_payroll(year, month, today=today, settings=settings)
+    return MonthlyPayroll(year, month, settings, rows, PayrollTotals.from_rows(rows))
+
+
+# ---- Dönem kapanışı ----
+# Kapanan ayın bordro satırları ayarlarla birlikte payroll_runs'a yazılır
+# (bkz. db._migration_7_payroll_runs). Sonraki ücret / ayar değişiklikleri
+# kapanmış ayı etkilemez; düzeltme gerekiyorsa dönem yeniden açılır.
+
+def closed_payroll(year, month):
+    """Kapanmış dönemin snapshot'ı (MonthlyPayroll); dönem açıksa None."""
+    run = get_payroll_run(year, month)
+    if run is None:
+        return None
+    totals = PayrollTotals(run.total_salary, run.total_overtime, run.total_advance, run.total_net)
+    return MonthlyPayroll(
+        year, month, run.settings, get_payroll_run_rows(year, month), totals,
+        closed_at=run.closed_at,
+        stale=data_version(year, month) != run.data_version,
+    )
+
+
+def close_period(year, month, settings=None, today=None):
+    """Dönemi kapatır: ayın avans kesintileri işlenir, bordro canlı
+    kayıtlardan hesaplanıp snapshot olarak yazılır (tek transaction).
+
+    Bitmemiş ay ya da zaten kapalı dönem için ValueError. Geri dönen:
+    snapshot'tan okunan MonthlyPayroll.
+    """
+    today = today or date.today()
+    if (year, month) >= (today.year, today.month):
+        raise ValueError(f"{month:02d}/{year} henüz bitmedi; sadece geçmiş aylar kapatılabilir.")
+
+    with transaction():
+        if get_payroll_run(year, month) is not None:
+            raise ValueError(f"{month:02d}/{year} zaten kapalı.")
+        post_advance_cuts(year, month)
+        result = monthly_payroll(year, month, settings=settings, today=today, live=True)
+        t = result.totals
+        save_payroll_run(
+            year, month, datetime.now().isoformat(sep=" ", timespec="seconds"),
+            result.settings, data_version(year, month),
+            (t.salary, t.overtime, t.advance, t.net_salary), result.rows,
+        )
+    return closed_payroll(year, month)
+
+
+def reopen_period(year, month):
+    """Dönemi yeniden açar (snapshot silinir; avans kesintileri işlenmiş kalır).
+
+    Geri dönen: dönem kapalıydıysa True.
+    """
+    return delete_payroll_run(year, month)
+
+
+def recompute_period(year, month, settings=None, today=None):
+    """Kapalı dönemi güncel kayıt ve ayarlarla yeniden hesaplayıp tekrar kapatır."""
+    with transaction():
+        reopen_period(year, month)
+        return close_period(year, month, settings=settings, today=today)
+
+
+def month_hours_overview(year, month, settings=None, today=None):
+    """Dashboard için: [(personel, toplam saat, devamsızlık saati), ...].
+
+    O ay hiç çalışması gerekmeyen ve devamsızlığı da olmayan personel atlanır.
+    """
+    rows = calculate_monthly_payroll(year, month, today=today, settings=settings)
+    return [
+        (r["name"], r["total_hours"], r["missing_hours"])
+        for r in rows
+        if r["theoretical_hours"] or r["missing_hours"]
+    ]
+
+
+# ---- Avans kesintileri ----
+# Bordrodaki avans kesintisi taksit planından gelir (özetin advance_total
+# sütunu, bkz. db._migration_6_advance_installments). Ay kapatılırken
+# kesintiler işlenir: avans bakiyeleri düşülür, taksitler işlendi sayılır.
+
+def post_advance_cuts(year, month):
+    """Ayın işlenmemiş taksitlerini tek transaction'da işler.
+
+    Kesinti ve yeni bakiyeler utils.calculate_advance_cut ile bulunur. Aynı
+    ay tekrar işlenirse bir şey değişmez.
+    Geri dönen: (işlenen avans sayısı, toplam kesinti)
+    """
+    with transaction():
+        rows = get_month_advance_cuts(year, month, unposted_only=True)
+        total_cut, updates = calculate_advance_cut(rows)
+        mark_advance_cuts_posted(year, month, updates)
+    return len(rows), total_cut
+
+
+# ---- Mesai ----
+
+def overtime_amount(hours, hourly_rate, settings=None):
+    """Mesai saatlik ücreti ve toplam tutar: (saatlik ücret x katsayı, x saat)."""
+    settings = settings or get_settings()
+    rate = float(hourly_rate) * float(settings.overtime_coef)
+    return rate, rate * float(hours)
+
+
+def prepare_overtime_batch(employees, date_str, hours, settings=None):
+    """Aynı gün aynı saat mesai yapan personel için satırları hazırlar (yazmaz).
+
+    employees: id, name, hourly_rate alanları olan kayıtlar (Employee).
+    Ayarlar bir kez okunur; ücretler overtime_amount ile aynı formülle
+    (saatlik ücret x katsayı, x saat) tek geçişte hesaplanır.
+    """
+    hours = float(hours)
+    if hours <= 0:
+        raise ValueError("Mesai saati 0'dan büyük olmalıdır.")
+    settings = settings or get_settings()
+    coef = float(settings.overtime_coef)
+
+    rows = []
+    total = 0.0
+    for emp in employees:
+        hourly_rate = float(emp.hourly_rate or 0)
+        rate = hourly_rate * coef
+        rows.append((emp.id, emp.name, hourly_rate, rate, rate * hours))
+        total += rate * hours
+    return OvertimeBatch(date_str, hours, settings, rows, total)
+
+
+def post_overtime_batch(batch, description=""):
+    """Önizlenen toplu mesaiyi tek transaction'da yazar; yeni kayıt id'lerini döndürür."""
+    return add_overtime_batch(
+        (emp_id, batch.date, batch.hours, rate, total, description)
+        for emp_id, _, _, rate, total in batch.rows
+    )
+
+
+def overtime_report_rows(year, month, emp_id=None):
+    """Ayın mesai hareketleri, doğrudan DB cursor'ından (sayısal değerler ham).
+
+    (tarih, personel, saat, saatlik ücret, toplam, açıklama)
+    """
+    month_start, month_end = month_date_range(year, month)
+    cursor = iter_overtime_list(month_start.isoformat(), month_end.isoformat(), emp_id)
+    for _, d_str, name, hours, rate, total, desc, _ in cursor:
+        yield d_str, name, hours, rate, total, desc or ""
+
+
+# ---- Yıllık performans ----
+
+# Ay satırı başına toplanan (ve raporlarda yazılan) alanlar
+PERFORMANCE_SUM_KEYS = (
+    "work_days", "theoretical_hours", "missing_hours", "total_hours",
+    "overtime_hours", "overtime_total", "advance_total", "net_salary",
+)
+
+# Seçilen yılın tüm özet satırları; isteğe bağlı tek personel filtresi ile.
+YEAR_SUMMARY_SQL = """
+    SELECT employee_id, month, missing_hours, overtime_hours, overtime_total, advance_total
+    FROM monthly_employee_summary
+    WHERE year = :year {employee_filter}
+"""
+
+
+def _year_summaries(c, year, emp_id=None):
+    """{employee_id: {ay: (eksik saat, mesai saat, mesai tutar, avans)}}"""
+    params = {"year": year}
+    employee_filter = ""
+    if emp_id is not None:
+        employee_filter = "AND employee_id = :emp_id"
+        params["emp_id"] = emp_id
+    c.execute(YEAR_SUMMARY_SQL.format(employee_filter=employee_filter), params)
+    summaries = {}
+    for employee_id, month, *sums in c.fetchall():
+        summaries.setdefault(employee_id, {})[month] = sums
+    return summaries
+
+
+def _year_performance_rows(year, hourly_rate, start_date, work_days_row, summary,
+                           daily_hours, today):
+    """Tek personelin yıl içindeki aylık performans satırları.
+
+    - İçinde bulunulan yılın gelecek ayları gösterilmez
+    - İşe girişten önceki aylar gösterilmez
+    - Hiç hareketi olmayan aylar gizlenir
+    """
+    start_dt = parse_start_date(start_date)
+    rows = []
+
+    for month in range(1, 12 + 1):
+        if year == today.year and month > today.month:
+            continue
+
+        month_start, _ = month_date_range(year, month)
+        period_start = max(start_dt or month_start, month_start)
+        if period_start >= month_period_end(year, month, today):
+            continue
+
+        work_days = work_days_row[month - 1]
+        theoretical_hours = work_days * daily_hours
+
+        missing_hours, overtime_hours, overtime_total, advance_total = summary.get(
+            month, (0.0, 0.0, 0.0, 0.0)
+        )
+
+        total_hours = max(theoretical_hours - missing_hours, 0.0)
+        base_salary = total_hours * float(hourly_rate or 0)
+        net_salary = base_salary + overtime_total - advance_total
+
+        if (
+            theoretical_hours == 0
+            and missing_hours == 0
+            and overtime_total == 0
+            and advance_total == 0
+        ):
+            continue
+
+        rows.append({
+            "year": year,
+            "month": month,
+            "month_name": MONTH_NAMES_TR[month - 1],
+            "work_days": work_days,
+            "theoretical_hours": theoretical_hours,
+            "missing_hours": missing_hours,
+            "total_hours": total_hours,
+            "overtime_hours": overtime_hours,
+            "overtime_total": overtime_total,
+            "advance_total": advance_total,
+            "net_salary": net_salary,
+        })
+
+    return rows
+
+
+def _year_work_days(start_dates, year, include_weekends, today):
+    """Personel x 12 ay çalışma günü matrisi (başlangıcı boş olan yıl başından sayılır)."""
+    return working_days_matrix(
+        [parse_start_date(s) or date(year, 1, 1) for s in start_dates],
+        [(year, month) for month in range(1, 12 + 1)],
+        include_weekends,
+        today,
+    )
+
+
+def calculate_year_performance(emp_id, year, settings=None, today=None):
+    """Bir personelin yıllık performansı: ay başına bir satır.
+
+    Özet tablosundan tek sorgu ile okunur. Satır yapısı:
+        {"year", "month", "month_name", "work_days", "theoretical_hours",
+         "missing_hours", "total_hours", "overtime_hours", "overtime_total",
+         "advance_total", "net_salary"}
+    """
+    daily_hours, overtime_coef, include_weekends = settings or get_settings()
+    if today is None:
+        today = date.today()
+
+    c = connection().cursor()
+    c.execute("SELECT hourly_rate, start_date FROM employees WHERE id=?", (emp_id,))
+    emp_row = c.fetchone()
+    if emp_row is None:
+        return []
+    hourly_rate, start_date = emp_row
+
+    summary = _year_summaries(c, year, emp_id).get(emp_id, {})
+    work_days_row = _year_work_days([start_date], year, include_weekends, today)[0]
+    return _year_performance_rows(
+        year, hourly_rate, start_date, work_days_row, summary, daily_hours, today
+    )
+
+
+def performance_totals(rows):
+    """Performans satırlarının yıl toplamları: {alan: toplam} (PERFORMANCE_SUM_KEYS)."""
+    totals = dict.fromkeys(PERFORMANCE_SUM_KEYS, 0)
+    for r in rows:
+        for key in PERFORMANCE_SUM_KEYS:
+            totals[key] += r[key]
+    return totals
+
+
+def employee_year_performance(emp_id, year, settings=None, today=None):
+    """calculate_year_performance + personel adı ve toplamlar; personel yoksa None."""
+    c = connection().cursor()
+    c.execute("SELECT name FROM employees WHERE id=?", (emp_id,))
+    row = c.fetchone()
+    if row is None:
+        return None
+    rows = calculate_year_performance(emp_id, year, settings=settings, today=today)
+    return YearPerformance(emp_id, row[0], year, rows, performance_totals(rows))
+
+
+def calculate_company_year_performance(year, settings=None, today=None, task=None):
+    """Tüm personel x tüm aylar: şirket geneli yıllık performans.
+
+    Personel listesi ve yılın özet satırları ikişer sorgu ile okunur;
+    çalışma günleri tek matris hesabıdır.
+    Geri dönen: [{"employee_id", "name", "hourly_rate", "rows": [...]}, ...]
+    """
+    daily_hours, overtime_coef, include_weekends = settings or get_settings()
+    if today is None:
+        today = date.today()
+
+    c = connection().cursor()
+    c.execute("SELECT id, name, hourly_rate, start_date FROM employees ORDER BY name")
+    employees = c.fetchall()
+    summaries = _year_summaries(c, year)
+    matrix = _year_work_days([row[3] for row in employees], year, include_weekends, today)
+
+    result = []
+    for i, ((emp_id, name, hourly_rate, start_date), work_days_row) in enumerate(
+        zip(employees, matrix)
+    ):
+        if task is not None and i % 500 == 0:
+            task.check_cancelled()
+            task.report(i, len(employees))
+        rows = _year_performance_rows(
+            year, hourly_rate, start_date, work_days_row,
+            summaries.get(emp_id, {}), daily_hours, today,
+        )
+        result.append({
+            "employee_id": emp_id,
+            "name": name,
+            "hourly_rate": hourly_rate,
+            "rows": rows,
+        })
+    return result
+
+
+# ---- Çok aylık eğilim ----
+
+# Aralıktaki tüm (personel, ay) özet satırları tek sorguda; özet tablo
+# devamsızlık / mesai / avans kayıtlarının (personel, yıl, ay) gruplamasıdır.
+TREND_SUMMARY_SQL = """
+    SELECT employee_id, year * 12 + month - 1, missing_hours, overtime_hours,
+           overtime_total, advance_total
+    FROM monthly_employee_summary
+    WHERE year BETWEEN :first_year AND :last_year
+"""
+
+
+@dataclass
+class MonthlyTrends:
+    """Ay ay şirket geneli toplamlar; her alan periods uzunluğunda numpy dizisi."""
+    periods: list
+    missing_hours: object
+    overtime_hours: object
+    overtime_total: object
+    advance_total: object
+    salary: object
+    net_salary: object
+
+
+def monthly_trends(start, end, settings=None, today=None):
+    """start..end (dahil, (yıl, ay)) aralığında her ayın şirket toplamları.
+
+    Özet satırları tek sorguda okunur, personel x ay matrislerine yerleşir;
+    maaş calculate_monthly_payroll ile aynı formülle (teorik - eksik saat,
+    0'ın altına inmez) vektörel hesaplanır. net_salary[i], o ayın bordro
+    satırlarının net toplamına eşittir.
+    """
+    import numpy as np
+
+    daily_hours, overtime_coef, include_weekends = settings or get_settings()
+    first = start[0] * 12 + start[1] - 1
+    last = end[0] * 12 + end[1] - 1
+    periods = [(index // 12, index % 12 + 1) for index in range(first, last + 1)]
+
+    c = connection().cursor()
+    c.execute("SELECT id, hourly_rate, start_date FROM employees ORDER BY id")
+    employees = c.fetchall()
+    ids = np.array([row[0] for row in employees], dtype=np.int64)
+    rates = np.array([float(row[1] or 0) for row in employees])
+
+    c.execute(TREND_SUMMARY_SQL, {"first_year": start[0], "last_year": end[0]})
+    summary = np.array(c.fetchall(), dtype=float).reshape(-1, 6)
+    summary = summary[(summary[:, 1] >= first) & (summary[:, 1] <= last)]
+
+    # Özet satırı -> (personel satırı, ay sütunu)
+    rows = np.searchsorted(ids, summary[:, 0].astype(np.int64))
+    known = rows < len(ids)
+    known[known] = ids[rows[known]] == summary[known, 0]
+    rows, summary = rows[known], summary[known]
+    cols = summary[:, 1].astype(np.int64) - first
+
+    shape = (len(ids), len(periods))
+    missing = np.zeros(shape)
+    missing[rows, cols] = summary[:, 2]
+
+    days = np.array(
+        working_days_matrix([row[2] for row in employees], periods, include_weekends, today),
+        dtype=float,
+    ).reshape(shape)
+    salary = (np.maximum(days * daily_hours - missing, 0.0) * rates[:, None]).sum(axis=0)
+
+    def month_sums(column):
+        return np.bincount(cols, weights=summary[:, column], minlength=len(periods))
+
+    overtime_total = month_sums(4)
+    advance_total = month_sums(5)
+    return MonthlyTrends(
+        periods=periods,
+        missing_hours=missing.sum(axis=0),
+        overtime_hours=month_sums(3),
+        overtime_total=overtime_total,
+        advance_total=advance_total,
+        salary=salary,
+        net_salary=salary + overtime_total - advance_total,
+    )
+
+
+# ---- Dışa aktarım ----
+# Dosya yazıcıları arka plan işinde (task) ya da komut satırında çalışır;
+# openpyxl / reportlab sadece çağrıldıklarında import edilir.
+
+def write_payroll_csv(file_path, rows, task=None):
+    import csv
+
+    with open(file_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow([
+            "Personel", "Gün", "Teorik Saat", "Eksik Saat", "Toplam Saat",
+            "Maaş", "Mesai", "Avans Kesinti", "Net Maaş",
+        ])
+        for r in rows:
+            writer.writerow([
+                r["name"],
+                r["days"],
+                f"{r['theoretical_hours']:.2f}",
+                f"{r['missing_hours']:.2f}",
+                f"{r['total_hours']:.2f}",
+                f"{r['salary']:.2f}",
+                f"{r['overtime']:.2f}",
+                f"{r['advance']:.2f}",
+                f"{r['net_salary']:.2f}",
+            ])
+
+
+def write_payroll_xlsx(file_path, rows, task=None):
+    from excel_export import hours_column, money_column, text_column, write_single_sheet
+
+    columns = [
+        text_column("Personel", 24),
+        text_column("Gün", 6),
+        hours_column("Teorik Saat"),
+        hours_column("Eksik Saat"),
+        hours_column("Toplam Saat"),
+        money_column("Maaş"),
+        money_column("Mesai"),
+        money_column("Avans Kesinti"),
+        money_column("Net Maaş"),
+    ]
+    values = (
+        (
+            r["name"],
+            r["days"],
+            r["theoretical_hours"],
+            r["missing_hours"],
+            r["total_hours"],
+            r["salary"],
+            r["overtime"],
+            r["advance"],
+            r["net_salary"],
+        )
+        for r in rows
+    )
+    write_single_sheet(file_path, "Bordro", columns, values, task=task, total=len(rows))
+
+
+def _overtime_columns():
+    from excel_export import hours_column, money_column, text_column
+
+    return [
+        text_column("Tarih", 12),
+        text_column("Personel", 24),
+        hours_column("Saat", 8),
+        money_column("Mesai Saatlik Ücret", 20),
+        money_column("Toplam Mesai Ücreti", 20),
+        text_column("Açıklama", 40),
+    ]
+
+
+def write_overtime_xlsx(file_path, year, month, emp_id=None, task=None, total=None):
+    """Ayın mesai hareketleri tek sayfada (satırlar DB'den akıtılır)."""
+    from excel_export import write_single_sheet
+
+    write_single_sheet(
+        file_path, "Mesai Raporu", _overtime_columns(),
+        overtime_report_rows(year, month, emp_id), task=task, total=total,
+    )
+
+
+def write_overtime_year_xlsx(file_path, year, emp_id=None, task=None):
+    """Yılın mesai hareketleri, her ay ayrı sayfada (hareketsiz aylar atlanır)."""
+    from excel_export import write_monthly_sheets
+
+    months = (
+        (f"{MONTH_NAMES_TR[month - 1]} {year}", overtime_report_rows(year, month, emp_id))
+        for month in range(1, 13)
+    )
+    return write_monthly_sheets(file_path, _overtime_columns(), months, task=task)
+
+
+def _performance_columns():
+    from excel_export import hours_column, money_column, text_column
+
+    return [
+        text_column("Çalışma Günü", 13),
+        hours_column("Teorik Saat"),
+        hours_column("Devamsızlık Saat", 16),
+        hours_column("Toplam Saat"),
+        hours_column("Mesai Saat"),
+        money_column("Mesai Tutarı"),
+        money_column("Avans Toplamı"),
+        money_column("Net Maaş"),
+    ]
+
+
+def write_performance_xlsx(file_path, rows, emp_name, task=None):
+    from excel_export import text_column, write_single_sheet
+
+    columns = [
+        text_column("Yıl", 6), text_column("Ay", 10), text_column("Personel", 24),
+    ] + _performance_columns()
+    values = (
+        [r["year"], r["month_name"], emp_name] + [r[k] for k in PERFORMANCE_SUM_KEYS]
+        for r in rows
+    )
+    write_single_sheet(file_path, "Performans", columns, values, task=task)
+
+
+def write_company_performance_xlsx(file_path, year, settings=None, task=None):
+    """Aylık satırlar 'Aylık' sayfasına, personel bazlı yıl toplamları 'Özet' sayfasına."""
+    from excel_export import ExcelExport, text_column
+
+    employees = calculate_company_year_performance(year, settings, task=task)
+
+    export = ExcelExport(file_path, task=task)
+    ws_summary = export.sheet("Özet", [text_column("Personel", 24)] + _performance_columns())
+    ws_months = export.sheet(
+        "Aylık",
+        [text_column("Personel", 24), text_column("Yıl", 6), text_column("Ay", 10)]
+        + _performance_columns(),
+    )
+
+    for emp in employees:
+        for r in emp["rows"]:
+            ws_months.append(
+                [emp["name"], r["year"], r["month_name"]] + [r[k] for k in PERFORMANCE_SUM_KEYS]
+            )
+        if emp["rows"]:
+            totals = performance_totals(emp["rows"])
+            ws_summary.append([emp["name"]] + [totals[k] for k in PERFORMANCE_SUM_KEYS])
+
+    return export.save()
+
+
+# ---- Komut satırı ----
+
+def _print_payroll(result):
+    from utils import format_float, tl
+
+    print(f"Bordro {result.period_text} – {len(result.rows)} personel")
+    if result.is_closed:
+        note = " (kapanıştan sonra kayıtlar değişti)" if result.stale else ""
+        print(f"Kapanmış dönem: {result.closed_at}{note}")
+    print(f"{'Personel':<28}{'Gün':>5}{'Toplam Saat':>13}{'Maaş':>20}{'Mesai':>18}"
+          f"{'Avans':>18}{'Net Maaş':>20}")
+    for r in result.rows:
+        print(f"{r['name'][:27]:<28}{r['days']:>5}{format_float(r['total_hours']):>13}"
+              f"{tl(r['salary']):>20}{tl(r['overtime']):>18}{tl(r['advance']):>18}"
+              f"{tl(r['net_salary']):>20}")
+    t = result.totals
+    print(f"{'TOPLAM':<46}{tl(t.salary):>20}{tl(t.overtime):>18}{tl(t.advance):>18}"
+          f"{tl(t.net_salary):>20}")
+
+
+def _print_performance(perf):
+    from utils import format_float, tl
+
+    print(f"Performans {perf.name} – {perf.year}")
+    print(f"{'Ay':<10}{'Gün':>5}{'Devamsızlık':>13}{'Toplam Saat':>13}{'Mesai':>16}"
+          f"{'Avans':>16}{'Net':>18}")
+    for r in perf.rows + [dict(perf.totals, month_name="TOPLAM")]:
+        print(f"{r['month_name']:<10}{r['work_days']:>5}{format_float(r['missing_hours']):>13}"
+              f"{format_float(r['total_hours']):>13}{tl(r['overtime_total']):>16}"
+              f"{tl(r['advance_total']):>16}{tl(r['net_salary']):>18}")
+
+
+def _output_kind(parser, path, allowed):
+    kind = path.rsplit(".", 1)[-1].lower() if "." in path else ""
+    if kind not in allowed:
+        parser.error(f"Desteklenen çıktı türleri: {', '.join('.' + k for k in allowed)}")
+    return kind
+
+
+def main(argv=None):
+    import argparse
+    import os
+
+    import db
+
+    parser = argparse.ArgumentParser(prog="python -m payroll", description="Bordro hesapları ve raporlar")
+    parser.add_argument("--db", default=db.DB_NAME, help="Veritabanı dosyası")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("monthly", help="Aylık bordro")
+    p.add_argument("year", type=int)
+    p.add_argument("month", type=int)
+    p.add_argument("--out", help=".csv / .xlsx / .pdf (verilmezse ekrana yazar)")
+    p.add_argument("--live", action="store_true", help="Kapalı dönemde de canlı kayıtlardan hesapla")
+
+    for name, text in (("close", "Dönemi kapat (snapshot al)"),
+                       ("reopen", "Kapalı dönemi yeniden aç"),
+                       ("recompute", "Kapalı dönemi yeniden hesapla ve kapat")):
+        p = sub.add_parser(name, help=text)
+        p.add_argument("year", type=int)
+        p.add_argument("month", type=int)
+
+    sub.add_parser("runs", help="Kapanmış dönemler")
+
+    p = sub.add_parser("performance", help="Personel yıllık performansı")
+    p.add_argument("year", type=int)
+    p.add_argument("--employee", type=int, required=True, help="Personel id")
+    p.add_argument("--out", help=".xlsx / .pdf (verilmezse ekrana yazar)")
+
+    p = sub.add_parser("company-performance", help="Tüm personelin yıllık performansı")
+    p.add_argument("year", type=int)
+    p.add_argument("--out", required=True, help=".xlsx")
+
+    p = sub.add_parser("overtime", help="Mesai hareketleri raporu")
+    p.add_argument("year", type=int)
+    p.add_argument("--month", type=int, help="Verilmezse yıl, her ay ayrı sayfada")
+    p.add_argument("--employee", type=int, help="Sadece bu personel")
+    p.add_argument("--out", required=True, help=".xlsx")
+
+    sub.add_parser("batch", help="Ay aralığı için toplu bordro (--from / --to / --out / --workers)",
+                   add_help=False)
+
+    # 'batch' seçenekleri olduğu gibi batch_payroll.main'e aktarılır
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "batch":
+        from batch_payroll import main as batch_main
+        return batch_main(["--db", args.db] + extra)
+    if extra:
+        parser.error(f"Tanınmayan argümanlar: {' '.join(extra)}")
+
+    if not os.path.exists(args.db):
+        parser.error(f"Veritabanı bulunamadı: {args.db}")
+    if getattr(args, "month", None) is not None and not (1 <= args.month <= 12):
+        parser.error("Ay 1-12 arasında olmalı.")
+    db.DB_NAME = args.db
+    db.init_db()
+
+    try:
+        if args.command == "monthly":
+            result = monthly_payroll(args.year, args.month, live=args.live)
+            if not args.out:
+                _print_payroll(result)
+                return 0
+            kind = _output_kind(parser, args.out, ("csv", "xlsx", "pdf"))
+            if kind == "csv":
+                write_payroll_csv(args.out, result.rows)
+            elif kind == "xlsx":
+                write_payroll_xlsx(args.out, result.rows)
+            else:
+                from pdf_reports import write_payroll_pdf
+                write_payroll_pdf(args.out, iter(result.rows), result.period_text)
+
+        elif args.command in ("close", "recompute"):
+            action = close_period if args.command == "close" else recompute_period
+            try:
+                result = action(args.year, args.month)
+            except ValueError as e:
+                parser.error(str(e))
+            t = result.totals
+            print(f"{result.period_text} kapatıldı ({result.closed_at}): "
+                  f"{len(result.rows)} personel, net {t.net_salary:.2f}")
+            return 0
+
+        elif args.command == "reopen":
+            if not reopen_period(args.year, args.month):
+                parser.error(f"{args.month:02d}/{args.year} kapalı değil.")
+            print(f"{args.month:02d}/{args.year} yeniden açıldı.")
+            return 0
+
+        elif args.command == "runs":
+            for year, month, closed_at, total_net in db.get_payroll_runs():
+                run = get_payroll_run(year, month)
+                stale = " *" if db.data_version(year, month) != run.data_version else ""
+                print(f"{month:02d}/{year}  {closed_at}  net {total_net:>14.2f}{stale}")
+            return 0
+
+        elif args.command == "performance":
+            perf = employee_year_performance(args.employee, args.year)
+            if perf is None:
+                parser.error(f"Personel bulunamadı: {args.employee}")
+            if not args.out:
+                _print_performance(perf)
+                return 0
+            kind = _output_kind(parser, args.out, ("xlsx", "pdf"))
+            if kind == "xlsx":
+                write_performance_xlsx(args.out, perf.rows, perf.name)
+            else:
+                from pdf_reports import write_performance_pdf
+                write_performance_pdf(args.out, perf.rows, perf.name, perf.year)
+
+        elif args.command == "company-performance":
+            _output_kind(parser, args.out, ("xlsx",))
+            write_company_performance_xlsx(args.out, args.year)
+
+        elif args.command == "overtime":
+            _output_kind(parser, args.out, ("xlsx",))
+            if args.month is None:
+                write_overtime_year_xlsx(args.out, args.year, args.employee)
+            else:
+                write_overtime_xlsx(args.out, args.year, args.month, args.employee)
+    finally:
+        db.close_connection()
+
+    print(f"Rapor yazıldı: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
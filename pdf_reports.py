@@ -0,0 +1,310 @@
+"""PDF rapor motoru (bordro, mesai, performans).
+
+Satırlar bir iterator'dan okunur ve sayfa sayfa çizilir; hiçbir aşamada tüm
+satırlar bir listede toplanmaz. Her sayfada başlık satırı tekrarlanır,
+sütunlar sabit genişlikli bir tabloya yerleşir (sayılar sağa dayalı, sığmayan
+metin kısaltılır).
+
+Fontlar ve metin genişlikleri modül düzeyinde önbelleğe alınır; Türkçe
+karakterler (ş, ğ, İ) ve ₺ için sistemde bulunan bir TTF font kaydedilir,
+bulunamazsa Helvetica kullanılır.
+
+reportlab sadece bu modül import edildiğinde yüklenir; arayüz modülleri bu
+modülü dışa aktarım anında (arka plan işinde) import etmelidir.
+"""
+import os
+from functools import lru_cache
+
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from utils import format_float, tl
+
+# (normal, kalın) TTF aday dosyaları – ilk bulunan kullanılır
+FONT_CANDIDATES = [
+    (r"C:\Windows\Fonts\arial.ttf", r"C:\Windows\Fonts\arialbd.ttf"),
+    (r"C:\Windows\Fonts\segoeui.ttf", r"C:\Windows\Fonts\segoeuib.ttf"),
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+     "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    ("/Library/Fonts/Arial.ttf", "/Library/Fonts/Arial Bold.ttf"),
+]
+
+TITLE_SIZE = 14
+SUBTITLE_SIZE = 10
+HEADER_SIZE = 8
+BODY_SIZE = 7.5
+ROW_HEIGHT = 5.5 * mm
+MARGIN = 12 * mm
+
+HEADER_FILL = (0.88, 0.88, 0.88)
+STRIPE_FILL = (0.96, 0.96, 0.96)
+TOTAL_FILL = (0.92, 0.92, 0.85)
+
+
+@lru_cache(maxsize=1)
+def report_fonts():
+    """(normal_font, kalın_font) isimleri; ilk çağrıda bir kez kaydedilir."""
+    for regular, bold in FONT_CANDIDATES:
+        if os.path.exists(regular) and os.path.exists(bold):
+            try:
+                pdfmetrics.registerFont(TTFont("ReportSans", regular))
+                pdfmetrics.registerFont(TTFont("ReportSans-Bold", bold))
+                return "ReportSans", "ReportSans-Bold"
+            except Exception:
+                continue
+    return "Helvetica", "Helvetica-Bold"
+
+
+@lru_cache(maxsize=20000)
+def _text_width(text, font, size):
+    return pdfmetrics.stringWidth(text, font, size)
+
+
+def _fit(text, width, font, size):
+    """Metni sütun genişliğine sığdırır (gerekirse sonuna … ekleyerek)."""
+    if _text_width(text, font, size) <= width:
+        return text
+    while text and _text_width(text + "…", font, size) > width:
+        text = text[:-1]
+    return text + "…"
+
+
+class Column:
+    """Tablo sütunu: başlık, göreli genişlik, hizalama ('left' / 'right' / 'center')."""
+
+    __slots__ = ("title", "weight", "align")
+
+    def __init__(self, title, weight=1.0, align="right"):
+        self.title = title
+        self.weight = weight
+        self.align = align
+
+
+class TablePdf:
+    """Sayfa sayfa tablo çizen PDF yazıcısı.
+
+    pdf = TablePdf(path, "Aylık Bordro", ["Dönem: 03/2025"], columns)
+    for cells in rows: pdf.add_row(cells)
+    pdf.add_row(total_cells, total=True)
+    pages = pdf.close()
+    """
+
+    def __init__(self, file_path, title, subtitles, columns, pagesize=A4, task=None, total=None):
+        self.font, self.bold_font = report_fonts()
+        self.canvas = canvas.Canvas(file_path, pagesize=pagesize, pageCompression=1)
+        self.canvas.setTitle(title)
+        self.width, self.height = pagesize
+        self.title = title
+        self.subtitles = subtitles
+        self.columns = columns
+        self.task = task
+        self.total = total
+
+        # Sütun x konumları bir kez hesaplanır
+        usable = self.width - 2 * MARGIN
+        weight_sum = sum(col.weight for col in columns)
+        self.col_x = []
+        self.col_w = []
+        x = MARGIN
+        for col in columns:
+            w = usable * col.weight / weight_sum
+            self.col_x.append(x)
+            self.col_w.append(w)
+            x += w
+
+        self.page = 0
+        self.rows_written = 0
+        self.row_on_page = 0
+        self.y = 0
+        self._start_page()
+
+    # --- sayfa düzeni ---
+
+    def _start_page(self):
+        c = self.canvas
+        self.page += 1
+        self.row_on_page = 0
+        y = self.height - MARGIN
+
+        if self.page == 1:
+            c.setFont(self.bold_font, TITLE_SIZE)
+            y -= TITLE_SIZE
+            c.drawString(MARGIN, y, self.title)
+            c.setFont(self.font, SUBTITLE_SIZE)
+            for line in self.subtitles:
+                y -= SUBTITLE_SIZE + 4
+                c.drawString(MARGIN, y, line)
+            y -= 6 * mm
+        else:
+            y -= 2 * mm
+
+        # Başlık satırı
+        c.setFillColorRGB(*HEADER_FILL)
+        c.rect(MARGIN, y - ROW_HEIGHT, self.width - 2 * MARGIN, ROW_HEIGHT, stroke=0, fill=1)
+        c.setFillColorRGB(0, 0, 0)
+        self._draw_cells([col.title for col in self.columns], y, self.bold_font, HEADER_SIZE)
+        y -= ROW_HEIGHT
+        c.setLineWidth(0.6)
+        c.line(MARGIN, y, self.width - MARGIN, y)
+        self.y = y
+
+    def _finish_page(self):
+        c = self.canvas
+        c.setFont(self.font, BODY_SIZE)
+        c.drawRightString(self.width - MARGIN, MARGIN / 2, f"Sayfa {self.page}")
+        c.showPage()
+
+        # Sayfa başına bir kez iptal / ilerleme kontrolü
+        if self.task is not None:
+            self.task.check_cancelled()
+            self.task.report(self.rows_written, self.total)
+
+    def _draw_cells(self, cells, top, font, size):
+        c = self.canvas
+        c.setFont(font, size)
+        baseline = top - ROW_HEIGHT + (ROW_HEIGHT - size) / 2 + 1
+        pad = 1.2 * mm
+        for text, col, x, w in zip(cells, self.columns, self.col_x, self.col_w):
+            text = _fit(str(text), w - 2 * pad, font, size)
+            if col.align == "left":
+                c.drawString(x + pad, baseline, text)
+            elif col.align == "center":
+                c.drawCentredString(x + w / 2, baseline, text)
+            else:
+                c.drawRightString(x + w - pad, baseline, text)
+
+    # --- dış API ---
+
+    def add_row(self, cells, total=False):
+        if self.y - ROW_HEIGHT < MARGIN:
+            self._finish_page()
+            self._start_page()
+
+        c = self.canvas
+        fill = TOTAL_FILL if total else (STRIPE_FILL if self.row_on_page % 2 else None)
+        if fill is not None:
+            c.setFillColorRGB(*fill)
+            c.rect(MARGIN, self.y - ROW_HEIGHT, self.width - 2 * MARGIN, ROW_HEIGHT, stroke=0, fill=1)
+            c.setFillColorRGB(0, 0, 0)
+
+        self._draw_cells(cells, self.y, self.bold_font if total else self.font, BODY_SIZE)
+        self.y -= ROW_HEIGHT
+        self.row_on_page += 1
+        if not total:
+            self.rows_written += 1
+
+    def add_rows(self, rows):
+        for cells in rows:
+            self.add_row(cells)
+
+    def close(self):
+        """Son sayfayı kapatır, dosyayı yazar; toplam sayfa sayısını döndürür."""
+        c = self.canvas
+        c.setFont(self.font, BODY_SIZE)
+        c.drawRightString(self.width - MARGIN, MARGIN / 2, f"Sayfa {self.page}")
+        c.save()
+        return self.page
+
+
+# ---- Hazır raporlar ----
+
+PAYROLL_COLUMNS = [
+    Column("Personel", 2.6, "left"),
+    Column("Gün", 0.6, "center"),
+    Column("Teorik Saat", 1.0),
+    Column("Eksik Saat", 1.0),
+    Column("Toplam Saat", 1.0),
+    Column("Maaş", 1.5),
+    Column("Mesai", 1.3),
+    Column("Avans", 1.3),
+    Column("Net Maaş", 1.5),
+]
+
+
+def write_payroll_pdf(file_path, rows, period, task=None, total=None):
+    """Aylık bordro PDF'i. rows: calculate_monthly_payroll satırları (iterator olabilir).
+
+    Toplamlar akış sırasında biriktirilir; geri dönen: sayfa sayısı.
+    """
+    pdf = TablePdf(
+        file_path, "Aylık Bordro", [f"Dönem: {period}"] if period else [],
+        PAYROLL_COLUMNS, pagesize=landscape(A4), task=task, total=total,
+    )
+    sums = [0.0, 0.0, 0.0, 0.0]
+    for r in rows:
+        pdf.add_row((
+            r["name"],
+            r["days"],
+            format_float(r["theoretical_hours"]),
+            format_float(r["missing_hours"]),
+            format_float(r["total_hours"]),
+            tl(r["salary"]),
+            tl(r["overtime"]),
+            tl(r["advance"]),
+            tl(r["net_salary"]),
+        ))
+        sums[0] += r["salary"]
+        sums[1] += r["overtime"]
+        sums[2] += r["advance"]
+        sums[3] += r["net_salary"]
+
+    if pdf.rows_written:
+        pdf.add_row(("TOPLAM", "", "", "", "") + tuple(tl(v) for v in sums), total=True)
+    return pdf.close()
+
+
+OVERTIME_COLUMNS = [
+    Column("Tarih", 1.1, "center"),
+    Column("Personel", 2.2, "left"),
+    Column("Saat", 0.7),
+    Column("Saatlik Ücret", 1.3),
+    Column("Toplam", 1.3),
+    Column("Açıklama", 2.4, "left"),
+]
+
+
+def write_overtime_pdf(file_path, rows, period, task=None, total=None):
+    """Mesai hareketleri PDF'i. rows: (tarih, personel, saat, ücret, toplam, açıklama) değerleri."""
+    pdf = TablePdf(
+        file_path, "Mesai Hareketleri Raporu", [f"Dönem: {period}"] if period else [],
+        OVERTIME_COLUMNS, task=task, total=total,
+    )
+    pdf.add_rows(rows)
+    return pdf.close()
+
+
+PERFORMANCE_COLUMNS = [
+    Column("Ay", 1.3, "left"),
+    Column("Gün", 0.6, "center"),
+    Column("Teorik", 0.9),
+    Column("Devamsızlık", 1.0),
+    Column("Toplam", 0.9),
+    Column("Mesai Saat", 0.9),
+    Column("Mesai", 1.3),
+    Column("Avans", 1.3),
+    Column("Net", 1.4),
+]
+
+
+def write_performance_pdf(file_path, rows, emp_name, year, task=None):
+    """Personel yıllık performans PDF'i. rows: calculate_year_performance satırları."""
+    pdf = TablePdf(
+        file_path, "Personel Performans Raporu", [f"Personel: {emp_name}", f"Yıl: {year}"],
+        PERFORMANCE_COLUMNS, task=task,
+    )
+    for r in rows:
+        pdf.add_row((
+            r["month_name"],
+            r["work_days"],
+            format_float(r["theoretical_hours"]),
+            format_float(r["missing_hours"]),
+            format_float(r["total_hours"]),
+            format_float(r["overtime_hours"]),
+            tl(r["overtime_total"]),
+            tl(r["advance_total"]),
+            tl(r["net_salary"]),
+        ))
+    return pdf.close()
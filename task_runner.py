@@ -0,0 +1,218 @@
+"""Arka plan iş yürütücü.
+
+Ağır DB / hesaplama işleri bir thread havuzunda çalışır; sonuçlar bir kuyruğa
+yazılır ve Tk ana döngüsünde after() ile okunur. Böylece pencere donmaz ve
+tüm arayüz güncellemeleri (callback'ler) ana thread'de çalışır.
+
+Kullanım:
+    runner = get_task_runner(self)
+    self.task = runner.submit(
+        lambda task: calculate_monthly_payroll(year, month),
+        description="Maaş hesaplanıyor",
+        on_done=self.show_rows,
+    )
+
+İş fonksiyonu tek argüman olarak Task nesnesini alır; uzun döngülerde
+task.report(done, total) ile ilerleme bildirebilir ve task.check_cancelled()
+ile iptal edilip edilmediğini kontrol edebilir.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+
+# Kuyruğun kontrol edilme aralığı (ms)
+POLL_INTERVAL_MS = 50
+
+# SQLite tek yazıcılı olduğu için çok sayıda worker fayda getirmez
+MAX_WORKERS = 3
+
+
+class TaskCancelled(Exception):
+    """Task.check_cancelled() iptal edilmiş işte fırlatır."""
+
+
+class Task:
+    def __init__(self, runner, func, description, on_done, on_error, on_progress, on_cancel):
+        self.runner = runner
+        self.func = func
+        self.description = description
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+
+        self.done = 0
+        self.total = None
+        self.finished = False
+        self.future = None
+        self._cancel_event = threading.Event()
+
+    # --- worker thread tarafı ---
+
+    def report(self, done, total=None):
+        """İlerleme bildirir (worker thread'den çağrılır)."""
+        self.runner._post("progress", self, (done, total))
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise TaskCancelled()
+
+    # --- ana thread tarafı ---
+
+    def cancel(self):
+        """İşi iptal eder. Başlamadıysa hiç çalışmaz; çalışıyorsa sonucu yok sayılır."""
+        if self.finished:
+            return
+        self._cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            # Hiç başlamadı; worker bildirim göndermeyecek
+            self.runner._post("cancelled", self, None)
+
+
+class TaskRunner:
+    def __init__(self, root, max_workers=MAX_WORKERS):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="patron-task")
+        self.results = queue.Queue()
+        self.active = []          # bitmemiş işler (ana thread'de tutulur)
+        self.listeners = []       # durum değişince çağrılır: listener(active_tasks)
+        self._polling = False
+
+    def submit(self, func, description="", on_done=None, on_error=None,
+               on_progress=None, on_cancel=None):
+        """func(task) fonksiyonunu arka planda çalıştırır.
+
+        on_done(result), on_error(exc), on_progress(done, total), on_cancel()
+        callback'leri ana thread'de çağrılır.
+        """
+        task = Task(self, func, description, on_done, on_error, on_progress, on_cancel)
+        self.active.append(task)
+        task.future = self.executor.submit(self._run, task)
+        self._notify()
+        self._start_polling()
+        return task
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def cancel_all(self):
+        for task in list(self.active):
+            task.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- worker thread ---
+
+    def _run(self, task):
+        if task.is_cancelled():
+            self._post("cancelled", task, None)
+            return
+        try:
+            result = task.func(task)
+        except TaskCancelled:
+            self._post("cancelled", task, None)
+        except Exception as e:
+            self._post("error", task, e)
+        else:
+            if task.is_cancelled():
+                self._post("cancelled", task, None)
+            else:
+                self._post("done", task, result)
+
+    def _post(self, kind, task, payload):
+        self.results.put((kind, task, payload))
+
+    # --- ana thread ---
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        try:
+            self._drain_results()
+        finally:
+            # Bir callback hata verse de sorgulama sürmeli (yoksa _polling
+            # True kalır ve sonraki işlerin sonucu hiç işlenmez)
+            if self.active or not self.results.empty():
+                self.root.after(POLL_INTERVAL_MS, self._poll)
+            else:
+                self._polling = False
+
+    def _drain_results(self):
+        changed = False
+        while True:
+            try:
+                kind, task, payload = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if task.finished:
+                continue
+            changed = True
+            if kind == "progress":
+                task.done, task.total = payload
+                if task.on_progress and not task.is_cancelled():
+                    self._call(task.on_progress, *payload)
+                continue
+
+            task.finished = True
+            if task in self.active:
+                self.active.remove(task)
+            if kind == "done" and task.is_cancelled():
+                # Bitti ama sonuç gelmeden iptal edildi
+                kind = "cancelled"
+            if kind == "done" and task.on_done:
+                self._call(task.on_done, payload)
+            elif kind == "error":
+                if task.on_error:
+                    self._call(task.on_error, payload)
+                else:
+                    self.root.report_callback_exception(type(payload), payload, payload.__traceback__)
+            elif kind == "cancelled" and task.on_cancel:
+                self._call(task.on_cancel)
+
+        if changed:
+            self._notify()
+
+    def _call(self, callback, *args):
+        """Arayüz callback'ini çağırır; hatası (ör. kapanmış pencerede TclError)
+        Tk'nın hata raporlayıcısına gider, diğer işlerin sonuçlarını kesmez."""
+        try:
+            callback(*args)
+        except Exception as e:
+            self.root.report_callback_exception(type(e), e, e.__traceback__)
+
+    def _notify(self):
+        for callback in self.listeners:
+            self._call(callback, list(self.active))
+
+
+_runner = None
+
+
+def get_task_runner(widget):
+    """Uygulama genelinde paylaşılan TaskRunner (ilk çağrıda oluşturulur)."""
+    global _runner
+    if _runner is None:
+        _runner = TaskRunner(widget.winfo_toplevel())
+    return _runner
+
+
+def run_file_job(widget, description, func, success_text, error_text):
+    """Dosya yazan bir işi (Excel/PDF/CSV) arka planda çalıştırır.
+
+    Bitince success_text, hata olursa error_text + hata mesajı gösterilir.
+    """
+    return get_task_runner(widget).submit(
+        func,
+        description=description,
+        on_done=lambda _result: messagebox.showinfo("Başarılı", success_text),
+        on_error=lambda e: messagebox.showerror("Hata", f"{error_text}\n{e}"),
+    )
@@ -0,0 +1,84 @@
+"""Sık kullanılan tarih aralıklı sorguların index kullandığını doğrular.
+
+init_db() boş bir geçici veritabanında çalıştırılır; her sorgunun
+EXPLAIN QUERY PLAN çıktısında beklenen index aranır (yoksa tam tablo
+taraması demektir). db fonksiyonlarının çalıştırdığı SQL, bağlantının
+trace callback'i ile yakalanır; böylece sorgu metni değişse de test
+gerçek sorguyu kontrol eder.
+"""
+import pytest
+
+import db
+from benchmarks import HOT_QUERY_PLANS
+
+MONTH_START, MONTH_END = "2025-01-01", "2025-02-01"
+
+
+@pytest.fixture
+def plan_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_NAME", str(tmp_path / "plans.db"))
+    db.init_db()
+    yield db.connection()
+    db.close_connection()
+
+
+def query_plan(conn, sql, params=()):
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return " | ".join(row[3] for row in rows)
+
+
+def traced_selects(conn, call):
+    """call() sırasında çalıştırılan SELECT'leri (parametreleri yerleştirilmiş) döndürür."""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        result = call()
+        if hasattr(result, "fetchall"):
+            result.fetchall()
+    finally:
+        conn.set_trace_callback(None)
+    return [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+
+
+def uses_index(plan, index):
+    return f"USING INDEX {index}" in plan or f"USING COVERING INDEX {index}" in plan
+
+
+# ---- db fonksiyonlarının gerçek sorguları ----
+
+DB_QUERIES = [
+    ("get_attendance_for_month",
+     lambda: db.get_attendance_for_month(1, MONTH_START, MONTH_END), "idx_attendance_emp_date"),
+    ("get_overtime_for_month",
+     lambda: db.get_overtime_for_month(1, MONTH_START, MONTH_END), "idx_overtimes_emp_date"),
+    ("iter_attendance_list",
+     lambda: db.iter_attendance_list(MONTH_START, MONTH_END), "idx_attendance_date_emp"),
+    ("iter_overtime_list",
+     lambda: db.iter_overtime_list(MONTH_START, MONTH_END), "idx_overtimes_date_emp"),
+    ("get_attendance_marks",
+     lambda: db.get_attendance_marks(MONTH_START, MONTH_END), "idx_attendance_date_emp"),
+    ("get_month_advance_cuts",
+     lambda: db.get_month_advance_cuts(2025, 1, unposted_only=True), "idx_installments_period"),
+]
+
+
+@pytest.mark.parametrize("call, index", [q[1:] for q in DB_QUERIES], ids=[q[0] for q in DB_QUERIES])
+def test_db_query_uses_index(plan_db, call, index):
+    statements = traced_selects(plan_db, call)
+    assert statements
+    plans = [query_plan(plan_db, sql) for sql in statements]
+    assert any(uses_index(plan, index) for plan in plans), plans
+
+
+# ---- benchmarks.py query-plans listesi (toplamlar, avans listesi, yıllık özet) ----
+
+@pytest.mark.parametrize("sql, expected", [q[1:] for q in HOT_QUERY_PLANS], ids=[q[0] for q in HOT_QUERY_PLANS])
+def test_hot_query_uses_index(plan_db, sql, expected):
+    params = (1, MONTH_START, MONTH_END)[-sql.count("?"):]
+    plan = query_plan(plan_db, sql, params)
+    if expected == "PRIMARY KEY":
+        assert "USING PRIMARY KEY" in plan, plan
+    else:
+        assert uses_index(plan, expected.split()[-1]), plan
+        if expected.startswith("COVERING INDEX"):
+            assert f"USING {expected}" in plan, plan
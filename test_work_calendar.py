@@ -0,0 +1,129 @@
+"""work_calendar kapalı formüllerini gün gün sayımla karşılaştırır.
+
+count_working_days ve working_days_matrix (numpy'li ve numpy'siz yol)
+rastgele aralıklar / işe giriş tarihleri için timedelta(days=1) döngüsüyle
+aynı sonucu vermelidir; boş / ters aralıklar, aydan sonra başlayanlar ve
+ay / yıl sınırları ayrıca kontrol edilir.
+"""
+from datetime import date, timedelta
+
+import pytest
+from hypothesis import HealthCheck, given, settings, strategies as st
+
+import work_calendar as wc
+
+
+def naive_working_days(start, end, include_weekends):
+    """[start, end) arası gün gün sayım."""
+    count = 0
+    d = start
+    while d < end:
+        if include_weekends or d.weekday() < 5:
+            count += 1
+        d += timedelta(days=1)
+    return count
+
+
+def naive_month_days(start_date, year, month, include_weekends, today):
+    """working_days_matrix hücresinin gün gün karşılığı."""
+    start = wc.parse_start_date(start_date)
+    if start is None:
+        return 0
+    month_start = date(year, month, 1)
+    month_end = (month_start + timedelta(days=31)).replace(day=1)
+    if (year, month) == (today.year, today.month):
+        month_end = min(month_end, today + timedelta(days=1))
+    return naive_working_days(max(start, month_start), month_end, include_weekends)
+
+
+def assert_matrix_matches(start_dates, periods, include_weekends, today):
+    expected = [
+        [naive_month_days(s, y, m, include_weekends, today) for y, m in periods]
+        for s in start_dates
+    ]
+    assert wc.working_days_matrix(start_dates, periods, include_weekends, today) == expected
+
+
+@pytest.fixture(params=["numpy", "python"])
+def matrix_backend(request, monkeypatch):
+    """working_days_matrix hem numpy ile hem saf Python yolu ile denenir."""
+    if request.param == "numpy" and wc.np is None:
+        pytest.skip("numpy yüklü değil")
+    if request.param == "python":
+        monkeypatch.setattr(wc, "np", None)
+    return request.param
+
+
+# ---- count_working_days ----
+
+@given(
+    start=st.dates(min_value=date(1, 1, 1), max_value=date(9000, 12, 31)),
+    length=st.integers(min_value=-40, max_value=800),
+    include_weekends=st.booleans(),
+)
+def test_count_working_days_matches_naive(start, length, include_weekends):
+    end = start + timedelta(days=length)
+    assert wc.count_working_days(start, end, include_weekends) == \
+        naive_working_days(start, end, include_weekends)
+
+
+@pytest.mark.parametrize("start, end", [
+    (date(2025, 3, 10), date(2025, 3, 10)),    # boş aralık
+    (date(2025, 3, 10), date(2025, 3, 3)),     # ters aralık
+    (date(2025, 1, 31), date(2025, 2, 1)),     # ay sınırı
+    (date(2025, 2, 28), date(2025, 3, 3)),     # ay sınırı, hafta sonu arada
+    (date(2024, 2, 28), date(2024, 3, 1)),     # artık yıl
+    (date(2024, 12, 30), date(2025, 1, 2)),    # yıl sınırı
+    (date(2023, 12, 31), date(2024, 1, 1)),    # Pazar -> yeni yıl
+    (date(1, 1, 1), date(1, 1, 8)),            # formülün başlangıç noktası
+])
+@pytest.mark.parametrize("include_weekends", [False, True])
+def test_count_working_days_edges(start, end, include_weekends):
+    assert wc.count_working_days(start, end, include_weekends) == \
+        naive_working_days(start, end, include_weekends)
+
+
+# ---- working_days_matrix ----
+
+start_values = st.one_of(
+    st.none(),
+    st.sampled_from(["", "geçersiz"]),
+    st.dates(min_value=date(1995, 1, 1), max_value=date(2035, 12, 31)),
+    st.dates(min_value=date(1995, 1, 1), max_value=date(2035, 12, 31)).map(date.isoformat),
+)
+month_periods = st.tuples(st.integers(min_value=2000, max_value=2030), st.integers(min_value=1, max_value=12))
+
+
+# matrix_backend her örnekte aynı kalır (sadece numpy'yi açar / kapatır)
+@settings(suppress_health_check=[HealthCheck.function_scoped_fixture])
+@given(
+    start_dates=st.lists(start_values, max_size=12),
+    periods=st.lists(month_periods, max_size=14),
+    include_weekends=st.booleans(),
+    today=st.dates(min_value=date(2000, 1, 1), max_value=date(2030, 12, 31)),
+)
+def test_working_days_matrix_matches_naive(matrix_backend, start_dates, periods, include_weekends, today):
+    assert_matrix_matches(start_dates, periods, include_weekends, today)
+
+
+@pytest.mark.parametrize("start_date, periods, today", [
+    ("2025-03-15", [(2025, 2)], date(2025, 6, 18)),                 # aydan sonra başlayan
+    ("2025-02-28", [(2025, 2), (2025, 3)], date(2025, 6, 18)),      # ayın son günü başlayan
+    ("2025-02-01", [(2025, 2)], date(2025, 6, 18)),                 # ayın ilk günü başlayan
+    ("2024-12-31", [(2024, 12), (2025, 1)], date(2025, 6, 18)),     # yıl sınırı
+    ("2020-01-01", [(2025, 6)], date(2025, 6, 18)),                 # içinde bulunulan ay (bugün kesintisi)
+    ("2020-01-01", [(2025, 6)], date(2025, 6, 30)),                 # bugün ayın son günü
+    ("2025-06-20", [(2025, 6)], date(2025, 6, 18)),                 # bugünden sonra başlayan
+    ("2020-01-01", [(2024, 12)], date(2024, 12, 31)),               # Aralık, yıl sonu bugün
+    ("2020-01-01", [(2026, 1)], date(2025, 6, 18)),                 # gelecek ay
+    (None, [(2025, 1)], date(2025, 6, 18)),
+    ("", [(2025, 1)], date(2025, 6, 18)),
+])
+@pytest.mark.parametrize("include_weekends", [False, True])
+def test_working_days_matrix_edges(matrix_backend, start_date, periods, today, include_weekends):
+    assert_matrix_matches([start_date], periods, include_weekends, today)
+
+
+def test_working_days_matrix_empty(matrix_backend):
+    assert wc.working_days_matrix([], [(2025, 1)], False) == []
+    assert wc.working_days_matrix(["2025-01-01", None], [], False) == [[], []]
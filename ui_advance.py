@@ -5,25 +5,33 @@ from datetime import date, datetime
 from tkcalendar import DateEntry
 
 from db import (
-    get_active_employees,
     add_advance,
-    get_conn,
+    connection,
     delete_advance as db_delete_advance,
     get_advance_by_id,
+    get_advance_installments,
 )
+from data_grid import DataGrid
+from employee_directory import get_employee_directory
+from employee_picker import EmployeePicker
+from payroll import post_advance_cuts
 from utils import tl, month_date_range
 
+# Taksit sayısı seçimi (ay)
+MAX_INSTALLMENTS = 36
+
 
 class AdvanceTab(ttk.Frame):
     def __init__(self, master):
         super().__init__(master)
 
-        self.employees_cache = []
+        self.directory = get_employee_directory()
         self.selected_adv_id = None
 
         self.build_ui()
         self.load_employees()
         self.load_advances()
+        self.directory.subscribe(self.on_employees_changed)
 
     # -------------------------------------------------
     #   UI
@@ -36,8 +44,8 @@ class AdvanceTab(ttk.Frame):
         # Personel
         ttk.Label(form_frame, text="Personel:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
         self.adv_emp_var = tk.StringVar()
-        self.adv_emp_combo = ttk.Combobox(form_frame, textvariable=self.adv_emp_var,
-                                          state="readonly", width=30)
+        self.adv_emp_combo = EmployeePicker(form_frame, self.directory,
+                                            textvariable=self.adv_emp_var, width=30)
         self.adv_emp_combo.grid(row=0, column=1, padx=5, pady=5, sticky="w")
 
         ttk.Button(form_frame, text="Yenile", command=self.refresh_employees)\
@@ -61,15 +69,25 @@ class AdvanceTab(ttk.Frame):
         ttk.Entry(form_frame, textvariable=self.adv_amount_var, width=15)\
             .grid(row=2, column=1, padx=5, pady=5, sticky="w")
 
+        # Taksit
+        ttk.Label(form_frame, text="Taksit (ay):").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        self.adv_inst_var = tk.StringVar(value="1")
+        ttk.Spinbox(form_frame, from_=1, to=MAX_INSTALLMENTS, textvariable=self.adv_inst_var, width=5)\
+            .grid(row=3, column=1, padx=5, pady=5, sticky="w")
+
         # Açıklama
-        ttk.Label(form_frame, text="Açıklama:").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        ttk.Label(form_frame, text="Açıklama:").grid(row=4, column=0, padx=5, pady=5, sticky="w")
         self.adv_desc_var = tk.StringVar()
         ttk.Entry(form_frame, textvariable=self.adv_desc_var, width=40)\
-            .grid(row=3, column=1, padx=5, pady=5, sticky="w")
+            .grid(row=4, column=1, padx=5, pady=5, sticky="w")
+
+        # Seçili avansın taksit planı
+        self.plan_label = ttk.Label(form_frame, text="", foreground="gray", justify="left")
+        self.plan_label.grid(row=0, column=3, rowspan=5, padx=15, pady=5, sticky="nw")
 
         # Butonlar
         btn_frame = ttk.Frame(form_frame)
-        btn_frame.grid(row=4, column=0, columnspan=3, pady=10)
+        btn_frame.grid(row=5, column=0, columnspan=3, pady=10)
 
         ttk.Button(btn_frame, text="Yeni", command=self.clear_form).grid(row=0, column=0, padx=5)
         ttk.Button(btn_frame, text="Kaydet", command=self.save_advance).grid(row=0, column=1, padx=5)
@@ -95,63 +113,68 @@ class AdvanceTab(ttk.Frame):
         ttk.Button(filter_frame, text="Listele", command=self.load_advances)\
             .pack(side="left", padx=10)
 
-        columns = ("employee", "date", "amount", "description")
+        ttk.Button(filter_frame, text="Ayın Kesintilerini İşle", command=self.post_month_cuts)\
+            .pack(side="left")
+
+        columns = ("employee", "date", "amount", "installments", "remaining", "description")
         self.adv_tree = ttk.Treeview(list_frame, columns=columns, show="headings")
         self.adv_tree.heading("employee", text="Personel")
         self.adv_tree.heading("date", text="Tarih")
         self.adv_tree.heading("amount", text="Tutar")
+        self.adv_tree.heading("installments", text="Taksit")
+        self.adv_tree.heading("remaining", text="Kalan")
         self.adv_tree.heading("description", text="Açıklama")
 
         self.adv_tree.column("employee", width=150)
         self.adv_tree.column("date", width=100)
         self.adv_tree.column("amount", width=100)
+        self.adv_tree.column("installments", width=60, anchor="center")
+        self.adv_tree.column("remaining", width=100)
         self.adv_tree.column("description", width=250)
 
         self.adv_tree.pack(fill="both", expand=True)
         self.adv_tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.adv_grid = DataGrid(self.adv_tree)
 
     # -------------------------------------------------
     #   Yardımcılar
     # -------------------------------------------------
     def clear_form(self):
         self.selected_adv_id = None
-        if self.adv_emp_combo["values"]:
-            self.adv_emp_combo.current(0)
+        self.adv_emp_combo.reset()
         self.adv_date_entry.set_date(date.today())
         self.adv_amount_var.set("")
+        self.adv_inst_var.set("1")
         self.adv_desc_var.set("")
+        self.plan_label.config(text="")
 
     def load_employees(self):
-        employees = get_active_employees()
-        self.employees_cache = employees
-        names = [e[1] for e in employees]
-        self.adv_emp_combo["values"] = names
-        if names:
-            self.adv_emp_combo.current(0)
-        else:
-            self.adv_emp_var.set("")
+        self.adv_emp_combo.refresh()
 
-    def refresh_employees(self):
+    def on_employees_changed(self, directory):
+        """Personel dizini değişince (bkz. employee_directory.py) liste yenilenir."""
         self.load_employees()
+        self.load_advances()
+
+    def refresh_employees(self):
+        # Abone olduğumuz için liste on_employees_changed'de yenilenir
+        self.directory.invalidate()
         messagebox.showinfo("Bilgi", "Personel listesi güncellendi.")
 
     # -------------------------------------------------
     #   Kayıt işlemleri
     # -------------------------------------------------
     def save_advance(self):
-        emp_name = self.adv_emp_var.get()
-        if not emp_name:
+        emp_text = self.adv_emp_var.get()
+        if not emp_text:
             messagebox.showerror("Hata", "Lütfen personel seçin.")
             return
 
-        emp_id = None
-        for e in self.employees_cache:
-            if e[1] == emp_name:
-                emp_id = e[0]
-                break
-        if emp_id is None:
+        emp = self.adv_emp_combo.selected_employee()
+        if emp is None:
             messagebox.showerror("Hata", "Personel bulunamadı.")
             return
+        emp_id = emp.id
 
         # Tarih
         date_str = self.adv_date_var.get().strip()
@@ -173,10 +196,18 @@ class AdvanceTab(ttk.Frame):
             messagebox.showerror("Hata", "Avans tutarı sayısal olmalıdır.")
             return
 
+        try:
+            installments = int(self.adv_inst_var.get())
+        except ValueError:
+            installments = 0
+        if not (1 <= installments <= MAX_INSTALLMENTS):
+            messagebox.showerror("Hata", f"Taksit sayısı 1 ile {MAX_INSTALLMENTS} arasında olmalıdır.")
+            return
+
         desc = self.adv_desc_var.get().strip()
 
-        # db.add_advance eski şemayı bozmayalım diye taksit=1 ile çağırıyoruz
-        add_advance(emp_id, date_str, amount, 1, desc)
+        # Taksit planı (ay ay kesintiler) avansla birlikte yazılır
+        add_advance(emp_id, date_str, amount, installments, desc)
 
         messagebox.showinfo("Başarılı", "Avans kaydedildi.")
         self.clear_form()
@@ -196,18 +227,14 @@ class AdvanceTab(ttk.Frame):
         self.load_advances()
 
     def load_advances(self):
-        for row in self.adv_tree.get_children():
-            self.adv_tree.delete(row)
-
-        conn = get_conn()
-        c = conn.cursor()
+        c = connection().cursor()
 
         try:
             year = int(self.adv_year_var.get())
             month = int(self.adv_month_var.get())
             month_start, month_end = month_date_range(year, month)
             c.execute("""
-                SELECT a.id, e.name, a.date, a.amount, a.description
+                SELECT a.id, e.name, a.date, a.amount, a.installments, a.remaining, a.description
                 FROM advances a
                 JOIN employees e ON e.id = a.employee_id
                 WHERE a.date >= ? AND a.date < ?
@@ -216,21 +243,62 @@ class AdvanceTab(ttk.Frame):
         except Exception:
             # Hatalı yıl/ay girilirse tümünü göster
             c.execute("""
-                SELECT a.id, e.name, a.date, a.amount, a.description
+                SELECT a.id, e.name, a.date, a.amount, a.installments, a.remaining, a.description
                 FROM advances a
                 JOIN employees e ON e.id = a.employee_id
                 ORDER BY a.date DESC, e.name
             """)
         rows = c.fetchall()
-        conn.close()
-
-        for adv_id, emp_name, d_str, amount, desc in rows:
-            self.adv_tree.insert(
-                "",
-                "end",
-                iid=str(adv_id),
-                values=(emp_name, d_str, tl(amount), desc or "")
+
+        self.adv_grid.set_rows(
+            (str(adv_id), (emp_name, d_str, tl(amount), inst, tl(remaining), desc or ""))
+            for adv_id, emp_name, d_str, amount, inst, remaining, desc in rows
+        )
+
+    def post_month_cuts(self):
+        """Filtredeki ayın taksit kesintilerini avans bakiyelerine işler."""
+        try:
+            year = int(self.adv_year_var.get())
+            month = int(self.adv_month_var.get())
+            month_date_range(year, month)
+        except ValueError:
+            messagebox.showerror("Hata", "Geçerli bir yıl ve ay girin.")
+            return
+
+        if not messagebox.askyesno(
+            "Onay",
+            f"{month:02d}/{year} ayının avans taksitleri bakiyelerden düşülsün mü?\n"
+            "(Daha önce işlenmiş taksitler tekrar işlenmez.)",
+        ):
+            return
+
+        count, total_cut = post_advance_cuts(year, month)
+        if count:
+            messagebox.showinfo(
+                "Başarılı", f"{count} avans için toplam {tl(total_cut)} kesinti işlendi."
             )
+        else:
+            messagebox.showinfo("Bilgi", f"{month:02d}/{year} için işlenecek taksit yok.")
+        self.load_advances()
+
+    def show_record(self, record_id, date_str):
+        """Kaydın ayını listeleyip kaydı seçer (global aramadan gelince).
+
+        Kayıt listede yoksa (silinmişse) False döner.
+        """
+        year, month = int(date_str[:4]), int(date_str[5:7])
+        self.adv_year_var.set(str(year))
+        self.adv_month_var.set(str(month))
+        self.load_advances()
+
+        iid = str(record_id)
+        if not self.adv_grid.ensure_loaded(iid):
+            return False
+        self.adv_tree.selection_set(iid)
+        self.adv_tree.focus(iid)
+        self.adv_tree.see(iid)
+        self.on_select(None)
+        return True
 
     def on_select(self, event):
         item_id = self.adv_tree.focus()
@@ -245,9 +313,7 @@ class AdvanceTab(ttk.Frame):
         adv_id, emp_id, d_str, amount, inst, remaining, desc = row
 
         # Personel adı
-        emp_name = next((e[1] for e in self.employees_cache if e[0] == emp_id), "")
-        if emp_name:
-            self.adv_emp_var.set(emp_name)
+        self.adv_emp_combo.set_employee(emp_id)
 
         self.adv_date_var.set(d_str)
         try:
@@ -256,4 +322,11 @@ class AdvanceTab(ttk.Frame):
             pass
 
         self.adv_amount_var.set(str(amount))
+        self.adv_inst_var.set(str(inst))
         self.adv_desc_var.set(desc or "")
+
+        plan = get_advance_installments(adv_id)
+        self.plan_label.config(text="Taksit planı:\n" + "\n".join(
+            f"{seq}. {month:02d}/{year}  {tl(value)}{'  ✓' if posted else ''}"
+            for seq, year, month, value, posted in plan
+        ))
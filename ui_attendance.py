@@ -5,26 +5,39 @@ from datetime import date, datetime
 from tkcalendar import DateEntry
 
 from db import (
-    get_active_employees,
     add_attendance,
-    get_conn,
+    get_attendance_list_rows,
+    iter_attendance_list,
     update_attendance as db_update_attendance,
     delete_attendance as db_delete_attendance,
 )
+from data_grid import DataGrid, date_desc_key
+from employee_directory import get_employee_directory
+from employee_picker import EmployeePicker
+from excel_import import import_attendance_excel
 from utils import month_date_range
 
+# İçe aktarma sonunda mesajda gösterilecek en fazla hatalı satır
+IMPORT_ERROR_PREVIEW = 15
+
 
 class AttendanceTab(ttk.Frame):
     def __init__(self, master):
         super().__init__(master)
 
-        self.employees_cache = []
+        self.directory = get_employee_directory()
         self.selected_att_id = None
+        # Listedeki kayıt id -> personel id (seçilen kaydı forma doldurmak için)
+        self.row_employee_ids = {}
         self.show_only_selected_var = tk.IntVar(value=0)
+        # Listelenen aralık ve personel filtresi: (başlangıç, bitiş, personel id)
+        self.list_filter = None
+        self.bulk_dialog = None
 
         self.build_ui()
         self.load_employees()
         self.load_current_month_logs()
+        self.directory.subscribe(self.on_employees_changed)
 
     # ------------- ARAYÜZ ------------- #
 
@@ -36,7 +49,7 @@ class AttendanceTab(ttk.Frame):
         # Personel
         ttk.Label(form_frame, text="Personel:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
         self.att_emp_var = tk.StringVar()
-        self.att_emp_combo = ttk.Combobox(form_frame, textvariable=self.att_emp_var, state="readonly", width=30)
+        self.att_emp_combo = EmployeePicker(form_frame, self.directory, textvariable=self.att_emp_var, width=30)
         self.att_emp_combo.grid(row=0, column=1, padx=5, pady=5)
         self.att_emp_combo.bind("<<ComboboxSelected>>", self.on_employee_changed)
 
@@ -97,6 +110,7 @@ class AttendanceTab(ttk.Frame):
         ttk.Button(btn_frame, text="Kaydet", command=self.save_attendance).grid(row=0, column=1, padx=5)
         ttk.Button(btn_frame, text="Sil", command=self.delete_selected).grid(row=0, column=2, padx=5)
         ttk.Button(btn_frame, text="Excel'den İçeri Aktar", command=self.import_from_excel).grid(row=0, column=3, padx=10)
+        ttk.Button(btn_frame, text="Toplu Giriş", command=self.open_bulk_entry).grid(row=0, column=4, padx=5)
 
         # Alt: Kayıt listesi
         list_frame = ttk.LabelFrame(self, text="Devamsızlık Kayıtları")
@@ -139,42 +153,40 @@ class AttendanceTab(ttk.Frame):
 
         self.att_tree.pack(fill="both", expand=True)
         self.att_tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.att_grid = DataGrid(self.att_tree)
 
     # ------------- VERİ YÜKLEME ------------- #
 
     def clear_form(self):
         self.selected_att_id = None
-        if self.att_emp_combo["values"]:
-            self.att_emp_combo.current(0)
+        self.att_emp_combo.reset()
         self.att_date_entry.set_date(date.today())
         self.att_type_combo.current(0)
         self.att_hours_var.set("0")
         self.att_note_var.set("")
 
     def load_employees(self):
-        employees = get_active_employees()
-        self.employees_cache = employees
-        names = [e[1] for e in employees]  # e = (id, name, rate, start_date)
-        self.att_emp_combo["values"] = names
-        if names:
-            self.att_emp_combo.current(0)
-        else:
-            self.att_emp_var.set("")
+        self.att_emp_combo.refresh()
 
-    def refresh_employees(self):
+    def on_employees_changed(self, directory):
+        """Personel dizini değişince (bkz. employee_directory.py) liste yenilenir."""
         self.load_employees()
-        messagebox.showinfo("Bilgi", "Personel listesi güncellendi.")
         self.load_current_month_logs()
 
+    def refresh_employees(self):
+        # Abone olduğumuz için liste ve kayıtlar on_employees_changed'de yenilenir
+        self.directory.invalidate()
+        messagebox.showinfo("Bilgi", "Personel listesi güncellendi.")
+
+    def selected_employee(self):
+        """Combobox'ta seçili personel (Employee); seçim yoksa / bulunamazsa None."""
+        return self.att_emp_combo.selected_employee()
+
     def on_employee_changed(self, event):
         if self.show_only_selected_var.get() == 1:
             self.load_current_month_logs()
 
     def load_current_month_logs(self):
-        # Ağacı temizle
-        for row in self.att_tree.get_children():
-            self.att_tree.delete(row)
-
         # Seçili yıl/ay
         try:
             year = int(self.rep_year_var.get())
@@ -191,43 +203,63 @@ class AttendanceTab(ttk.Frame):
 
         # Filtre: sadece seçili personel mi?
         emp_filter_id = None
-        if self.show_only_selected_var.get() == 1 and self.att_emp_var.get():
-            selected_name = self.att_emp_var.get()
-            for e in self.employees_cache:
-                if e[1] == selected_name:
-                    emp_filter_id = e[0]
-                    break
-
-        conn = get_conn()
-        c = conn.cursor()
-        query = """
-            SELECT a.id, a.date, e.name, a.type, a.hours, a.note
-            FROM attendance_logs a
-            JOIN employees e ON e.id = a.employee_id
-            WHERE a.date >= ? AND a.date < ?
-        """
-        params = [month_start.isoformat(), month_end.isoformat()]
+        if self.show_only_selected_var.get() == 1:
+            emp = self.selected_employee()
+            emp_filter_id = emp.id if emp is not None else None
 
-        if emp_filter_id is not None:
-            query += " AND a.employee_id = ?"
-            params.append(emp_filter_id)
+        self.list_filter = (month_start.isoformat(), month_end.isoformat(), emp_filter_id)
+        rows = iter_attendance_list(*self.list_filter).fetchall()
+        self.row_employee_ids = {att_id: emp_id for att_id, emp_id, *_ in rows}
 
-        query += " ORDER BY a.date DESC, e.name"
+        # Sadece değişen satırlar güncellenir (bkz. data_grid.py)
+        self.att_grid.set_rows(
+            (str(att_id), (d_str, name, typ, hrs, note or ""))
+            for att_id, _, d_str, name, typ, hrs, note in rows
+        )
 
-        c.execute(query, params)
-        rows = c.fetchall()
-        conn.close()
+    def refresh_rows(self, att_ids):
+        """Sadece verilen kayıtları listeye ekler / günceller (toplu girişten sonra).
 
-        for att_id, d_str, name, typ, hrs, note in rows:
-            self.att_tree.insert(
-                "",
-                "end",
-                iid=str(att_id),
-                values=(d_str, name, typ, hrs, note or "")
-            )
+        Ay listesi yeniden sorgulanmaz; kayıtlar id ile okunur, listelenen
+        ay ve personel filtresine uyanlar sıradaki yerlerine konur.
+        """
+        if self.list_filter is None:
+            return
+        start, end, emp_filter_id = self.list_filter
+        rows = [
+            row for row in get_attendance_list_rows(att_ids)
+            if start <= row[2] < end and emp_filter_id in (None, row[1])
+        ]
+        for att_id, emp_id, *_ in rows:
+            self.row_employee_ids[att_id] = emp_id
+        self.att_grid.upsert_rows(
+            ((str(att_id), (d_str, name, typ, hrs, note or ""))
+             for att_id, _, d_str, name, typ, hrs, note in rows),
+            key=date_desc_key,
+        )
 
     # ------------- KAYIT SEÇİMİ ------------- #
 
+    def show_record(self, record_id, date_str):
+        """Kaydın ayını listeleyip kaydı seçer (global aramadan gelince).
+
+        Kayıt listede yoksa (silinmişse) False döner.
+        """
+        year, month = int(date_str[:4]), int(date_str[5:7])
+        self.rep_year_var.set(str(year))
+        self.rep_month_var.set(str(month))
+        self.show_only_selected_var.set(0)
+        self.load_current_month_logs()
+
+        iid = str(record_id)
+        if not self.att_grid.ensure_loaded(iid):
+            return False
+        self.att_tree.selection_set(iid)
+        self.att_tree.focus(iid)
+        self.att_tree.see(iid)
+        self.on_select(None)
+        return True
+
     def on_select(self, event):
         item_id = self.att_tree.focus()
         if not item_id:
@@ -237,7 +269,9 @@ class AttendanceTab(ttk.Frame):
         vals = self.att_tree.item(item_id, "values")
         d_str, emp_name, typ, hours, note = vals
 
-        self.att_emp_var.set(emp_name)
+        emp_id = self.row_employee_ids.get(self.selected_att_id)
+        if not self.att_emp_combo.set_employee(emp_id):
+            self.att_emp_var.set(emp_name)
 
         self.att_date_var.set(d_str)
         try:
@@ -260,20 +294,15 @@ class AttendanceTab(ttk.Frame):
     # ------------- KAYDET / SİL ------------- #
 
     def save_attendance(self):
-        emp_name = self.att_emp_var.get()
-        if not emp_name:
+        if not self.att_emp_var.get():
             messagebox.showerror("Hata", "Lütfen personel seçin.")
             return
 
-        emp_id = None
-        for e in self.employees_cache:
-            if e[1] == emp_name:
-                emp_id = e[0]
-                break
-
-        if emp_id is None:
+        emp = self.selected_employee()
+        if emp is None:
             messagebox.showerror("Hata", "Personel bulunamadı.")
             return
+        emp_id = emp.id
 
         date_str = self.att_date_var.get().strip()
         try:
@@ -319,17 +348,29 @@ class AttendanceTab(ttk.Frame):
         self.clear_form()
         self.load_current_month_logs()
 
-    # ------------- EXCEL İÇE AKTAR (Önceki sürümün aynısı) ------------- #
-    # Burayı değiştirmedim; sadece üstte rapor filtresini ekledik.
+    # ------------- TOPLU GİRİŞ ------------- #
+
+    def open_bulk_entry(self):
+        """Personel × gün toplu giriş tablosunu açar (bkz. ui_attendance_bulk.py)."""
+        from ui_attendance_bulk import AttendanceBulkDialog
+
+        if self.bulk_dialog is None or not self.bulk_dialog.winfo_exists():
+            self.bulk_dialog = AttendanceBulkDialog(self, self.directory, on_saved=self.refresh_rows)
+        self.bulk_dialog.show()
+
+    # ------------- EXCEL İÇE AKTAR ------------- #
 
     def import_from_excel(self):
         """
         Satır bazlı devamsızlık Excel'ini içeri alır.
         Beklenen başlıklar:
         Personel | Tarih | Tür | Eksik Saat | Not
+
+        Okuma/yazma excel_import modülünde: dosya akış halinde okunur,
+        tüm geçerli satırlar tek transaction'da yazılır.
         """
         try:
-            from openpyxl import load_workbook
+            import openpyxl  # noqa: F401
         except ImportError:
             messagebox.showerror(
                 "Hata",
@@ -345,137 +386,62 @@ class AttendanceTab(ttk.Frame):
         if not file_path:
             return
 
-        self.load_employees()
-        wb = None
-        try:
-            wb = load_workbook(file_path, data_only=True)
-        except Exception as e:
-            messagebox.showerror("Hata", f"Excel dosyası açılamadı:\n{e}")
-            return
+        emp_name_to_id = self.directory.active_name_map()
 
-        ws = wb.active
-
-        header_map = {}
-        for col in range(1, ws.max_column + 1):
-            val = ws.cell(row=1, column=col).value
-            if not val:
-                continue
-            key = str(val).strip().lower()
-            header_map[key] = col
-
-        def find_col(possible_keys):
-            for k in possible_keys:
-                for h, col_idx in header_map.items():
-                    if k in h:
-                        return col_idx
-            return None
-
-        col_person = find_col(["personel", "isim", "ad"])
-        col_date = find_col(["tarih", "date"])
-        col_type = find_col(["tür", "tur", "type"])
-        col_hours = find_col(["eksik saat", "saat", "hours"])
-        col_note = find_col(["not", "açıklama", "aciklama", "note"])
-
-        if not col_person or not col_date:
+        try:
+            report = import_attendance_excel(file_path, emp_name_to_id)
+        except ValueError as e:
             messagebox.showerror(
                 "Hata",
-                "Excel başlıkları bulunamadı.\n\n"
+                f"{e}\n\n"
                 "En az şu başlıklar olmalı:\n"
                 "- 'Personel'\n"
                 "- 'Tarih'\n\n"
                 "Opsiyonel: 'Tür', 'Eksik Saat', 'Not / Açıklama'"
             )
             return
-
-        imported = 0
-        skipped = 0
-        unknown_emps = set()
-
-        emp_name_to_id = {e[1]: e[0] for e in self.employees_cache}
-
-        for row in range(2, ws.max_row + 1):
-            name_val = ws.cell(row=row, column=col_person).value
-            date_val = ws.cell(row=row, column=col_date).value
-
-            if (name_val is None or str(name_val).strip() == "") and not date_val:
-                continue
-
-            name_str = str(name_val).strip() if name_val else ""
-            if not name_str:
-                skipped += 1
-                continue
-
-            emp_id = emp_name_to_id.get(name_str)
-            if not emp_id:
-                unknown_emps.add(name_str)
-                skipped += 1
-                continue
-
-            date_str = None
-            if isinstance(date_val, (datetime, date)):
-                date_str = date_val.strftime("%Y-%m-%d")
-            elif isinstance(date_val, str):
-                dt = None
-                for fmt in ("%Y-%m-%d", "%d.%m.%Y", "%d/%m/%Y"):
-                    try:
-                        dt = datetime.strptime(date_val.strip(), fmt)
-                        break
-                    except ValueError:
-                        continue
-                if dt is None:
-                    skipped += 1
-                    continue
-                date_str = dt.strftime("%Y-%m-%d")
-            else:
-                skipped += 1
-                continue
-
-            type_code = "HOUR_LOSS"
-            if col_type:
-                type_val = ws.cell(row=row, column=col_type).value
-                if type_val:
-                    t_str = str(type_val).strip().upper()
-                    if "HOUR" in t_str or "SAAT" in t_str:
-                        type_code = "HOUR_LOSS"
-                    elif "FULL" in t_str or "TAM" in t_str:
-                        type_code = "FULL_ABSENCE"
-                    elif "FREE" in t_str or "ÜCRETSİZ" in t_str:
-                        type_code = "FREE_LEAVE"
-                    elif "ANNUAL" in t_str or "YILLIK" in t_str:
-                        type_code = "ANNUAL_LEAVE"
-                    elif "RAPOR" in t_str or "REPORT" in t_str:
-                        type_code = "REPORT"
-                    elif t_str in ["HOUR_LOSS", "FULL_ABSENCE", "FREE_LEAVE", "ANNUAL_LEAVE", "REPORT"]:
-                        type_code = t_str
-
-            hours_val = 0.0
-            if col_hours:
-                h_val = ws.cell(row=row, column=col_hours).value
-                if h_val is not None and str(h_val).strip() != "":
-                    try:
-                        hours_val = float(str(h_val).replace(",", "."))
-                    except ValueError:
-                        hours_val = 0.0
-
-            if type_code != "HOUR_LOSS":
-                hours_val = 0.0
-
-            note_val = ""
-            if col_note:
-                n_val = ws.cell(row=row, column=col_note).value
-                if n_val:
-                    note_val = str(n_val).strip()
-
-            try:
-                add_attendance(emp_id, date_str, type_code, hours_val, note_val)
-                imported += 1
-            except Exception:
-                skipped += 1
+        except Exception as e:
+            messagebox.showerror("Hata", f"Excel içe aktarılamadı (hiçbir kayıt yazılmadı):\n{e}")
+            return
 
         self.load_current_month_logs()
 
-        msg = f"İçe aktarma tamamlandı.\n\nBaşarılı kayıt: {imported}\nAtlanan satır: {skipped}"
-        if unknown_emps:
+        msg = (
+            f"İçe aktarma tamamlandı.\n\nBaşarılı kayıt: {report.imported}\n"
+            f"Atlanan satır: {report.skipped}"
+        )
+        if report.unknown_emps:
             msg += "\n\nTanımlı olmayan personeller (eklemeniz gerekiyor):\n"
-            msg += "\n".join(sorted(unknown_emps))
+            msg += "\n".join(sorted(report.unknown_emps))
+        if report.errors:
+            preview = report.errors[:IMPORT_ERROR_PREVIEW]
+            msg += "\n\nHatalı satırlar:\n"
+            msg += "\n".join(f"Satır {row_no}: {name} – {err}" for row_no, name, err in preview)
+            if len(report.errors) > len(preview):
+                msg += f"\n... (+{len(report.errors) - len(preview)} satır)"
+            msg += "\n\nHata raporu CSV olarak kaydedilsin mi?"
+            if messagebox.askyesno("Excel İçe Aktar", msg):
+                self.save_import_error_report(report)
+            return
         messagebox.showinfo("Excel İçe Aktar", msg)
+
+    def save_import_error_report(self, report):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV Dosyası", "*.csv")],
+            initialfile="devamsizlik_ice_aktarma_hatalari.csv",
+            title="Hata Raporunu Kaydet",
+        )
+        if not file_path:
+            return
+
+        import csv
+
+        try:
+            with open(file_path, "w", newline="", encoding="utf-8-sig") as f:
+                writer = csv.writer(f, delimiter=";")
+                writer.writerow(["Satır", "Personel", "Hata"])
+                writer.writerows(report.errors)
+            messagebox.showinfo("Başarılı", f"Hata raporu kaydedildi:\n{file_path}")
+        except Exception as e:
+            messagebox.showerror("Hata", f"Hata raporu kaydedilirken hata oluştu:\n{e}")
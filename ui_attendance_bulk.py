@@ -0,0 +1,384 @@
+"""Toplu devamsızlık girişi: personel × gün tablosu.
+
+Sabah 40 devamsızlığı tek tek forma girmek yerine (her biri ayrı commit,
+mesaj kutusu ve ay listesinin yeniden yüklenmesi) tabloda işaretlenir ve
+hepsi tek executemany / tek transaction ile yazılır (db.add_attendance_batch).
+Kaydedilince AttendanceTab listesi sadece yeni kayıtlarla güncellenir
+(on_saved(yeni id'ler) -> AttendanceTab.refresh_rows).
+
+Satırlar aktif personel (ortak dizin, isim sırasıyla), sütunlar seçilen
+günlerdir. Hücre kodları:
+    T  tam gün yok      Ü  ücretsiz izin     Y  yıllık izin     R  rapor
+    1-9  o kadar saat eksik (küsuratlı saat üstteki Saat kutusundan)
+
+- Satır(lar) seçilip kod tuşuna basılınca seçili gün sütununa yazılır;
+  sütun tıklanarak ya da sol / sağ okla değiştirilir.
+- Delete / BackSpace seçili hücrelerdeki kaydedilmemiş işareti siler.
+- "Listedeki herkese" seçili günü (filtrelenmiş) tüm listeye işaretler.
+- Veritabanında kaydı olan hücreler parantez içinde gösterilir, üzerine
+  yazılmaz (aynı güne ikinci kayıt açılmaz).
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import date, timedelta
+
+from tkcalendar import DateEntry
+
+from data_grid import DataGrid
+from db import add_attendance_batch, get_attendance_marks
+
+# Tabloda en fazla gösterilen gün sayısı
+MAX_DAYS = 14
+
+DAY_NAMES_TR = ["Pzt", "Sal", "Çar", "Per", "Cum", "Cmt", "Paz"]
+
+# Hücre kodu -> devamsızlık türü (sayı girilen hücre HOUR_LOSS olur)
+CELL_CODES = {
+    "T": "FULL_ABSENCE",
+    "Ü": "FREE_LEAVE",
+    "Y": "ANNUAL_LEAVE",
+    "R": "REPORT",
+}
+TYPE_CODES = {type_code: code for code, type_code in CELL_CODES.items()}
+
+# Klavyeden gelen karakter -> hücre kodu (Türkçe klavyesi olmayanlar için U)
+_KEY_CODES = {"t": "T", "ü": "Ü", "u": "Ü", "y": "Y", "r": "R"}
+
+TYPE_CHOICES = [
+    "HOUR_LOSS - Saatlik Eksik",
+    "FULL_ABSENCE - Tam Gün Yok",
+    "FREE_LEAVE - Ücretsiz İzin",
+    "ANNUAL_LEAVE - Yıllık İzin",
+    "REPORT - Rapor",
+]
+
+
+def cell_text(type_code, hours):
+    """Hücrede gösterilen kısa metin: tür kodu ya da eksik saat."""
+    if type_code == "HOUR_LOSS":
+        return f"{hours:g}"
+    return TYPE_CODES.get(type_code, type_code[:1])
+
+
+class AttendanceBulkDialog(tk.Toplevel):
+    def __init__(self, master, directory, on_saved):
+        super().__init__(master)
+        self.title("Toplu Devamsızlık Girişi")
+        self.geometry("980x560")
+        self.transient(master.winfo_toplevel())
+
+        self.directory = directory
+        self.on_saved = on_saved
+
+        self.days = []       # gösterilen günler (date)
+        self.column = 0      # seçili gün sütunu (days içindeki sıra)
+        self.saved = {}      # (personel id, 'YYYY-MM-DD') -> [hücre metni, ...]
+        self.marks = {}      # (personel id, 'YYYY-MM-DD') -> (tür, saat); kaydedilmemiş
+
+        self.build_ui()
+        self.directory.subscribe(self.on_employees_changed)
+        self.bind("<Escape>", lambda e: self.close())
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        today = date.today()
+        self.start_entry.set_date(today - timedelta(days=today.weekday()))
+        self.load_days()
+
+    # ------------- ARAYÜZ ------------- #
+
+    def build_ui(self):
+        top = ttk.Frame(self)
+        top.pack(fill="x", padx=10, pady=(10, 5))
+
+        ttk.Label(top, text="Başlangıç:").pack(side="left")
+        self.start_var = tk.StringVar()
+        self.start_entry = DateEntry(top, textvariable=self.start_var, date_pattern="yyyy-mm-dd", width=12)
+        self.start_entry.pack(side="left", padx=(0, 10))
+
+        ttk.Label(top, text="Gün:").pack(side="left")
+        self.day_count_var = tk.StringVar(value="7")
+        ttk.Spinbox(top, from_=1, to=MAX_DAYS, textvariable=self.day_count_var, width=4)\
+            .pack(side="left", padx=(0, 10))
+        ttk.Button(top, text="Göster", command=self.reload).pack(side="left")
+
+        ttk.Label(top, text="Personel ara:").pack(side="left", padx=(20, 0))
+        self.filter_var = tk.StringVar()
+        filter_entry = ttk.Entry(top, textvariable=self.filter_var, width=20)
+        filter_entry.pack(side="left", padx=5)
+        filter_entry.bind("<KeyRelease>", lambda e: self.load_rows())
+
+        # İşaret: tür + saat + not, seçili hücrelere / tüm listeye
+        mark = ttk.Frame(self)
+        mark.pack(fill="x", padx=10, pady=5)
+
+        ttk.Label(mark, text="Tür:").pack(side="left")
+        self.type_var = tk.StringVar()
+        self.type_combo = ttk.Combobox(mark, textvariable=self.type_var, state="readonly",
+                                       values=TYPE_CHOICES, width=26)
+        self.type_combo.current(1)
+        self.type_combo.pack(side="left", padx=(0, 10))
+
+        ttk.Label(mark, text="Saat:").pack(side="left")
+        self.hours_var = tk.StringVar(value="0")
+        ttk.Entry(mark, textvariable=self.hours_var, width=6).pack(side="left", padx=(0, 10))
+
+        ttk.Label(mark, text="Not (tümü için):").pack(side="left")
+        self.note_var = tk.StringVar()
+        ttk.Entry(mark, textvariable=self.note_var, width=24).pack(side="left", padx=(0, 10))
+
+        ttk.Button(mark, text="Seçililere", command=self.mark_selected_from_form).pack(side="left", padx=2)
+        ttk.Button(mark, text="Listedeki herkese", command=self.mark_all_from_form).pack(side="left", padx=2)
+
+        list_frame = ttk.Frame(self)
+        list_frame.pack(fill="both", expand=True, padx=10)
+
+        self.tree = ttk.Treeview(list_frame, show="headings", selectmode="extended")
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.pack(fill="both", expand=True)
+        self.grid_rows = DataGrid(self.tree, scrollbar=scrollbar)
+
+        self.tree.bind("<Button-1>", self.on_click, add="+")
+        self.tree.bind("<Double-1>", lambda e: self.mark_selected_from_form())
+        self.tree.bind("<Left>", lambda e: self.move_column(-1))
+        self.tree.bind("<Right>", lambda e: self.move_column(1))
+        self.tree.bind("<Delete>", lambda e: self.clear_selected())
+        self.tree.bind("<BackSpace>", lambda e: self.clear_selected())
+        self.tree.bind("<KeyPress>", self.on_key)
+
+        bottom = ttk.Frame(self)
+        bottom.pack(fill="x", padx=10, pady=10)
+        ttk.Label(
+            bottom,
+            text="T: tam gün  Ü: ücretsiz izin  Y: yıllık izin  R: rapor  1-9: eksik saat  "
+                 "(parantezli hücreler kayıtlı)",
+            foreground="gray",
+        ).pack(side="left")
+        ttk.Button(bottom, text="Kaydet", command=self.save).pack(side="right")
+        ttk.Button(bottom, text="İşaretleri Temizle", command=self.discard_marks).pack(side="right", padx=5)
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(bottom, textvariable=self.status_var).pack(side="right", padx=10)
+
+    def show(self):
+        self.deiconify()
+        self.lift()
+        self.tree.focus_set()
+
+    def close(self):
+        if self.marks and not messagebox.askyesno(
+            "Toplu Giriş",
+            f"{len(self.marks)} kaydedilmemiş işaret var. Vazgeçilsin mi?",
+            parent=self,
+        ):
+            return
+        self.discard_marks()
+        self.withdraw()
+
+    # ------------- VERİ YÜKLEME ------------- #
+
+    def reload(self):
+        if self.marks and not messagebox.askyesno(
+            "Toplu Giriş",
+            "Kaydedilmemiş işaretler silinecek. Devam edilsin mi?",
+            parent=self,
+        ):
+            return
+        self.marks = {}
+        self.load_days()
+
+    def load_days(self):
+        """Gün sütunlarını kurar ve aralıktaki kayıtları tek sorguyla okur."""
+        start = self.start_entry.get_date()
+        try:
+            count = min(max(int(self.day_count_var.get()), 1), MAX_DAYS)
+        except ValueError:
+            count = 7
+        self.day_count_var.set(str(count))
+        self.days = [start + timedelta(days=i) for i in range(count)]
+
+        today = date.today()
+        self.column = self.days.index(today) if today in self.days else 0
+
+        self.saved = {}
+        end = self.days[-1] + timedelta(days=1)
+        for emp_id, d_str, type_code, hours in get_attendance_marks(start.isoformat(), end.isoformat()):
+            self.saved.setdefault((emp_id, d_str), []).append(cell_text(type_code, hours or 0))
+
+        columns = ["employee"] + [f"d{i}" for i in range(count)]
+        self.grid_rows.clear()
+        self.tree["columns"] = columns
+        self.tree.heading("employee", text="Personel")
+        self.tree.column("employee", width=200, stretch=False)
+        for i in range(count):
+            self.tree.column(f"d{i}", width=70, anchor="center", stretch=False)
+        self.update_headings()
+        self.load_rows()
+
+    def load_rows(self):
+        """Aktif personeli (arama kutusuna göre daraltılmış) tabloya yükler."""
+        labels = self.directory.search(self.filter_var.get(), limit=len(self.directory.active()))
+        self.grid_rows.set_rows(
+            (str(emp.id), self.row_values(emp.id, label))
+            for label, emp in ((label, self.directory.resolve(label)) for label in labels)
+            if emp is not None
+        )
+        self.update_status()
+
+    def on_employees_changed(self, directory):
+        if self.days:
+            self.load_rows()
+
+    def row_values(self, emp_id, label=None):
+        if label is None:
+            label = self.directory.label(emp_id)
+        values = [label]
+        for day in self.days:
+            key = (emp_id, day.isoformat())
+            mark = self.marks.get(key)
+            if mark is not None:
+                values.append(cell_text(*mark))
+            elif key in self.saved:
+                values.append("(" + "+".join(self.saved[key]) + ")")
+            else:
+                values.append("")
+        return values
+
+    def refresh_employees(self, emp_ids):
+        """Sadece işareti değişen personelin satırları güncellenir."""
+        self.grid_rows.upsert_rows(
+            (str(emp_id), self.row_values(emp_id))
+            for emp_id in emp_ids
+            if self.grid_rows.values(str(emp_id)) is not None
+        )
+        self.update_status()
+
+    def update_headings(self):
+        for i, day in enumerate(self.days):
+            text = f"{DAY_NAMES_TR[day.weekday()]} {day:%d.%m}"
+            if i == self.column:
+                text = f"▶ {text}"
+            self.tree.heading(f"d{i}", text=text)
+
+    def update_status(self):
+        day = self.days[self.column] if self.days else None
+        text = f"Seçili gün: {day:%d.%m.%Y}" if day else ""
+        if self.marks:
+            text += f"  –  {len(self.marks)} kaydedilmemiş işaret"
+        self.status_var.set(text)
+
+    # ------------- HÜCRE SEÇİMİ / İŞARETLEME ------------- #
+
+    def on_click(self, event):
+        column = self.tree.identify_column(event.x)  # '#1' personel, '#2' ilk gün
+        try:
+            index = int(column.lstrip("#")) - 2
+        except ValueError:
+            return
+        if 0 <= index < len(self.days) and index != self.column:
+            self.column = index
+            self.update_headings()
+            self.update_status()
+
+    def move_column(self, step):
+        if self.days:
+            self.column = (self.column + step) % len(self.days)
+            self.update_headings()
+            self.update_status()
+        return "break"
+
+    def on_key(self, event):
+        char = event.char.lower() if event.char else ""
+        if char in _KEY_CODES:
+            self.mark_selected(CELL_CODES[_KEY_CODES[char]], 0.0)
+            return "break"
+        if char.isdigit() and char != "0":
+            self.mark_selected("HOUR_LOSS", float(char))
+            return "break"
+
+    def selected_employee_ids(self):
+        return [int(iid) for iid in self.tree.selection()]
+
+    def form_mark(self):
+        """Üstteki tür / saat seçimi: (tür, saat); saat geçersizse None."""
+        type_code = self.type_var.get().split(" - ")[0]
+        if type_code != "HOUR_LOSS":
+            return type_code, 0.0
+        try:
+            hours = float((self.hours_var.get().strip() or "0").replace(",", "."))
+        except ValueError:
+            hours = 0.0
+        if hours <= 0:
+            messagebox.showerror("Hata", "Eksik saat sıfırdan büyük bir sayı olmalıdır.", parent=self)
+            return None
+        return type_code, hours
+
+    def mark_selected_from_form(self):
+        mark = self.form_mark()
+        if mark is not None:
+            self.mark_selected(*mark)
+
+    def mark_all_from_form(self):
+        mark = self.form_mark()
+        if mark is not None:
+            self.mark_employees([int(iid) for iid, _ in self.grid_rows.rows], *mark)
+
+    def mark_selected(self, type_code, hours):
+        emp_ids = self.selected_employee_ids()
+        if not emp_ids:
+            self.status_var.set("Önce listeden personel seçin.")
+            return
+        self.mark_employees(emp_ids, type_code, hours)
+
+    def mark_employees(self, emp_ids, type_code, hours):
+        if not self.days:
+            return
+        d_str = self.days[self.column].isoformat()
+        changed, skipped = [], 0
+        for emp_id in emp_ids:
+            key = (emp_id, d_str)
+            if key in self.saved:
+                skipped += 1
+                continue
+            self.marks[key] = (type_code, hours)
+            changed.append(emp_id)
+        self.refresh_employees(changed)
+        if skipped:
+            self.status_var.set(f"{skipped} hücrede zaten kayıt var, atlandı.")
+
+    def clear_selected(self):
+        if not self.days:
+            return "break"
+        d_str = self.days[self.column].isoformat()
+        changed = [emp_id for emp_id in self.selected_employee_ids()
+                   if self.marks.pop((emp_id, d_str), None) is not None]
+        self.refresh_employees(changed)
+        return "break"
+
+    def discard_marks(self):
+        emp_ids = {emp_id for emp_id, _ in self.marks}
+        self.marks = {}
+        self.refresh_employees(emp_ids)
+
+    # ------------- KAYDET ------------- #
+
+    def save(self):
+        if not self.marks:
+            self.status_var.set("Kaydedilecek işaret yok.")
+            return
+
+        note = self.note_var.get().strip()
+        marks = sorted(self.marks.items())
+        rows = [(emp_id, d_str, type_code, hours, note)
+                for (emp_id, d_str), (type_code, hours) in marks]
+        try:
+            new_ids = add_attendance_batch(rows)
+        except Exception as e:
+            messagebox.showerror("Hata", f"Kayıtlar yazılamadı (hiçbiri kaydedilmedi):\n{e}", parent=self)
+            return
+
+        for key, mark in marks:
+            self.saved.setdefault(key, []).append(cell_text(*mark))
+        self.marks = {}
+        self.refresh_employees({emp_id for (emp_id, _), _ in marks})
+        self.status_var.set(f"{len(new_ids)} kayıt kaydedildi.")
+        self.on_saved(new_ids)
@@ -1,13 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from collections import OrderedDict
+from datetime import date
 
-from datetime import date, datetime, timedelta
+from db import add_settings_listener, data_version, get_settings
+from payroll import month_hours_overview, monthly_trends
+from task_runner import get_task_runner
+from work_calendar import MONTH_NAMES_TR
 
-from db import get_conn, get_settings
-from utils import month_date_range
+# Eğilim görünümünde seçilebilen ay sayıları
+TREND_MONTH_CHOICES = (12, 24, 36)
 
 
 class DashboardTab(ttk.Frame):
@@ -16,11 +19,27 @@ class DashboardTab(ttk.Frame):
     - Çalışma günü, teorik saat, devamsızlık saati, toplam saat
     - Net maaş
     Grafik: Toplam saat ve devamsızlık saatleri bar chart olarak
+
+    Grafik bir kez kurulur (DashboardChart); daha önce gösterilen aylar
+    veri sürümü değişmediyse önbellekten gelir.
+
+    Eğilim: seçilen aya kadar son 12 / 24 / 36 ayın şirket geneli
+    devamsızlık saati, mesai maliyeti ve net bordrosu (TrendChart). Para
+    görmeyen rolde (hide_money) sadece devamsızlık ve mesai saatleri çizilir.
     """
 
     def __init__(self, master):
         super().__init__(master)
+        self.load_task = None
+        self.shown_view = None  # "month" / "trend"
+        self.settings = get_settings()
+        # (yıl, ay, veri sürümü, ayarlar, bugün) -> _CachedChart; en eski önce
+        self.chart_cache = OrderedDict()
+        self.chart = None
+        self.trend_chart = None
+        self.allow_money = True
         self.build_ui()
+        add_settings_listener(self.on_settings_changed)
 
     # -------------------------------------------------
     #   UI
@@ -42,8 +61,20 @@ class DashboardTab(ttk.Frame):
         ttk.Button(filter_frame, text="Göster", command=self.load_dashboard)\
             .grid(row=0, column=4, padx=10, pady=5)
 
+        ttk.Separator(filter_frame, orient="vertical").grid(row=0, column=5, sticky="ns", padx=5, pady=5)
+
+        ttk.Label(filter_frame, text="Eğilim (ay):").grid(row=0, column=6, padx=5, pady=5, sticky="w")
+        self.trend_months_var = tk.StringVar(value=str(TREND_MONTH_CHOICES[0]))
+        ttk.Combobox(
+            filter_frame, textvariable=self.trend_months_var, width=4, state="readonly",
+            values=[str(n) for n in TREND_MONTH_CHOICES],
+        ).grid(row=0, column=7, padx=5, pady=5)
+
+        ttk.Button(filter_frame, text="Eğilim Göster", command=self.load_trends)\
+            .grid(row=0, column=8, padx=10, pady=5)
+
         self.info_label = ttk.Label(filter_frame, text="", foreground="gray")
-        self.info_label.grid(row=1, column=0, columnspan=5, padx=5, pady=(0, 5), sticky="w")
+        self.info_label.grid(row=1, column=0, columnspan=9, padx=5, pady=(0, 5), sticky="w")
 
         # Grafik alanı
         self.chart_frame = ttk.Frame(self)
@@ -52,11 +83,8 @@ class DashboardTab(ttk.Frame):
     # -------------------------------------------------
     #   Veri & Grafik
     # -------------------------------------------------
-    def load_dashboard(self):
-        # Önce mevcut grafikleri temizle
-        for w in self.chart_frame.winfo_children():
-            w.destroy()
-
+    def selected_period(self):
+        """Filtredeki (yıl, ay); geçersizse hata gösterip None döner."""
         try:
             year = int(self.year_var.get())
             month = int(self.month_var.get())
@@ -64,82 +92,103 @@ class DashboardTab(ttk.Frame):
                 raise ValueError
         except ValueError:
             messagebox.showerror("Hata", "Geçerli bir yıl ve ay girin (örn. 2025 / 11).")
-            return
-
-        month_start, month_end = month_date_range(year, month)
-        daily_hours, overtime_coef, include_weekends = get_settings()
-
-        conn = get_conn()
-        c = conn.cursor()
-
-        # Çalışan listesi
-        c.execute("""
-            SELECT id, name, hourly_rate, start_date
-            FROM employees
-            ORDER BY name
-        """)
-        employees = c.fetchall()
-
-        names = []
-        total_hours_list = []
-        missing_hours_list = []
-
-        today = date.today()
+            return None
+        return year, month
 
-        def count_working_days(start_date_str: str) -> int:
-            if not start_date_str:
-                return 0
-            try:
-                start_date_val = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-            except Exception:
-                return 0
+    def cancel_load(self):
+        if self.load_task is not None:
+            self.load_task.cancel()
+            self.load_task = None
 
-            last_day = month_end - timedelta(days=1)
-
-            # Gelecekteki günleri sayma
-            if year == today.year and month == today.month and today < last_day:
-                last_day = today
+    def load_dashboard(self):
+        period = self.selected_period()
+        if period is None:
+            return
+        year, month = period
+        self.cancel_load()
+
+        # Aynı veriyle daha önce gösterilmiş ay: hesap da çizim de atlanır
+        settings = self.settings
+        key = (year, month, data_version(year, month), settings, date.today())
+        cached = self.chart_cache.get(key)
+        if cached is not None:
+            self.chart_cache.move_to_end(key)
+            self.show_dashboard(year, month, key, *cached.data)
+            return
 
-            period_start = max(month_start, start_date_val)
-            if period_start > last_day:
-                return 0
+        self.info_label.config(text=f"{month:02d}/{year} yükleniyor…", foreground="gray")
+        self.load_task = get_task_runner(self).submit(
+            lambda task: self.compute_month(task, year, month, settings),
+            description=f"Dashboard hazırlanıyor ({month:02d}/{year})",
+            on_done=lambda data: self.show_dashboard(year, month, key, *data),
+            on_error=lambda e: messagebox.showerror("Hata", f"Dashboard yüklenirken hata oluştu:\n{e}"),
+        )
 
-            d = period_start
-            days = 0
-            while d <= last_day:
-                if include_weekends or d.weekday() < 5:
-                    days += 1
-                d += timedelta(days=1)
-            return days
+    def load_trends(self):
+        """Seçilen aya kadar son N ayın şirket geneli eğilimi (arka planda)."""
+        period = self.selected_period()
+        if period is None:
+            return
+        year, month = period
+        count = int(self.trend_months_var.get())
+        first = year * 12 + month - count
+        start = (first // 12, first % 12 + 1)
+        self.cancel_load()
+
+        self.info_label.config(text=f"Son {count} ay yükleniyor…", foreground="gray")
+        settings = self.settings
+        self.load_task = get_task_runner(self).submit(
+            lambda task: monthly_trends(start, (year, month), settings=settings),
+            description=f"Eğilim hazırlanıyor ({count} ay)",
+            on_done=self.show_trends,
+            on_error=lambda e: messagebox.showerror("Hata", f"Eğilim yüklenirken hata oluştu:\n{e}"),
+        )
 
-        try:
-            for emp_id, name, hourly_rate, start_str in employees:
-                work_days = count_working_days(start_str)
-                theoretical_hours = work_days * daily_hours
-
-                # Devamsızlık saatleri (attendance_logs)
-                c.execute("""
-                    SELECT COALESCE(SUM(hours), 0)
-                    FROM attendance_logs
-                    WHERE employee_id = ?
-                      AND date >= ? AND date < ?
-                """, (emp_id, month_start.isoformat(), month_end.isoformat()))
-                row = c.fetchone()
-                missing_hours = float(row[0] or 0)
-
-                total_hours = max(theoretical_hours - missing_hours, 0.0)
-
-                # Hiç çalışmamış / teorik sıfırsa grafiğe eklemeyebiliriz
-                if theoretical_hours == 0 and missing_hours == 0:
-                    continue
-
-                names.append(name)
-                total_hours_list.append(total_hours)
-                missing_hours_list.append(missing_hours)
-        finally:
-            conn.close()
+    def hide_money(self):
+        """OFIS rolü: eğilim grafiği para serileri olmadan (sadece saatler) kurulur."""
+        if not self.allow_money:
+            return
+        self.allow_money = False
+        if self.trend_chart is not None:
+            self.trend_chart.destroy()
+            self.trend_chart = None
+            if self.shown_view == "trend":
+                self.shown_view = None
+                self.load_trends()
+
+    def on_settings_changed(self, settings):
+        """Ayarlar kaydedilince çağrılır; grafik gösteriliyorsa yeniden hesaplanır."""
+        self.settings = settings
+        if self.shown_view == "trend":
+            self.load_trends()
+        elif self.shown_view == "month":
+            self.load_dashboard()
+
+    @staticmethod
+    def compute_month(task, year, month, settings):
+        """Arka planda çalışır: (isimler, toplam saatler, devamsızlık saatleri)."""
+        overview = month_hours_overview(year, month, settings=settings)
+        task.check_cancelled()
+        names = tuple(name for name, _, _ in overview)
+        total_hours_list = [total for _, total, _ in overview]
+        missing_hours_list = [missing for _, _, missing in overview]
+        return names, total_hours_list, missing_hours_list
+
+    def show_dashboard(self, year, month, key, names, total_hours_list, missing_hours_list):
+        self.load_task = None
+        self.shown_view = "month"
+        if self.trend_chart is not None:
+            self.trend_chart.hide()
+
+        entry = self.chart_cache.get(key)
+        if entry is None:
+            entry = self.chart_cache[key] = _CachedChart((names, total_hours_list, missing_hours_list))
+            while len(self.chart_cache) > CHART_CACHE_SIZE:
+                self.chart_cache.popitem(last=False)
 
         if not names:
+            if self.chart is not None:
+                self.chart.hide()
             self.info_label.config(
                 text=f"{month:02d}/{year} için veri bulunamadı.",
                 foreground="red",
@@ -151,29 +200,232 @@ class DashboardTab(ttk.Frame):
             foreground="black",
         )
 
-        # Matplotlib Figure
-        fig = Figure(figsize=(9, 4), dpi=100)
-        ax1 = fig.add_subplot(121)
-        ax2 = fig.add_subplot(122)
+        if self.chart is None:
+            self.chart = DashboardChart(self.chart_frame)
+        self.chart.show(entry, names, total_hours_list, missing_hours_list)
+
+    def show_trends(self, trends):
+        self.load_task = None
+        self.shown_view = "trend"
+        if self.chart is not None:
+            self.chart.hide()
 
-        x = range(len(names))
+        (y0, m0), (y1, m1) = trends.periods[0], trends.periods[-1]
+        self.info_label.config(
+            text=f"Eğilim: {m0:02d}/{y0} – {m1:02d}/{y1} · {len(trends.periods)} ay",
+            foreground="black",
+        )
+        if self.trend_chart is None:
+            series = TrendChart.SERIES if self.allow_money else TrendChart.HOURS_SERIES
+            self.trend_chart = TrendChart(self.chart_frame, series)
+        self.trend_chart.show(trends)
 
-        # Sol grafik: Toplam saat
-        ax1.bar(x, total_hours_list)
-        ax1.set_xticks(list(x))
-        ax1.set_xticklabels(names, rotation=45, ha="right")
-        ax1.set_title("Toplam Çalışma Saatleri")
-        ax1.set_ylabel("Saat")
 
-        # Sağ grafik: Devamsızlık saatleri
-        ax2.bar(x, missing_hours_list)
-        ax2.set_xticks(list(x))
-        ax2.set_xticklabels(names, rotation=45, ha="right")
-        ax2.set_title("Devamsızlık (Eksik Saat)")
-        ax2.set_ylabel("Saat")
+# En fazla bu kadar ayın verisi ve çizilmiş görüntüsü bellekte tutulur
+CHART_CACHE_SIZE = 12
 
-        fig.tight_layout()
 
-        canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+class _CachedChart:
+    """Önbellek girdisi: ayın verisi ve (varsa) çizilmiş görüntüsü."""
+
+    __slots__ = ("data", "image", "image_bounds")
+
+    def __init__(self, data):
+        self.data = data
+        self.image = None
+        self.image_bounds = None
+
+
+class _FigureView:
+    """Grafik alanına yerleşen tek Figure + canvas; gizlenip tekrar gösterilebilir.
+
+    master None ise ekransız Agg canvas kullanılır (ölçüm için, benchmarks.py).
+    """
+
+    def __init__(self, master=None):
+        # matplotlib yavaş yüklenir; açılışı geciktirmemek için ilk grafikte import edilir
+        from matplotlib.figure import Figure
+
+        self.figure = Figure(figsize=(9, 4), dpi=100)
+        if master is None:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+            self.canvas = FigureCanvasAgg(self.figure)
+            self.widget = None
+        else:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+            self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+            self.widget = self.canvas.get_tk_widget()
+        self.visible = False
+
+    def ensure_visible(self):
+        if not self.visible and self.widget is not None:
+            self.widget.pack(fill="both", expand=True)
+        self.visible = True
+
+    def hide(self):
+        if self.visible and self.widget is not None:
+            self.widget.pack_forget()
+        self.visible = False
+
+    def destroy(self):
+        if self.widget is not None:
+            self.widget.destroy()
+        self.visible = False
+
+
+class DashboardChart(_FigureView):
+    """Tek Figure / canvas; ay değişince sadece değişen artist'ler çizilir.
+
+    Figure, eksenler ve bar'lar bir kez kurulur; tight_layout yerine sabit
+    kenar boşlukları kullanılır. Bar'lar ve y eksenleri 'animated' işaretlidir:
+    tam çizimde (ilk gösterim, pencere boyutu değişimi) arka plan - başlıklar
+    ve x eksenindeki personel isimleri - bir kez çizilip kopyalanır. Ay
+    değişince arka plan geri yüklenir, üzerine sadece bar'lar ve y eksenleri
+    çizilip blit edilir; yüzlerce isim etiketi yeniden çizilmez (personel
+    listesi değişmediyse).
+
+    Her ayın son görüntüsü önbellek girdisine kopyalanır; aynı aya
+    dönüldüğünde hiçbir şey çizilmeden görüntü blit edilir.
+    """
+
+    def __init__(self, master=None):
+        super().__init__(master)
+        self.figure.subplots_adjust(left=0.06, right=0.99, top=0.92, bottom=0.28, wspace=0.18)
+        self.axes = [self.figure.add_subplot(121), self.figure.add_subplot(122)]
+        for ax, title in zip(self.axes, ("Toplam Çalışma Saatleri", "Devamsızlık (Eksik Saat)")):
+            ax.set_title(title)
+            ax.set_ylabel("Saat")
+            ax.yaxis.set_animated(True)
+        self.bars = [None, None]
+        self.names = None
+        self.background = None
+        self.needs_full_draw = True
+
+        # Her tam çizimden sonra (pencere boyutu değişimi dahil) arka plan yenilenir
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+
+    def show(self, entry, names, total_hours_list, missing_hours_list):
+        self.ensure_visible()
+        self.set_data(names, (total_hours_list, missing_hours_list))
+
+        # Görüntü aynı boyutta çizildiyse sadece kopyalanır
+        bounds = tuple(self.figure.bbox.bounds)
+        if entry.image is not None and entry.image_bounds == bounds and not self.needs_full_draw:
+            self.canvas.restore_region(entry.image)
+            self.canvas.blit(self.figure.bbox)
+            return
+
+        if self.needs_full_draw or self.background is None:
+            self.canvas.draw()  # on_draw arka planı alır ve bar'ları çizer
+        else:
+            self.canvas.restore_region(self.background)
+            self.draw_animated()
+            self.canvas.blit(self.figure.bbox)
+        entry.image = self.canvas.copy_from_bbox(self.figure.bbox)
+        entry.image_bounds = bounds
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.needs_full_draw = False
+        self.draw_animated()
+
+    def draw_animated(self):
+        for ax, bars in zip(self.axes, self.bars):
+            ax.draw_artist(ax.yaxis)
+            if bars is not None:
+                for rect in bars:
+                    ax.draw_artist(rect)
+
+    def set_data(self, names, series):
+        """Artist'leri yeni veriye getirir (çizim yapmaz)."""
+        count = len(names)
+        x = range(count)
+        for index, (ax, values) in enumerate(zip(self.axes, series)):
+            bars = self.bars[index]
+            if bars is not None and len(bars) == count:
+                for rect, value in zip(bars, values):
+                    rect.set_height(value)
+            else:
+                if bars is not None:
+                    bars.remove()
+                bars = self.bars[index] = ax.bar(x, values, color="C0")
+                for rect in bars:
+                    rect.set_animated(True)
+                # x ekseni arka planda; sınırı değişince arka plan yeniden çizilir
+                ax.set_xlim(-0.6, count - 0.4)
+                self.needs_full_draw = True
+            ax.set_ylim(0, max(max(values, default=0), 1) * 1.05)
+
+        if names != self.names:
+            # Çok personelde etiketler küçülür (300 personelde ~4 pt)
+            size = max(4, min(8, 1200 / max(count, 1)))
+            for ax in self.axes:
+                ax.set_xticks(list(x))
+                ax.set_xticklabels(names, rotation=45, ha="right", fontsize=size)
+            self.names = names
+            self.needs_full_draw = True
+
+
+class TrendChart(_FigureView):
+    """Ay ay şirket geneli eğilim: devamsızlık, mesai maliyeti, net bordro.
+
+    series: (MonthlyTrends alanı, başlık, renk) listesi; para görmeyen rol
+    için HOURS_SERIES (devamsızlık ve mesai saatleri) verilir. Eksenler ve
+    çizgiler bir kez kurulur; yeni aralık gösterilirken sadece çizgi verisi
+    (MonthlyTrends numpy dizileri) ve x etiketleri değişir.
+    """
+
+    SERIES = (
+        ("missing_hours", "Devamsızlık (saat)", "C3"),
+        ("overtime_total", "Mesai Maliyeti (₺)", "C1"),
+        ("net_salary", "Net Bordro (₺)", "C0"),
+    )
+    HOURS_SERIES = (
+        ("missing_hours", "Devamsızlık (saat)", "C3"),
+        ("overtime_hours", "Mesai (saat)", "C1"),
+    )
+
+    def __init__(self, master=None, series=SERIES):
+        super().__init__(master)
+        self.series = series
+        from matplotlib.ticker import FuncFormatter
+
+        self.figure.subplots_adjust(left=0.1, right=0.99, top=0.95, bottom=0.1, hspace=0.35)
+        self.axes = self.figure.subplots(len(self.series), 1, sharex=True)
+        self.lines = []
+        thousands = FuncFormatter(lambda value, _pos: f"{value:,.0f}".replace(",", "."))
+        for ax, (_, title, color) in zip(self.axes, self.series):
+            ax.set_title(title, fontsize=9, loc="left")
+            ax.yaxis.set_major_formatter(thousands)
+            ax.tick_params(labelsize=8)
+            ax.grid(True, alpha=0.3)
+            (line,) = ax.plot([], [], color=color, marker="o", markersize=3)
+            self.lines.append(line)
+        self.periods = None
+
+    def show(self, trends):
+        import numpy as np
+
+        self.ensure_visible()
+        x = np.arange(len(trends.periods))
+        for ax, line, (field, _, _) in zip(self.axes, self.lines, self.series):
+            line.set_data(x, getattr(trends, field))
+            ax.relim()
+            ax.autoscale_view()
+
+        if trends.periods != self.periods:
+            # 12 ayda her ay, 36 ayda üç ayda bir etiket
+            step = max(1, len(x) // 12)
+            ticks = x[::step]
+            labels = [
+                f"{MONTH_NAMES_TR[m - 1][:3]} {y % 100:02d}"
+                for y, m in trends.periods[::step]
+            ]
+            self.axes[-1].set_xticks(ticks)
+            self.axes[-1].set_xticklabels(labels, fontsize=8)
+            self.axes[-1].set_xlim(-0.5, len(x) - 0.5)
+            self.periods = trends.periods
+
+        self.canvas.draw_idle()
@@ -2,7 +2,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 
-from db import add_employee, update_employee, get_all_employees
+from data_grid import DataGrid
+from db import add_employee, update_employee
+from employee_directory import get_employee_directory
 
 
 class EmployeesTab(ttk.Frame):
@@ -10,6 +12,7 @@ class EmployeesTab(ttk.Frame):
         super().__init__(master)
 
         self.selected_employee_id = None
+        self.directory = get_employee_directory()
 
         self.build_ui()
         self.load_employees()
@@ -60,6 +63,7 @@ class EmployeesTab(ttk.Frame):
 
         self.emp_tree.pack(fill="both", expand=True)
         self.emp_tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.emp_grid = DataGrid(self.emp_tree)
 
     # ---------- Yardımcılar ---------- #
 
@@ -71,19 +75,10 @@ class EmployeesTab(ttk.Frame):
         self.emp_active_var.set(1)
 
     def load_employees(self):
-        for row in self.emp_tree.get_children():
-            self.emp_tree.delete(row)
-
-        rows = get_all_employees()
-
-        for emp_id, name, rate, start_date_str, active in rows:
-            active_str = "Evet" if active else "Hayır"
-            self.emp_tree.insert(
-                "",
-                "end",
-                iid=str(emp_id),
-                values=(name, rate, start_date_str, active_str),
-            )
+        self.emp_grid.set_rows(
+            (str(e.id), (e.name, e.hourly_rate, e.start_date, "Evet" if e.is_active else "Hayır"))
+            for e in self.directory.all()
+        )
 
     def on_select(self, event):
         item_id = self.emp_tree.focus()
@@ -125,6 +120,9 @@ class EmployeesTab(ttk.Frame):
         else:
             update_employee(self.selected_employee_id, name, rate, start_str, active)
 
+        # Dizin yeniden okunur; abone sekmeler (devamsızlık, mesai, avans,
+        # performans) kendi listelerini yeniler.
+        self.directory.invalidate()
         self.load_employees()
         messagebox.showinfo("Başarılı", "Personel kaydedildi.")
         self.clear_form()
@@ -5,13 +5,19 @@ from datetime import date, datetime
 from tkcalendar import DateEntry
 
 from db import (
-    get_active_employees,
     add_overtime,
-    get_conn,
+    get_overtime_list_rows,
+    iter_overtime_list,
     update_overtime as db_update_overtime,
     delete_overtime as db_delete_overtime,
     get_settings,
+    add_settings_listener,
 )
+from data_grid import DataGrid, date_desc_key
+from employee_directory import get_employee_directory
+from employee_picker import EmployeePicker
+from payroll import overtime_amount, write_overtime_xlsx, write_overtime_year_xlsx
+from task_runner import run_file_job
 from utils import tl, month_date_range
 
 
@@ -19,13 +25,21 @@ class OvertimeTab(ttk.Frame):
     def __init__(self, master):
         super().__init__(master)
 
-        self.employees_cache = []
+        self.directory = get_employee_directory()
         self.selected_ov_id = None
+        # Listedeki kayıt id -> personel id (seçilen kaydı forma doldurmak için)
+        self.row_employee_ids = {}
         self.show_only_selected_var = tk.IntVar(value=0)
+        self.settings = get_settings()
+        self.bulk_dialog = None
+        # Para görmeyen rolde False (bkz. PatronApp.apply_tab_permissions)
+        self.allow_money = True
 
         self.build_ui()
         self.load_employees()
         self.load_current_month_overtimes()
+        add_settings_listener(self.on_settings_changed)
+        self.directory.subscribe(self.on_employees_changed)
 
     def build_ui(self):
         # Üst: Mesai formu
@@ -35,7 +49,7 @@ class OvertimeTab(ttk.Frame):
         # Personel
         ttk.Label(form_frame, text="Personel:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
         self.ov_emp_var = tk.StringVar()
-        self.ov_emp_combo = ttk.Combobox(form_frame, textvariable=self.ov_emp_var, state="readonly", width=30)
+        self.ov_emp_combo = EmployeePicker(form_frame, self.directory, textvariable=self.ov_emp_var, width=30)
         self.ov_emp_combo.grid(row=0, column=1, padx=5, pady=5)
         self.ov_emp_combo.bind("<<ComboboxSelected>>", self.on_employee_changed)
 
@@ -76,6 +90,7 @@ class OvertimeTab(ttk.Frame):
         ttk.Button(btn_frame, text="Yeni", command=self.clear_form).grid(row=0, column=0, padx=5)
         ttk.Button(btn_frame, text="Kaydet", command=self.save_overtime).grid(row=0, column=1, padx=5)
         ttk.Button(btn_frame, text="Sil", command=self.delete_selected).grid(row=0, column=2, padx=5)
+        ttk.Button(btn_frame, text="Toplu Mesai", command=self.open_bulk_entry).grid(row=0, column=3, padx=10)
 
         # Alt: Mesai listesi
         list_frame = ttk.LabelFrame(self, text="Mesai Kayıtları")
@@ -121,38 +136,41 @@ class OvertimeTab(ttk.Frame):
         self.ov_tree.pack(fill="both", expand=True)
 
         self.ov_tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.ov_grid = DataGrid(self.ov_tree)
 
         # Rapor butonları
         export_frame = ttk.Frame(list_frame)
         export_frame.pack(side="bottom", pady=5)
         ttk.Button(export_frame, text="Excel (Aylık Rapor)", command=self.export_excel).pack(side="left", padx=5)
         ttk.Button(export_frame, text="PDF (Aylık Rapor)", command=self.export_pdf).pack(side="left", padx=5)
+        ttk.Button(export_frame, text="Excel (Yıllık, Ay Ay)", command=self.export_year_excel).pack(side="left", padx=5)
 
     # ------------- Form kontrol ------------- #
 
     def clear_form(self):
         self.selected_ov_id = None
-        if self.ov_emp_combo["values"]:
-            self.ov_emp_combo.current(0)
+        self.ov_emp_combo.reset()
         self.ov_date_entry.set_date(date.today())
         self.ov_hours_var.set("")
         self.ov_desc_var.set("")
 
     def load_employees(self):
-        employees = get_active_employees()
-        self.employees_cache = employees
-        names = [e[1] for e in employees]
-        self.ov_emp_combo["values"] = names
-        if names:
-            self.ov_emp_combo.current(0)
-        else:
-            self.ov_emp_var.set("")
+        self.ov_emp_combo.refresh()
 
-    def refresh_employees(self):
+    def on_employees_changed(self, directory):
+        """Personel dizini değişince (bkz. employee_directory.py) liste yenilenir."""
         self.load_employees()
-        messagebox.showinfo("Bilgi", "Personel listesi güncellendi.")
         self.load_current_month_overtimes()
 
+    def refresh_employees(self):
+        # Abone olduğumuz için liste ve kayıtlar on_employees_changed'de yenilenir
+        self.directory.invalidate()
+        messagebox.showinfo("Bilgi", "Personel listesi güncellendi.")
+
+    def selected_employee(self):
+        """Combobox'ta seçili personel (Employee); seçim yoksa / bulunamazsa None."""
+        return self.ov_emp_combo.selected_employee()
+
     def on_employee_changed(self, event):
         if self.show_only_selected_var.get() == 1:
             self.load_current_month_overtimes()
@@ -160,22 +178,16 @@ class OvertimeTab(ttk.Frame):
     # ------------- Kayıt Kaydet / Sil ------------- #
 
     def save_overtime(self):
-        emp_name = self.ov_emp_var.get()
-        if not emp_name:
+        if not self.ov_emp_var.get():
             messagebox.showerror("Hata", "Lütfen personel seçin.")
             return
 
-        emp_id = None
-        hourly_rate = None
-        for e in self.employees_cache:
-            if e[1] == emp_name:
-                emp_id = e[0]
-                hourly_rate = float(e[2])
-                break
-
-        if emp_id is None:
+        emp = self.selected_employee()
+        if emp is None:
             messagebox.showerror("Hata", "Personel bulunamadı.")
             return
+        emp_id = emp.id
+        hourly_rate = float(emp.hourly_rate)
 
         date_str = self.ov_date_var.get().strip()
         try:
@@ -201,9 +213,7 @@ class OvertimeTab(ttk.Frame):
 
         desc = self.ov_desc_var.get().strip()
 
-        daily_hours, overtime_coef, include_weekends = get_settings()
-        overtime_rate = hourly_rate * float(overtime_coef)
-        total = overtime_rate * hours_val
+        overtime_rate, total = overtime_amount(hours_val, hourly_rate, self.settings)
 
         if self.selected_ov_id is None:
             add_overtime(emp_id, date_str, hours_val, overtime_rate, total, desc)
@@ -215,6 +225,29 @@ class OvertimeTab(ttk.Frame):
         self.clear_form()
         self.load_current_month_overtimes()
 
+    def on_settings_changed(self, settings):
+        self.settings = settings
+        if self.bulk_dialog is not None:
+            self.bulk_dialog.set_settings(settings)
+
+    def hide_money(self):
+        """OFIS rolü: toplu mesai penceresi ücret / maliyet göstermeden kurulur."""
+        self.allow_money = False
+        if self.bulk_dialog is not None:
+            self.bulk_dialog.destroy()
+            self.bulk_dialog = None
+
+    def open_bulk_entry(self):
+        """Çok personele aynı gün / saat mesai (bkz. ui_overtime_bulk.py)."""
+        from ui_overtime_bulk import OvertimeBulkDialog
+
+        if self.bulk_dialog is None:
+            self.bulk_dialog = OvertimeBulkDialog(
+                self, self.directory, self.settings, on_saved=self.refresh_rows,
+                allow_money=self.allow_money,
+            )
+        self.bulk_dialog.show()
+
     def delete_selected(self):
         if self.selected_ov_id is None:
             messagebox.showwarning("Uyarı", "Silmek için listeden bir kayıt seçin.")
@@ -231,9 +264,6 @@ class OvertimeTab(ttk.Frame):
     # ------------- Listeleme (Yıl / Ay) ------------- #
 
     def load_current_month_overtimes(self):
-        for row in self.ov_tree.get_children():
-            self.ov_tree.delete(row)
-
         try:
             year = int(self.ov_year_var.get())
             month = int(self.ov_month_var.get())
@@ -248,43 +278,59 @@ class OvertimeTab(ttk.Frame):
         month_start, month_end = month_date_range(year, month)
 
         emp_filter_id = None
-        if self.show_only_selected_var.get() == 1 and self.ov_emp_var.get():
-            selected_name = self.ov_emp_var.get()
-            for e in self.employees_cache:
-                if e[1] == selected_name:
-                    emp_filter_id = e[0]
-                    break
-
-        conn = get_conn()
-        c = conn.cursor()
-        query = """
-            SELECT o.id, o.date, e.name, o.hours, o.rate, o.total, o.description
-            FROM overtimes o
-            JOIN employees e ON e.id = o.employee_id
-            WHERE o.date >= ? AND o.date < ?
-        """
-        params = [month_start.isoformat(), month_end.isoformat()]
+        if self.show_only_selected_var.get() == 1:
+            emp = self.selected_employee()
+            emp_filter_id = emp.id if emp is not None else None
 
-        if emp_filter_id is not None:
-            query += " AND o.employee_id = ?"
-            params.append(emp_filter_id)
+        # Dışa aktarım, ekranda listelenen filtreyi kullanır
+        self.listed_filter = (year, month, emp_filter_id)
 
-        query += " ORDER BY o.date DESC, e.name"
+        rows = iter_overtime_list(month_start.isoformat(), month_end.isoformat(), emp_filter_id).fetchall()
+        self.row_employee_ids = {row[0]: row[-1] for row in rows}
 
-        c.execute(query, params)
-        rows = c.fetchall()
-        conn.close()
+        self.ov_grid.set_rows(
+            (str(ot_id), (d_str, name, hours, tl(rate), tl(total), desc or ""))
+            for ot_id, d_str, name, hours, rate, total, desc, _ in rows
+        )
 
-        for ot_id, d_str, name, hours, rate, total, desc in rows:
-            self.ov_tree.insert(
-                "",
-                "end",
-                iid=str(ot_id),
-                values=(d_str, name, hours, tl(rate), tl(total), desc or "")
-            )
+    def refresh_rows(self, ot_ids):
+        """Sadece verilen kayıtları listeye ekler / günceller (toplu mesaiden sonra)."""
+        year, month, emp_filter_id = self.listed_filter
+        month_start, month_end = (d.isoformat() for d in month_date_range(year, month))
+        rows = [
+            row for row in get_overtime_list_rows(ot_ids)
+            if month_start <= row[1] < month_end and emp_filter_id in (None, row[-1])
+        ]
+        for row in rows:
+            self.row_employee_ids[row[0]] = row[-1]
+        self.ov_grid.upsert_rows(
+            ((str(ot_id), (d_str, name, hours, tl(rate), tl(total), desc or ""))
+             for ot_id, d_str, name, hours, rate, total, desc, _ in rows),
+            key=date_desc_key,
+        )
 
     # ------------- Satır seçince form doldurma ------------- #
 
+    def show_record(self, record_id, date_str):
+        """Kaydın ayını listeleyip kaydı seçer (global aramadan gelince).
+
+        Kayıt listede yoksa (silinmişse) False döner.
+        """
+        year, month = int(date_str[:4]), int(date_str[5:7])
+        self.ov_year_var.set(str(year))
+        self.ov_month_var.set(str(month))
+        self.show_only_selected_var.set(0)
+        self.load_current_month_overtimes()
+
+        iid = str(record_id)
+        if not self.ov_grid.ensure_loaded(iid):
+            return False
+        self.ov_tree.selection_set(iid)
+        self.ov_tree.focus(iid)
+        self.ov_tree.see(iid)
+        self.on_select(None)
+        return True
+
     def on_select(self, event):
         item_id = self.ov_tree.focus()
         if not item_id:
@@ -294,7 +340,9 @@ class OvertimeTab(ttk.Frame):
         vals = self.ov_tree.item(item_id, "values")
         d_str, emp_name, hours, rate_str, total_str, desc = vals
 
-        self.ov_emp_var.set(emp_name)
+        emp_id = self.row_employee_ids.get(self.selected_ov_id)
+        if not self.ov_emp_combo.set_employee(emp_id):
+            self.ov_emp_var.set(emp_name)
         self.ov_date_var.set(d_str)
         try:
             self.ov_date_entry.set_date(datetime.strptime(d_str, "%Y-%m-%d").date())
@@ -315,12 +363,12 @@ class OvertimeTab(ttk.Frame):
             return ""
 
     def export_excel(self):
-        if not self.ov_tree.get_children():
+        if not len(self.ov_grid):
             messagebox.showwarning("Uyarı", "Liste boş. Önce yıl/ay seçip 'Listele' deyin.")
             return
 
         try:
-            from openpyxl import Workbook
+            import openpyxl  # noqa: F401
         except ImportError:
             messagebox.showerror(
                 "Hata",
@@ -343,39 +391,54 @@ class OvertimeTab(ttk.Frame):
         if not file_path:
             return
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Mesai Raporu"
-
-        headers = [
-            "Tarih",
-            "Personel",
-            "Saat",
-            "Mesai Saatlik Ücret",
-            "Toplam Mesai Ücreti",
-            "Açıklama",
-        ]
-        ws.append(headers)
-
-        for row_id in self.ov_tree.get_children():
-            vals = self.ov_tree.item(row_id)["values"]
-            ws.append(list(vals))
+        # Satırlar arka planda doğrudan DB'den okunur (Treeview'dan değil)
+        year, month, emp_filter_id = self.listed_filter
+        total = len(self.ov_grid)
+        run_file_job(
+            self,
+            "Mesai Excel raporu yazılıyor",
+            lambda task: write_overtime_xlsx(file_path, year, month, emp_filter_id, task, total),
+            f"Mesai Excel raporu oluşturuldu:\n{file_path}",
+            "Excel kaydedilirken hata oluştu:",
+        )
 
+    def export_year_excel(self):
+        """Listelenen yılın mesailerini her ay ayrı sayfada olacak şekilde yazar."""
         try:
-            wb.save(file_path)
-            messagebox.showinfo("Başarılı", f"Mesai Excel raporu oluşturuldu:\n{file_path}")
-        except Exception as e:
-            messagebox.showerror("Hata", f"Excel kaydedilirken hata oluştu:\n{e}")
+            import openpyxl  # noqa: F401
+        except ImportError:
+            messagebox.showerror(
+                "Hata",
+                "Excel dışa aktarım için 'openpyxl' kütüphanesi gerekiyor.\n\n"
+                "Kurulum örneği:\n\npip install openpyxl"
+            )
+            return
+
+        year, _, emp_filter_id = self.listed_filter
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel Dosyası", "*.xlsx")],
+            initialfile=f"mesai_rapor_{year}.xlsx",
+            title="Yıllık Mesai Raporunu Kaydet"
+        )
+        if not file_path:
+            return
+
+        run_file_job(
+            self,
+            f"Yıllık mesai raporu yazılıyor ({year})",
+            lambda task: write_overtime_year_xlsx(file_path, year, emp_filter_id, task),
+            f"Yıllık mesai raporu oluşturuldu:\n{file_path}",
+            "Excel kaydedilirken hata oluştu:",
+        )
 
     def export_pdf(self):
-        if not self.ov_tree.get_children():
+        if not len(self.ov_grid):
             messagebox.showwarning("Uyarı", "Liste boş. Önce yıl/ay seçip 'Listele' deyin.")
             return
 
         try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.units import mm
+            import reportlab  # noqa: F401
         except ImportError:
             messagebox.showerror(
                 "Hata",
@@ -398,49 +461,17 @@ class OvertimeTab(ttk.Frame):
         if not file_path:
             return
 
-        c = canvas.Canvas(file_path, pagesize=A4)
-        width, height = A4
-
-        left_margin = 15 * mm
-        top_margin = height - 25 * mm
-        line_height = 6 * mm
+        rows = self.ov_grid.all_values()
+        run_file_job(
+            self,
+            "Mesai PDF raporu yazılıyor",
+            lambda task: self._write_pdf(task, file_path, rows, period),
+            f"Mesai PDF raporu oluşturuldu:\n{file_path}",
+            "PDF oluşturulurken hata oluştu:",
+        )
 
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(left_margin, top_margin, "Mesai Hareketleri Raporu")
+    @staticmethod
+    def _write_pdf(task, file_path, rows, period):
+        from pdf_reports import write_overtime_pdf
 
-        if period:
-            c.setFont("Helvetica", 11)
-            c.drawString(left_margin, top_margin - line_height, f"Dönem: {period}")
-
-        y = top_margin - 3 * line_height
-        c.setFont("Helvetica-Bold", 8)
-        header_text = "Tarih | Personel | Saat | Saatlik Ücret | Toplam | Açıklama"
-        c.drawString(left_margin, y, header_text)
-        y -= line_height
-        c.line(left_margin, y + 2, width - left_margin, y + 2)
-        y -= line_height
-
-        c.setFont("Helvetica", 7)
-
-        for row_id in self.ov_tree.get_children():
-            vals = self.ov_tree.item(row_id)["values"]
-            row_text = " | ".join(str(v) for v in vals)
-
-            if y < 20 * mm:
-                c.showPage()
-                y = top_margin
-                c.setFont("Helvetica-Bold", 8)
-                c.drawString(left_margin, y, header_text)
-                y -= line_height
-                c.line(left_margin, y + 2, width - left_margin, y + 2)
-                y -= line_height
-                c.setFont("Helvetica", 7)
-
-            c.drawString(left_margin, y, row_text)
-            y -= line_height
-
-        try:
-            c.save()
-            messagebox.showinfo("Başarılı", f"Mesai PDF raporu oluşturuldu:\n{file_path}")
-        except Exception as e:
-            messagebox.showerror("Hata", f"PDF oluşturulurken hata oluştu:\n{e}")
+        write_overtime_pdf(file_path, iter(rows), period, task=task, total=len(rows))
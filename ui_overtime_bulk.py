@@ -0,0 +1,264 @@
+"""Toplu mesai girişi: aynı gün aynı saat mesai yapan personel tek seferde.
+
+Bütün vardiya (ör. 60 kişi x 3 saat) için formu 60 kez doldurmak yerine
+personel işaretlenir, tarih ve saat bir kez girilir:
+- Ücretler ayarlar bir kez okunarak tek geçişte hesaplanır
+  (payroll.prepare_overtime_batch); her değişiklikte satırların mesai
+  ücreti ve toplam maliyet önizlenir.
+- Kaydet, toplam maliyeti onaylattıktan sonra tüm satırları tek
+  transaction'da yazar (payroll.post_overtime_batch) ve OvertimeTab
+  listesine sadece yeni kayıtları ekletir (on_saved(yeni id'ler)).
+
+Satıra tıklamak / boşluk tuşu işareti değiştirir; "Listedekileri seç"
+arama kutusuyla daraltılmış listenin tamamını işaretler.
+
+allow_money=False (OFIS rolü): ücret sütunları gizlenir, satırlara tutar
+yazılmaz; önizleme ve onay metninde maliyet yer almaz.
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import date, datetime
+
+from tkcalendar import DateEntry
+
+from data_grid import DataGrid
+from payroll import post_overtime_batch, prepare_overtime_batch
+from utils import tl
+
+CHECK_MARK = "✓"
+
+# Para görmeyen rolde gizlenen sütunlar
+MONEY_COLUMNS = ("hourly", "rate", "total")
+
+
+class OvertimeBulkDialog(tk.Toplevel):
+    def __init__(self, master, directory, settings, on_saved, allow_money=True):
+        super().__init__(master)
+        self.title("Toplu Mesai Girişi")
+        self.geometry("760x560")
+        self.transient(master.winfo_toplevel())
+
+        self.directory = directory
+        self.settings = settings
+        self.on_saved = on_saved
+        self.allow_money = allow_money
+
+        self.chosen = set()   # işaretli personel id'leri
+        self.batch = None     # son önizleme (OvertimeBatch); saat geçersizse None
+
+        self.build_ui()
+        self.directory.subscribe(self.on_employees_changed)
+        self.bind("<Escape>", lambda e: self.withdraw())
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+        self.load_rows()
+
+    # ------------- ARAYÜZ ------------- #
+
+    def build_ui(self):
+        form = ttk.Frame(self)
+        form.pack(fill="x", padx=10, pady=(10, 5))
+
+        ttk.Label(form, text="Tarih:").pack(side="left")
+        self.date_var = tk.StringVar()
+        self.date_entry = DateEntry(form, textvariable=self.date_var, date_pattern="yyyy-mm-dd", width=12)
+        self.date_entry.set_date(date.today())
+        self.date_entry.pack(side="left", padx=(0, 10))
+
+        ttk.Label(form, text="Mesai Saati:").pack(side="left")
+        self.hours_var = tk.StringVar()
+        hours_entry = ttk.Entry(form, textvariable=self.hours_var, width=6)
+        hours_entry.pack(side="left", padx=(0, 10))
+        hours_entry.bind("<KeyRelease>", lambda e: self.update_preview())
+
+        ttk.Label(form, text="Açıklama:").pack(side="left")
+        self.desc_var = tk.StringVar()
+        ttk.Entry(form, textvariable=self.desc_var, width=30).pack(side="left")
+
+        select = ttk.Frame(self)
+        select.pack(fill="x", padx=10, pady=5)
+
+        ttk.Label(select, text="Personel ara:").pack(side="left")
+        self.filter_var = tk.StringVar()
+        filter_entry = ttk.Entry(select, textvariable=self.filter_var, width=20)
+        filter_entry.pack(side="left", padx=5)
+        filter_entry.bind("<KeyRelease>", lambda e: self.load_rows())
+        ttk.Button(select, text="Listedekileri seç", command=self.choose_listed).pack(side="left", padx=5)
+        ttk.Button(select, text="Seçimi temizle", command=self.clear_chosen).pack(side="left")
+
+        list_frame = ttk.Frame(self)
+        list_frame.pack(fill="both", expand=True, padx=10)
+
+        columns = ("chosen", "employee", "hourly", "rate", "total")
+        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings", selectmode="browse")
+        self.tree.heading("chosen", text=CHECK_MARK)
+        self.tree.heading("employee", text="Personel")
+        self.tree.heading("hourly", text="Saatlik Ücret")
+        self.tree.heading("rate", text="Mesai Saatlik Ücret")
+        self.tree.heading("total", text="Mesai Ücreti")
+        self.tree.column("chosen", width=30, anchor="center", stretch=False)
+        self.tree.column("employee", width=220)
+        self.tree.column("hourly", width=110, anchor="e")
+        self.tree.column("rate", width=140, anchor="e")
+        self.tree.column("total", width=140, anchor="e")
+        if not self.allow_money:
+            for col in MONEY_COLUMNS:
+                self.tree.column(col, width=0, stretch=False)
+                self.tree.heading(col, text="")
+
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.pack(fill="both", expand=True)
+        self.grid_rows = DataGrid(self.tree, scrollbar=scrollbar)
+
+        self.tree.bind("<ButtonRelease-1>", self.on_click)
+        self.tree.bind("<space>", lambda e: self.toggle(self.tree.focus()))
+
+        bottom = ttk.Frame(self)
+        bottom.pack(fill="x", padx=10, pady=10)
+        self.preview_var = tk.StringVar(value="")
+        ttk.Label(bottom, textvariable=self.preview_var, font=("Segoe UI", 10, "bold"))\
+            .pack(side="left")
+        ttk.Button(bottom, text="Kaydet", command=self.save).pack(side="right")
+
+    def show(self):
+        self.deiconify()
+        self.lift()
+
+    def destroy(self):
+        self.directory.unsubscribe(self.on_employees_changed)
+        super().destroy()
+
+    def set_settings(self, settings):
+        """Ayarlar değişince (mesai katsayısı) önizleme yeniden hesaplanır."""
+        self.settings = settings
+        self.update_preview()
+
+    # ------------- LİSTE / SEÇİM ------------- #
+
+    def load_rows(self):
+        """Aktif personeli (arama kutusuna göre daraltılmış) listeler."""
+        labels = self.directory.search(self.filter_var.get(), limit=len(self.directory.active()))
+        employees = (self.directory.resolve(label) for label in labels)
+        self.grid_rows.set_rows(
+            (str(emp.id), self.row_values(emp)) for emp in employees if emp is not None
+        )
+
+    def on_employees_changed(self, directory):
+        # Pasife alınan / silinen personel seçimden çıkar
+        active = {emp.id for emp in directory.active()}
+        self.chosen &= active
+        self.load_rows()
+        self.update_preview()
+
+    def row_values(self, emp, amounts=None):
+        label = self.directory.label(emp.id)
+        if not self.allow_money:
+            return (CHECK_MARK if emp.id in self.chosen else ""), label, "", "", ""
+        if emp.id not in self.chosen:
+            return "", label, tl(emp.hourly_rate or 0), "", ""
+        if amounts is None:
+            return CHECK_MARK, label, tl(emp.hourly_rate or 0), "", ""
+        rate, total = amounts
+        return CHECK_MARK, label, tl(emp.hourly_rate or 0), tl(rate), tl(total)
+
+    def on_click(self, event):
+        if self.tree.identify_region(event.x, event.y) == "cell":
+            self.toggle(self.tree.identify_row(event.y))
+
+    def toggle(self, iid):
+        if not iid:
+            return
+        emp_id = int(iid)
+        if emp_id in self.chosen:
+            self.chosen.discard(emp_id)
+        else:
+            self.chosen.add(emp_id)
+        self.update_preview(changed={emp_id})
+
+    def choose_listed(self):
+        added = {int(iid) for iid, _ in self.grid_rows.rows} - self.chosen
+        self.chosen |= added
+        self.update_preview(changed=added)
+
+    def clear_chosen(self):
+        removed, self.chosen = self.chosen, set()
+        self.update_preview(changed=removed)
+
+    # ------------- ÖNİZLEME / KAYDET ------------- #
+
+    def read_hours(self):
+        try:
+            hours = float(self.hours_var.get().strip().replace(",", "."))
+        except ValueError:
+            return None
+        return hours if hours > 0 else None
+
+    def update_preview(self, changed=None):
+        """Seçili personelin ücretlerini tek geçişte hesaplar ve toplamı gösterir.
+
+        changed verilirse sadece o personelin satırları güncellenir;
+        verilmezse (saat / ayar değişince) tüm seçili satırlar.
+        """
+        employees = [emp for emp in map(self.directory.get, sorted(self.chosen)) if emp is not None]
+        hours = self.read_hours()
+        self.batch = None
+        amounts = {}
+        if hours is not None and employees:
+            self.batch = prepare_overtime_batch(employees, self.date_var.get().strip(), hours, self.settings)
+            amounts = {emp_id: (rate, total) for emp_id, _, _, rate, total in self.batch.rows}
+
+        if changed is None:
+            changed = self.chosen
+        rows = []
+        for emp_id in changed:
+            emp = self.directory.get(emp_id)
+            if emp is not None and self.grid_rows.values(str(emp_id)) is not None:
+                rows.append((str(emp_id), self.row_values(emp, amounts.get(emp_id))))
+        self.grid_rows.upsert_rows(rows)
+
+        if self.batch is not None and not self.allow_money:
+            self.preview_var.set(f"{len(self.batch)} personel x {hours:g} saat")
+        elif self.batch is not None:
+            self.preview_var.set(
+                f"{len(self.batch)} personel x {hours:g} saat  –  toplam maliyet: {tl(self.batch.total)}"
+            )
+        elif self.chosen:
+            self.preview_var.set(f"{len(self.chosen)} personel seçili  –  mesai saatini girin")
+        else:
+            self.preview_var.set("")
+
+    def save(self):
+        date_str = self.date_var.get().strip()
+        try:
+            datetime.strptime(date_str, "%Y-%m-%d")
+        except ValueError:
+            messagebox.showerror("Hata", "Tarih formatı geçersiz.", parent=self)
+            return
+        if not self.chosen:
+            messagebox.showerror("Hata", "Lütfen personel seçin.", parent=self)
+            return
+        if self.read_hours() is None:
+            messagebox.showerror("Hata", "Mesai saati 0'dan büyük bir sayı olmalıdır.", parent=self)
+            return
+
+        # Önizleme tarih değişikliğini izlemez; onaydan önce güncel değerlerle hesaplanır
+        self.update_preview()
+        batch = self.batch
+        question = f"{date_str} tarihine {len(batch)} personel için {batch.hours:g} saat mesai yazılacak.\n\n"
+        if self.allow_money:
+            question += f"Toplam maliyet: {tl(batch.total)}\n\n"
+        if not messagebox.askyesno("Toplu Mesai", question + "Kaydedilsin mi?", parent=self):
+            return
+
+        try:
+            new_ids = post_overtime_batch(batch, self.desc_var.get().strip())
+        except Exception as e:
+            messagebox.showerror("Hata", f"Mesailer yazılamadı (hiçbiri kaydedilmedi):\n{e}", parent=self)
+            return
+
+        self.clear_chosen()
+        if self.allow_money:
+            self.preview_var.set(f"{len(new_ids)} mesai kaydedildi  –  toplam: {tl(batch.total)}")
+        else:
+            self.preview_var.set(f"{len(new_ids)} mesai kaydedildi")
+        self.on_saved(new_ids)
@@ -1,14 +1,18 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from datetime import date, datetime, timedelta
+from datetime import date
 
-from db import get_conn, get_settings
-from utils import month_date_range, tl
-
-MONTH_NAMES_TR = [
-    "Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
-    "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"
-]
+from data_grid import DataGrid
+from db import add_settings_listener, get_settings
+from employee_directory import get_employee_directory
+from payroll import (
+    calculate_year_performance,
+    performance_totals,
+    write_company_performance_xlsx,
+    write_performance_xlsx,
+)
+from task_runner import get_task_runner, run_file_job
+from utils import tl
 
 
 class PerformanceTab(ttk.Frame):
@@ -30,10 +34,15 @@ class PerformanceTab(ttk.Frame):
         super().__init__(master)
         self.selected_employee_id = None
         self.employees = {}  # id -> {"name", "hourly_rate", "start_date"}
+        self.directory = get_employee_directory()
         self.rows = []       # Dışa aktarım için satırlar
+        self.perf_task = None
+        self.settings = get_settings()
 
         self.build_ui()
         self.load_employees()
+        add_settings_listener(self.on_settings_changed)
+        self.directory.subscribe(self.on_employees_changed)
 
     # -------------------------------------------------
     #   UI
@@ -58,6 +67,7 @@ class PerformanceTab(ttk.Frame):
 
         self.emp_tree.pack(fill="both", expand=True)
         self.emp_tree.bind("<<TreeviewSelect>>", self.on_employee_select)
+        self.emp_grid = DataGrid(self.emp_tree)
 
         # Sağ taraf: filtre + performans tablosu
         right_frame = ttk.Frame(main_pane)
@@ -128,43 +138,35 @@ class PerformanceTab(ttk.Frame):
             .pack(side="left", padx=5)
         ttk.Button(export_frame, text="PDF'e Aktar", command=self.export_pdf)\
             .pack(side="left", padx=5)
+        ttk.Button(export_frame, text="Tüm Personel (Yıllık Excel)", command=self.export_company_excel)\
+            .pack(side="right", padx=5)
 
     # -------------------------------------------------
     #   Personel listesi
     # -------------------------------------------------
     def load_employees(self):
-        """Sol taraftaki personel listesini doldurur."""
-        for row in self.emp_tree.get_children():
-            self.emp_tree.delete(row)
+        """Sol taraftaki personel listesini ortak personel dizininden doldurur."""
         self.employees.clear()
+        grid_rows = []
 
-        conn = get_conn()
-        c = conn.cursor()
         try:
-            # active kolonu olsa da olmasa da çalışsın diye sadece temel alanlar
-            c.execute("""
-                SELECT id, name, hourly_rate, start_date
-                FROM employees
-                ORDER BY name
-            """)
-            for emp_id, name, hourly_rate, start_date in c.fetchall():
-                hourly_rate = float(hourly_rate or 0)
-                self.employees[emp_id] = {
-                    "name": name,
+            for emp in sorted(self.directory.all(), key=lambda e: e.name):
+                hourly_rate = float(emp.hourly_rate or 0)
+                self.employees[emp.id] = {
+                    "name": emp.name,
                     "hourly_rate": hourly_rate,
-                    "start_date": start_date,
+                    "start_date": emp.start_date,
                 }
                 # iid'yi emp_id yapıyoruz ki selection'dan ID'yi direkt alabilelim
-                self.emp_tree.insert(
-                    "",
-                    "end",
-                    iid=str(emp_id),
-                    values=(name, tl(hourly_rate)),
-                )
+                grid_rows.append((str(emp.id), (emp.name, tl(hourly_rate))))
         except Exception as e:
             messagebox.showerror("Hata", f"Personel listesi okunurken hata oluştu:\n{e}")
-        finally:
-            conn.close()
+
+        self.emp_grid.set_rows(grid_rows)
+
+    def on_employees_changed(self, directory):
+        """Personel dizini değişince (bkz. employee_directory.py) liste yenilenir."""
+        self.load_employees()
 
     def on_employee_select(self, event=None):
         selected = self.emp_tree.selection()
@@ -203,167 +205,58 @@ class PerformanceTab(ttk.Frame):
         self.load_performance_for_employee(self.selected_employee_id, emp, year)
 
     def load_performance_for_employee(self, emp_id: int, emp: dict, year: int):
+        # Önceki personel/yıl hesaplaması sürüyorsa iptal et
+        if self.perf_task is not None:
+            self.perf_task.cancel()
+
+        self.info_label.config(
+            text=f"Hesaplanıyor… Personel: {emp['name']} · Yıl: {year}",
+            foreground="gray",
+        )
+        settings = self.settings
+        self.perf_task = get_task_runner(self).submit(
+            lambda task: calculate_year_performance(emp_id, year, settings),
+            description=f"Performans hesaplanıyor ({emp['name']}, {year})",
+            on_done=lambda rows: self.show_performance(emp, year, rows),
+            on_error=lambda e: messagebox.showerror("Hata", f"Performans hesaplanırken hata oluştu:\n{e}"),
+        )
+
+    def on_settings_changed(self, settings):
+        """Ayarlar kaydedilince çağrılır; tablo doluysa yeni ayarlarla yenilenir."""
+        self.settings = settings
+        if self.rows:
+            self.refresh_performance()
+
+    def show_performance(self, emp: dict, year: int, rows: list):
+        self.perf_task = None
+
         # Listeyi temizle
-        for row in self.perf_tree.get_children():
-            self.perf_tree.delete(row)
-        self.rows.clear()
-
-        daily_hours, overtime_coef, include_weekends = get_settings()
-
-        start_date_str = emp.get("start_date")
-        start_date_val = None
-        if start_date_str:
-            try:
-                start_date_val = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-            except Exception:
-                start_date_val = None
-
-        today = date.today()
-
-        totals = {
-            "work_days": 0,
-            "theoretical_hours": 0.0,
-            "missing_hours": 0.0,
-            "total_hours": 0.0,
-            "overtime_hours": 0.0,
-            "overtime_total": 0.0,
-            "advance_total": 0.0,
-            "net_salary": 0.0,
-        }
-
-        conn = get_conn()
-        c = conn.cursor()
+        children = self.perf_tree.get_children()
+        if children:
+            self.perf_tree.delete(*children)
+        self.rows = rows
 
-        try:
-            for month in range(1, 12 + 1):
-                month_start, month_end = month_date_range(year, month)
-                last_day = month_end - timedelta(days=1)
-
-                # Gelecek ayları gösterme
-                if year == today.year and month > today.month:
-                    continue
-
-                # Personel bu aydan sonra başladıysa, bu ayı atla
-                if start_date_val is not None and start_date_val > last_day:
-                    continue
-
-                # Çalışma günlerini say
-                period_start = month_start
-                if start_date_val:
-                    period_start = max(period_start, start_date_val)
-
-                effective_last_day = last_day
-                if year == today.year and month == today.month and today < effective_last_day:
-                    effective_last_day = today
-
-                if period_start > effective_last_day:
-                    continue
-
-                d = period_start
-                work_days = 0
-                while d <= effective_last_day:
-                    if include_weekends or d.weekday() < 5:
-                        work_days += 1
-                    d += timedelta(days=1)
-
-                theoretical_hours = work_days * daily_hours
-
-                # Devamsızlık (eksik saat) – attendance_logs'tan okunuyor
-                c.execute("""
-                    SELECT COALESCE(SUM(hours), 0)
-                    FROM attendance_logs
-                    WHERE employee_id = ?
-                      AND date >= ? AND date < ?
-                """, (emp_id, month_start.isoformat(), month_end.isoformat()))
-                row = c.fetchone()
-                missing_hours = float(row[0] or 0)
-
-                total_hours = max(theoretical_hours - missing_hours, 0.0)
-
-                hourly_rate = emp.get("hourly_rate", 0.0)
-                base_salary = total_hours * float(hourly_rate)
-
-                # Mesai – saat ve tutar
-                c.execute("""
-                    SELECT COALESCE(SUM(hours), 0), COALESCE(SUM(total), 0)
-                    FROM overtimes
-                    WHERE employee_id = ?
-                      AND date >= ? AND date < ?
-                """, (emp_id, month_start.isoformat(), month_end.isoformat()))
-                o_row = c.fetchone()
-                overtime_hours = float(o_row[0] or 0)
-                overtime_total = float(o_row[1] or 0)
-
-                # Avans toplamı
-                c.execute("""
-                    SELECT COALESCE(SUM(amount), 0)
-                    FROM advances
-                    WHERE employee_id = ?
-                      AND date >= ? AND date < ?
-                """, (emp_id, month_start.isoformat(), month_end.isoformat()))
-                a_row = c.fetchone()
-                advance_total = float(a_row[0] or 0)
-
-                net_salary = base_salary + overtime_total - advance_total
-
-                # Hiç hareket yoksa satır ekleme (çok boş ayı gizle)
-                if (
-                    theoretical_hours == 0
-                    and missing_hours == 0
-                    and overtime_total == 0
-                    and advance_total == 0
-                ):
-                    continue
-
-                month_name = MONTH_NAMES_TR[month - 1]
-
-                # Treeview satırı
-                self.perf_tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        f"{month:02d} - {month_name}",
-                        work_days,
-                        f"{theoretical_hours:.2f}",
-                        f"{missing_hours:.2f}",
-                        f"{total_hours:.2f}",
-                        f"{overtime_hours:.2f}",
-                        tl(overtime_total),
-                        tl(advance_total),
-                        tl(net_salary),
-                    ),
-                )
-
-                # Dışa aktarım için sakla
-                self.rows.append({
-                    "year": year,
-                    "month": month,
-                    "month_name": month_name,
-                    "work_days": work_days,
-                    "theoretical_hours": theoretical_hours,
-                    "missing_hours": missing_hours,
-                    "total_hours": total_hours,
-                    "overtime_hours": overtime_hours,
-                    "overtime_total": overtime_total,
-                    "advance_total": advance_total,
-                    "net_salary": net_salary,
-                })
-
-                # Toplamlara ekle
-                totals["work_days"] += work_days
-                totals["theoretical_hours"] += theoretical_hours
-                totals["missing_hours"] += missing_hours
-                totals["total_hours"] += total_hours
-                totals["overtime_hours"] += overtime_hours
-                totals["overtime_total"] += overtime_total
-                totals["advance_total"] += advance_total
-                totals["net_salary"] += net_salary
-
-        finally:
-            conn.close()
+        for r in rows:
+            # Treeview satırı
+            self.perf_tree.insert(
+                "",
+                "end",
+                values=(
+                    f"{r['month']:02d} - {r['month_name']}",
+                    r["work_days"],
+                    f"{r['theoretical_hours']:.2f}",
+                    f"{r['missing_hours']:.2f}",
+                    f"{r['total_hours']:.2f}",
+                    f"{r['overtime_hours']:.2f}",
+                    tl(r["overtime_total"]),
+                    tl(r["advance_total"]),
+                    tl(r["net_salary"]),
+                ),
+            )
 
         # TOPLAM satırı
         if self.rows:
+            totals = performance_totals(rows)
             self.perf_tree.insert(
                 "",
                 "end",
@@ -398,7 +291,7 @@ class PerformanceTab(ttk.Frame):
         year = self.year_var.get()
 
         try:
-            from openpyxl import Workbook
+            import openpyxl  # noqa: F401
         except ImportError:
             messagebox.showerror(
                 "Hata",
@@ -415,37 +308,51 @@ class PerformanceTab(ttk.Frame):
         if not file_path:
             return
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Performans"
-
-        headers = [
-            "Yıl", "Ay", "Personel",
-            "Çalışma Günü", "Teorik Saat", "Devamsızlık Saat", "Toplam Saat",
-            "Mesai Saat", "Mesai Tutarı", "Avans Toplamı", "Net Maaş",
-        ]
-        ws.append(headers)
-
-        for r in self.rows:
-            ws.append([
-                r["year"],
-                r["month_name"],
-                emp_name,
-                r["work_days"],
-                r["theoretical_hours"],
-                r["missing_hours"],
-                r["total_hours"],
-                r["overtime_hours"],
-                r["overtime_total"],
-                r["advance_total"],
-                r["net_salary"],
-            ])
+        rows = list(self.rows)
+        run_file_job(
+            self,
+            "Performans Excel raporu yazılıyor",
+            lambda task: write_performance_xlsx(file_path, rows, emp_name, task=task),
+            f"Excel performans raporu oluşturuldu:\n{file_path}",
+            "Excel kaydedilirken hata oluştu:",
+        )
 
+    def export_company_excel(self):
+        """Tüm personelin seçilen yıldaki aylık performansını tek dosyaya yazar."""
         try:
-            wb.save(file_path)
-            messagebox.showinfo("Başarılı", f"Excel performans raporu oluşturuldu:\n{file_path}")
-        except Exception as e:
-            messagebox.showerror("Hata", f"Excel kaydedilirken hata oluştu:\n{e}")
+            year = int(self.year_var.get())
+            if year < 2000 or year > 2100:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Hata", "Geçerli bir yıl girin (örn. 2025).")
+            return
+
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            messagebox.showerror(
+                "Hata",
+                "Excel dışa aktarım için 'openpyxl' gerekli.\n\npip install openpyxl",
+            )
+            return
+
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel Dosyası", "*.xlsx")],
+            initialfile=f"performans_tum_personel_{year}.xlsx",
+            title="Yıllık Performans Raporu (Excel) Kaydet",
+        )
+        if not file_path:
+            return
+
+        settings = self.settings
+        run_file_job(
+            self,
+            f"Yıllık performans raporu yazılıyor ({year})",
+            lambda task: write_company_performance_xlsx(file_path, year, settings, task=task),
+            f"Yıllık performans raporu oluşturuldu:\n{file_path}",
+            "Excel kaydedilirken hata oluştu:",
+        )
 
     # -------------------------------------------------
     #   Dışa aktarım – PDF
@@ -460,9 +367,7 @@ class PerformanceTab(ttk.Frame):
         year = self.year_var.get()
 
         try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.units import mm
+            import reportlab  # noqa: F401
         except ImportError:
             messagebox.showerror(
                 "Hata",
@@ -479,54 +384,17 @@ class PerformanceTab(ttk.Frame):
         if not file_path:
             return
 
-        c_pdf = canvas.Canvas(file_path, pagesize=A4)
-        width, height = A4
-
-        left_margin = 15 * mm
-        top_margin = height - 25 * mm
-        line_height = 6 * mm
-
-        c_pdf.setFont("Helvetica-Bold", 14)
-        c_pdf.drawString(left_margin, top_margin, "Personel Performans Raporu")
-
-        c_pdf.setFont("Helvetica", 11)
-        c_pdf.drawString(left_margin, top_margin - line_height, f"Personel: {emp_name}")
-        c_pdf.drawString(left_margin, top_margin - 2 * line_height, f"Yıl: {year}")
-
-        y_pos = top_margin - 4 * line_height
-
-        c_pdf.setFont("Helvetica-Bold", 8)
-        header_text = "Ay | Gun | Teorik | Devamsizlik | Toplam | Mesai Saat | Mesai | Avans | Net"
-        c_pdf.drawString(left_margin, y_pos, header_text)
-        y_pos -= line_height
-        c_pdf.line(left_margin, y_pos + 2, width - left_margin, y_pos + 2)
-        y_pos -= line_height
-
-        c_pdf.setFont("Helvetica", 7)
-
-        for r in self.rows:
-            row_text = (
-                f"{r['month_name']} | {r['work_days']} | "
-                f"{r['theoretical_hours']:.1f} | {r['missing_hours']:.1f} | {r['total_hours']:.1f} | "
-                f"{r['overtime_hours']:.1f} | {tl(r['overtime_total'])} | "
-                f"{tl(r['advance_total'])} | {tl(r['net_salary'])}"
-            )
-
-            if y_pos < 20 * mm:
-                c_pdf.showPage()
-                y_pos = top_margin
-                c_pdf.setFont("Helvetica-Bold", 8)
-                c_pdf.drawString(left_margin, y_pos, header_text)
-                y_pos -= line_height
-                c_pdf.line(left_margin, y_pos + 2, width - left_margin, y_pos + 2)
-                y_pos -= line_height
-                c_pdf.setFont("Helvetica", 7)
+        rows = list(self.rows)
+        run_file_job(
+            self,
+            "Performans PDF raporu yazılıyor",
+            lambda task: self._write_pdf(task, file_path, rows, emp_name, year),
+            f"PDF performans raporu oluşturuldu:\n{file_path}",
+            "PDF oluşturulurken hata oluştu:",
+        )
 
-            c_pdf.drawString(left_margin, y_pos, row_text)
-            y_pos -= line_height
+    @staticmethod
+    def _write_pdf(task, file_path, rows, emp_name, year):
+        from pdf_reports import write_performance_pdf
 
-        try:
-            c_pdf.save()
-            messagebox.showinfo("Başarılı", f"PDF performans raporu oluşturuldu:\n{file_path}")
-        except Exception as e:
-            messagebox.showerror("Hata", f"PDF oluşturulurken hata oluştu:\n{e}")
+        write_performance_pdf(file_path, iter(rows), emp_name, year, task=task)
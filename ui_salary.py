@@ -1,9 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from datetime import date, datetime, timedelta
-
-from db import get_conn, get_settings
-from utils import month_date_range, tl
+from datetime import date
+
+from data_grid import DataGrid
+from db import add_settings_listener, get_settings
+from payroll import (
+    close_period,
+    monthly_payroll,
+    recompute_period,
+    reopen_period,
+    write_payroll_csv,
+    write_payroll_xlsx,
+)
+from task_runner import get_task_runner, run_file_job
+from utils import tl
 
 
 class SalaryTab(ttk.Frame):
@@ -12,8 +22,15 @@ class SalaryTab(ttk.Frame):
 
         # Dışa aktarım için son hesaplanan satırları tutuyoruz
         self.last_rows = []
+        self.calc_task = None
+        # Ekranda gösterilen bordro (MonthlyPayroll); dönem kapanışı için
+        self.shown = None
+        self.settings = get_settings()
+        # Dönemi kapat / aç / yeniden hesapla sadece patronda (bkz. lock_period_actions)
+        self.allow_period_actions = True
 
         self.build_ui()
+        add_settings_listener(self.on_settings_changed)
 
     # -------------------------------------------------
     #   UI
@@ -35,6 +52,21 @@ class SalaryTab(ttk.Frame):
 
         ttk.Button(top_frame, text="Hesapla", command=self.calculate_salaries)\
             .grid(row=0, column=4, padx=10, pady=5)
+        ttk.Button(top_frame, text="Toplu Bordro (Ay Aralığı)", command=self.export_batch)\
+            .grid(row=0, column=5, padx=5, pady=5)
+
+        # Dönem kapanışı
+        self.close_btn = ttk.Button(top_frame, text="Dönemi Kapat", command=self.close_period)
+        self.close_btn.grid(row=0, column=6, padx=(15, 5), pady=5)
+        self.reopen_btn = ttk.Button(top_frame, text="Dönemi Yeniden Aç", command=self.reopen_period)
+        self.reopen_btn.grid(row=0, column=7, padx=5, pady=5)
+        self.recompute_btn = ttk.Button(top_frame, text="Yeniden Hesapla", command=self.recompute_period)
+        self.recompute_btn.grid(row=0, column=8, padx=5, pady=5)
+
+        self.period_status_var = tk.StringVar(value="")
+        self.period_status_label = ttk.Label(top_frame, textvariable=self.period_status_var)
+        self.period_status_label.grid(row=1, column=0, columnspan=9, padx=5, pady=(0, 5), sticky="w")
+        self._update_period_controls()
 
         # Liste
         list_frame = ttk.LabelFrame(self, text="Aylık Maaş, Avans ve Mesai Özeti")
@@ -74,6 +106,7 @@ class SalaryTab(ttk.Frame):
         self.tree.column("net_salary", width=110, anchor="e")
 
         self.tree.pack(fill="both", expand=True)
+        self.salary_grid = DataGrid(self.tree)
 
         # Kasa özeti
         summary_frame = ttk.LabelFrame(self, text="Kasa Özeti (Seçilen Ay)")
@@ -118,13 +151,8 @@ class SalaryTab(ttk.Frame):
     # -------------------------------------------------
     #   Hesaplama
     # -------------------------------------------------
-    def calculate_salaries(self):
-        # Listeyi temizle
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        self.last_rows = []
-
-        # Yıl / ay oku
+    def _read_period(self):
+        """Formdaki (yıl, ay); geçersizse hata gösterir ve None döner."""
         try:
             year = int(self.year_var.get())
             month = int(self.month_var.get())
@@ -132,199 +160,253 @@ class SalaryTab(ttk.Frame):
                 raise ValueError
         except ValueError:
             messagebox.showerror("Hata", "Yıl / Ay değerleri geçersiz.")
-            return
-
-        month_start, month_end = month_date_range(year, month)
-        daily_hours, overtime_coef, include_weekends = get_settings()
-
-        conn = get_conn()
-        c = conn.cursor()
-
-        # Gerekli tablolar yoksa oluştur (varsa dokunmaz)
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS attendance (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                employee_id INTEGER NOT NULL,
-                date TEXT NOT NULL,
-                type TEXT NOT NULL,
-                hours REAL NOT NULL,
-                note TEXT,
-                FOREIGN KEY(employee_id) REFERENCES employees(id)
-            )
-        """)
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS advances (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                employee_id INTEGER NOT NULL,
-                date TEXT NOT NULL,
-                amount REAL NOT NULL,
-                installments INTEGER DEFAULT 1,
-                remaining REAL DEFAULT 0,
-                description TEXT,
-                FOREIGN KEY(employee_id) REFERENCES employees(id)
-            )
-        """)
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS overtimes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                employee_id INTEGER NOT NULL,
-                date TEXT NOT NULL,
-                hours REAL NOT NULL,
-                hourly_rate REAL NOT NULL,
-                total REAL NOT NULL,
-                note TEXT,
-                FOREIGN KEY(employee_id) REFERENCES employees(id)
-            )
-        """)
+            return None
+        return year, month
 
-        # Aktif personel listesi (active kolonu yok, hepsini alıyoruz)
-        c.execute("""
-            SELECT id, name, hourly_rate, start_date
-            FROM employees
-            ORDER BY name
-        """)
-        employees = c.fetchall()
-
-        total_salary_sum = 0.0
-        total_overtime_sum = 0.0
-        total_advance_sum = 0.0
-        total_net_sum = 0.0
-
-        today = date.today()
+    def calculate_salaries(self):
+        period = self._read_period()
+        if period is None:
+            return
+        year, month = period
+
+        # Önceki hesaplama sürüyorsa sonucu artık gerekmiyor
+        if self.calc_task is not None:
+            self.calc_task.cancel()
+
+        # Tüm personel tek gruplu sorgu ile, arka planda hesaplanır (bkz. payroll.py)
+        settings = self.settings
+        self.calc_task = get_task_runner(self).submit(
+            lambda task: monthly_payroll(year, month, settings=settings),
+            description=f"Maaş hesaplanıyor ({month:02d}/{year})",
+            on_done=self.show_salaries,
+            on_error=lambda e: messagebox.showerror("Hata", f"Maaş hesaplanırken hata oluştu:\n{e}"),
+        )
 
-        def count_working_days(start_date_str: str) -> int:
-            """Personelin işe giriş + ay sonuna göre çalışma günü."""
-            if not start_date_str:
-                return 0
-            try:
-                start_date_val = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-            except Exception:
-                return 0
-
-            # Ayın son günü (gelecek ay ilk gününden 1 gün geri)
-            last_day = month_end - timedelta(days=1)
-
-            # Seçilen ay bu aysa, bugünden sonrasını sayma
-            if year == today.year and month == today.month and today < last_day:
-                last_day = today
-
-            period_start = max(month_start, start_date_val)
-            if period_start > last_day:
-                return 0
-
-            d = period_start
-            days = 0
-            while d <= last_day:
-                if include_weekends or d.weekday() < 5:  # 0: Pazartesi, 6: Pazar
-                    days += 1
-                d += timedelta(days=1)
-            return days
-
-        # Her personel için hesapla
-        for emp_id, name, hourly_rate, start_str in employees:
-            # x = ay içindeki çalışma günü
-            work_days = count_working_days(start_str)
-
-            # Teorik saat = x * günlük saat
-            theoretical_hours = work_days * daily_hours
-
-            # Eksik saat (devamsızlık kayıtlarındaki hours toplamı)
-            c.execute("""
-                SELECT COALESCE(SUM(hours), 0)
-                FROM attendance_logs
-                WHERE employee_id = ?
-                  AND date >= ? AND date < ?
-            """, (emp_id, month_start.isoformat(), month_end.isoformat()))
-            row = c.fetchone()
-            missing_hours = float(row[0] or 0)
-
-            # Toplam çalışma saati = x * 10 - devamsızlık
-            total_hours = max(theoretical_hours - missing_hours, 0)
-
-            # Maaş = toplam saat * saatlik ücret
-            salary = total_hours * float(hourly_rate)
-
-            # Mesai (overtimes.total)
-            c.execute("""
-                SELECT COALESCE(SUM(total), 0)
-                FROM overtimes
-                WHERE employee_id = ?
-                  AND date >= ? AND date < ?
-            """, (emp_id, month_start.isoformat(), month_end.isoformat()))
-            row = c.fetchone()
-            overtime_total = float(row[0] or 0)
-
-            # Avans – seçilen ay içindeki tüm avanslar
-            c.execute("""
-                SELECT COALESCE(SUM(amount), 0)
-                FROM advances
-                WHERE employee_id = ?
-                  AND date >= ? AND date < ?
-            """, (emp_id, month_start.isoformat(), month_end.isoformat()))
-            row = c.fetchone()
-            advance_total = float(row[0] or 0)
-
-            net_salary = salary + overtime_total - advance_total
-
-            # Treeview satırı
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    name,
-                    work_days,
-                    theoretical_hours,
-                    missing_hours,
-                    total_hours,
-                    tl(salary),
-                    tl(overtime_total),
-                    tl(advance_total),
-                    tl(net_salary),
+    def on_settings_changed(self, settings):
+        """Ayarlar kaydedilince çağrılır; ekrandaki tablo varsa yeni ayarlarla yenilenir."""
+        self.settings = settings
+        if self.last_rows:
+            self.calculate_salaries()
+
+    def show_salaries(self, result):
+        self.calc_task = None
+
+        grid_rows = [
+            (
+                str(r["employee_id"]),
+                (
+                    r["name"],
+                    r["days"],
+                    r["theoretical_hours"],
+                    r["missing_hours"],
+                    r["total_hours"],
+                    tl(r["salary"]),
+                    tl(r["overtime"]),
+                    tl(r["advance"]),
+                    tl(r["net_salary"]),
                 ),
             )
+            for r in result.rows
+        ]
 
-            # Dışa aktarım için kaydet
-            self.last_rows.append({
-                "name": name,
-                "days": work_days,
-                "theoretical_hours": theoretical_hours,
-                "missing_hours": missing_hours,
-                "total_hours": total_hours,
-                "salary": salary,
-                "overtime": overtime_total,
-                "advance": advance_total,
-                "net_salary": net_salary,
-            })
-
-            total_salary_sum += salary
-            total_overtime_sum += overtime_total
-            total_advance_sum += advance_total
-            total_net_sum += net_salary
-
+        # Dışa aktarım için kaydet
+        self.last_rows = result.rows
+        self.shown = result
+        totals = result.totals
+        self._update_period_controls()
 
         # Toplam satırı
         if self.last_rows:
-            self.tree.insert(
-                "",
-                "end",
-                values=(
+            grid_rows.append((
+                "total",
+                (
                     "TOPLAM",
                     "",
                     "",
                     "",
                     "",
-                    tl(total_salary_sum),
-                    tl(total_overtime_sum),
-                    tl(total_advance_sum),
-                    tl(total_net_sum),
+                    tl(totals.salary),
+                    tl(totals.overtime),
+                    tl(totals.advance),
+                    tl(totals.net_salary),
                 ),
-            )
+            ))
+
+        # Sadece değişen satırlar güncellenir (bkz. data_grid.py)
+        self.salary_grid.set_rows(grid_rows)
 
         # Kasa özetini güncelle
-        self.total_salary_var.set(tl(total_salary_sum))
-        self.total_overtime_var.set(tl(total_overtime_sum))
-        self.total_advance_var.set(tl(total_advance_sum))
-        self.total_net_var.set(tl(total_net_sum))
+        self.total_salary_var.set(tl(totals.salary))
+        self.total_overtime_var.set(tl(totals.overtime))
+        self.total_advance_var.set(tl(totals.advance))
+        self.total_net_var.set(tl(totals.net_salary))
+
+    # -------------------------------------------------
+    #   Dönem kapanışı
+    # -------------------------------------------------
+    def _update_period_controls(self):
+        """Durum satırı ve kapanış butonları ekrandaki bordroya göre ayarlanır."""
+        result = self.shown
+        closed = result is not None and result.is_closed
+        if result is None:
+            self.period_status_var.set("")
+        elif closed:
+            s = result.settings
+            text = (
+                f"Dönem {result.period_text} KAPALI – {result.closed_at} "
+                f"(günlük {s.daily_hours:g} saat, mesai katsayısı {s.overtime_coef:g}, "
+                f"hafta sonu {'dahil' if s.include_weekends else 'hariç'})"
+            )
+            if result.stale:
+                text += "  ⚠ Kapanıştan sonra kayıtlar değişti; rakamlar kapanıştaki hâliyle gösteriliyor."
+            self.period_status_var.set(text)
+        else:
+            self.period_status_var.set(f"Dönem {result.period_text} açık (canlı hesap)")
+
+        self.period_status_label.configure(foreground="red" if closed and result.stale else "")
+        self.close_btn.configure(state="disabled" if result is None or closed else "normal")
+        self.reopen_btn.configure(state="normal" if closed else "disabled")
+        self.recompute_btn.configure(state="normal" if closed else "disabled")
+
+    def lock_period_actions(self):
+        """OFIS rolü: dönem kapanışı bordro snapshot'ı yazar ve avans kesintisi
+        işler; butonlar gizlenir, işlemler çalışmaz."""
+        self.allow_period_actions = False
+        for btn in (self.close_btn, self.reopen_btn, self.recompute_btn):
+            btn.grid_remove()
+
+    def _run_period_action(self, action, description, error_text):
+        if not self.allow_period_actions:
+            return
+        year, month = self.shown.year, self.shown.month
+        if self.calc_task is not None:
+            self.calc_task.cancel()
+        self.calc_task = get_task_runner(self).submit(
+            lambda task: action(year, month),
+            description=description,
+            on_done=lambda result: self._show_period(year, month),
+            on_error=lambda e: messagebox.showerror("Hata", f"{error_text}\n{e}"),
+        )
+
+    def _show_period(self, year, month):
+        self.calc_task = None
+        self.year_var.set(str(year))
+        self.month_var.set(str(month))
+        self.calculate_salaries()
+
+    def close_period(self):
+        """Gösterilen ayın bordrosunu dondurur (bkz. payroll.close_period)."""
+        if self.shown is None or self.shown.is_closed:
+            return
+        period = self.shown.period_text
+        if not messagebox.askyesno(
+            "Dönemi Kapat",
+            f"{period} dönemi kapatılsın mı?\n\n"
+            "Ayın avans kesintileri işlenir ve bordro mevcut ayarlarla dondurulur; "
+            "sonraki ücret / ayar değişiklikleri bu ayı etkilemez.",
+        ):
+            return
+        self._run_period_action(
+            close_period, f"Dönem kapatılıyor ({period})", "Dönem kapatılırken hata oluştu:"
+        )
+
+    def reopen_period(self):
+        if self.shown is None or not self.shown.is_closed:
+            return
+        period = self.shown.period_text
+        if not messagebox.askyesno(
+            "Dönemi Yeniden Aç",
+            f"{period} dönemi yeniden açılsın mı?\n\n"
+            "Dondurulmuş bordro silinir; ay yeniden güncel kayıtlar ve ayarlarla hesaplanır.",
+        ):
+            return
+        self._run_period_action(
+            reopen_period, f"Dönem açılıyor ({period})", "Dönem açılırken hata oluştu:"
+        )
+
+    def recompute_period(self):
+        if self.shown is None or not self.shown.is_closed:
+            return
+        period = self.shown.period_text
+        if not messagebox.askyesno(
+            "Yeniden Hesapla",
+            f"{period} bordrosu güncel kayıtlar ve ayarlarla yeniden hesaplanıp tekrar kapatılsın mı?",
+        ):
+            return
+        self._run_period_action(
+            recompute_period, f"Dönem yeniden hesaplanıyor ({period})",
+            "Dönem yeniden hesaplanırken hata oluştu:",
+        )
+
+    def export_batch(self):
+        """Bir ay aralığındaki tüm ayların bordrosunu tek dosyaya yazar (bkz. batch_payroll.py)."""
+        from tkinter import simpledialog
+        from batch_payroll import parse_month
+
+        today = date.today()
+        start_text = simpledialog.askstring(
+            "Toplu Bordro", "Başlangıç ayı (YYYY-AA):",
+            initialvalue=f"{today.year}-01", parent=self,
+        )
+        if not start_text:
+            return
+        end_text = simpledialog.askstring(
+            "Toplu Bordro", "Bitiş ayı (YYYY-AA):",
+            initialvalue=f"{today.year}-{today.month:02d}", parent=self,
+        )
+        if not end_text:
+            return
+
+        try:
+            start = parse_month(start_text)
+            end = parse_month(end_text)
+            if start > end:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Hata", "Ay aralığı geçersiz (örn. 2024-01 – 2025-12).")
+            return
+
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel Dosyası", "*.xlsx"), ("CSV Dosyası", "*.csv")],
+            initialfile=f"bordro_{start[0]}-{start[1]:02d}_{end[0]}-{end[1]:02d}.xlsx",
+            title="Toplu Bordro Kaydet",
+        )
+        if not file_path:
+            return
+
+        if not file_path.lower().endswith(".csv"):
+            try:
+                import openpyxl  # noqa: F401
+            except ImportError:
+                messagebox.showerror(
+                    "Hata",
+                    "Excel dışa aktarım için 'openpyxl' gerekli.\n\npip install openpyxl",
+                )
+                return
+
+        settings = self.settings
+        run_file_job(
+            self,
+            f"Toplu bordro hesaplanıyor ({start[1]:02d}/{start[0]} – {end[1]:02d}/{end[0]})",
+            lambda task: self._write_batch(task, file_path, start, end, settings),
+            f"Toplu bordro oluşturuldu:\n{file_path}",
+            "Toplu bordro oluşturulurken hata oluştu:",
+        )
+
+    @staticmethod
+    def _write_batch(task, file_path, start, end, settings):
+        from batch_payroll import run_batch_payroll
+
+        run_batch_payroll(file_path, start, end, settings=settings, task=task)
+
+    def _get_period_text(self):
+        try:
+            y = int(self.year_var.get())
+            m = int(self.month_var.get())
+            return f"{m:02d}/{y}"
+        except Exception:
+            return ""
 
     # -------------------------------------------------
     #   Dışa aktarım – CSV
@@ -343,30 +425,14 @@ class SalaryTab(ttk.Frame):
         if not file_path:
             return
 
-        import csv
-
-        try:
-            with open(file_path, "w", newline="", encoding="utf-8-sig") as f:
-                writer = csv.writer(f, delimiter=";")
-                writer.writerow([
-                    "Personel", "Gün", "Teorik Saat", "Eksik Saat", "Toplam Saat",
-                    "Maaş", "Mesai", "Avans Kesinti", "Net Maaş",
-                ])
-                for r in self.last_rows:
-                    writer.writerow([
-                        r["name"],
-                        r["days"],
-                        f"{r['theoretical_hours']:.2f}",
-                        f"{r['missing_hours']:.2f}",
-                        f"{r['total_hours']:.2f}",
-                        f"{r['salary']:.2f}",
-                        f"{r['overtime']:.2f}",
-                        f"{r['advance']:.2f}",
-                        f"{r['net_salary']:.2f}",
-                    ])
-            messagebox.showinfo("Başarılı", f"CSV dışa aktarım tamamlandı:\n{file_path}")
-        except Exception as e:
-            messagebox.showerror("Hata", f"CSV kaydedilirken hata oluştu:\n{e}")
+        rows = list(self.last_rows)
+        run_file_job(
+            self,
+            "CSV yazılıyor",
+            lambda task: write_payroll_csv(file_path, rows, task=task),
+            f"CSV dışa aktarım tamamlandı:\n{file_path}",
+            "CSV kaydedilirken hata oluştu:",
+        )
 
     # -------------------------------------------------
     #   Dışa aktarım – Excel
@@ -377,7 +443,7 @@ class SalaryTab(ttk.Frame):
             return
 
         try:
-            from openpyxl import Workbook
+            import openpyxl  # noqa: F401
         except ImportError:
             messagebox.showerror(
                 "Hata",
@@ -394,34 +460,14 @@ class SalaryTab(ttk.Frame):
         if not file_path:
             return
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Bordro"
-
-        headers = [
-            "Personel", "Gün", "Teorik Saat", "Eksik Saat", "Toplam Saat",
-            "Maaş", "Mesai", "Avans Kesinti", "Net Maaş",
-        ]
-        ws.append(headers)
-
-        for r in self.last_rows:
-            ws.append([
-                r["name"],
-                r["days"],
-                r["theoretical_hours"],
-                r["missing_hours"],
-                r["total_hours"],
-                r["salary"],
-                r["overtime"],
-                r["advance"],
-                r["net_salary"],
-            ])
-
-        try:
-            wb.save(file_path)
-            messagebox.showinfo("Başarılı", f"Excel bordro oluşturuldu:\n{file_path}")
-        except Exception as e:
-            messagebox.showerror("Hata", f"Excel kaydedilirken hata oluştu:\n{e}")
+        rows = list(self.last_rows)
+        run_file_job(
+            self,
+            "Excel bordro yazılıyor",
+            lambda task: write_payroll_xlsx(file_path, rows, task=task),
+            f"Excel bordro oluşturuldu:\n{file_path}",
+            "Excel kaydedilirken hata oluştu:",
+        )
 
     # -------------------------------------------------
     #   Dışa aktarım – PDF
@@ -432,9 +478,7 @@ class SalaryTab(ttk.Frame):
             return
 
         try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.units import mm
+            import reportlab  # noqa: F401
         except ImportError:
             messagebox.showerror(
                 "Hata",
@@ -451,61 +495,18 @@ class SalaryTab(ttk.Frame):
         if not file_path:
             return
 
-        c_pdf = canvas.Canvas(file_path, pagesize=A4)
-        width, height = A4
-
-        left_margin = 15 * mm
-        top_margin = height - 25 * mm
-        line_height = 6 * mm
-
-        c_pdf.setFont("Helvetica-Bold", 14)
-        c_pdf.drawString(left_margin, top_margin, "Aylık Bordro")
-
-        try:
-            y = int(self.year_var.get())
-            m = int(self.month_var.get())
-            period = f"{m:02d}/{y}"
-        except Exception:
-            period = ""
-
-        if period:
-            c_pdf.setFont("Helvetica", 11)
-            c_pdf.drawString(left_margin, top_margin - line_height, f"Dönem: {period}")
-
-        y_pos = top_margin - 3 * line_height
-
-        c_pdf.setFont("Helvetica-Bold", 8)
-        header_text = "Personel | Gün | Teorik | Eksik | Saat | Maaş | Mesai | Avans | Net"
-        c_pdf.drawString(left_margin, y_pos, header_text)
-        y_pos -= line_height
-        c_pdf.line(left_margin, y_pos + 2, width - left_margin, y_pos + 2)
-        y_pos -= line_height
-
-        c_pdf.setFont("Helvetica", 7)
-
-        for r in self.last_rows:
-            row_text = (
-                f"{r['name']} | {r['days']} | "
-                f"{r['theoretical_hours']:.1f} | {r['missing_hours']:.1f} | {r['total_hours']:.1f} | "
-                f"{tl(r['salary'])} | {tl(r['overtime'])} | "
-                f"{tl(r['advance'])} | {tl(r['net_salary'])}"
-            )
-
-            if y_pos < 20 * mm:
-                c_pdf.showPage()
-                y_pos = top_margin
-                c_pdf.setFont("Helvetica-Bold", 8)
-                c_pdf.drawString(left_margin, y_pos, header_text)
-                y_pos -= line_height
-                c_pdf.line(left_margin, y_pos + 2, width - left_margin, y_pos + 2)
-                y_pos -= line_height
-                c_pdf.setFont("Helvetica", 7)
+        rows = list(self.last_rows)
+        period = self._get_period_text()
+        run_file_job(
+            self,
+            "PDF bordro yazılıyor",
+            lambda task: self._write_pdf(task, file_path, rows, period),
+            f"PDF bordro oluşturuldu:\n{file_path}",
+            "PDF oluşturulurken hata oluştu:",
+        )
 
-            c_pdf.drawString(left_margin, y_pos, row_text)
-            y_pos -= line_height
+    @staticmethod
+    def _write_pdf(task, file_path, rows, period):
+        from pdf_reports import write_payroll_pdf
 
-        try:
-            c_pdf.save()
-            messagebox.showinfo("Başarılı", f"PDF bordro oluşturuldu:\n{file_path}")
-        except Exception as e:
-            messagebox.showerror("Hata", f"PDF oluşturulurken hata oluştu:\n{e}")
+        write_payroll_pdf(file_path, iter(rows), period, task=task, total=len(rows))
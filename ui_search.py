@@ -0,0 +1,131 @@
+"""Global arama penceresi: devamsızlık notları, mesai ve avans açıklamaları.
+
+Arama db.search_records ile FTS5 indeksinden yapılır (bkz.
+db._migration_8_search_index); yazdıkça (kısa bir gecikmeyle) sonuçlar
+ilgililik sırasıyla listelenir. Sonuca çift tıklamak / Enter, kaydı kendi
+sekmesinde açar (on_open(hit) -> PatronApp.open_search_hit).
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from data_grid import DataGrid
+from db import search_records
+
+# Son tuştan sonra aramanın başlaması için beklenen süre (ms)
+SEARCH_DELAY_MS = 250
+
+KIND_TITLES = {
+    "attendance": "Devamsızlık",
+    "overtime": "Mesai",
+    "advance": "Avans",
+}
+
+
+class SearchDialog(tk.Toplevel):
+    def __init__(self, master, on_open):
+        super().__init__(master)
+        self.title("Kayıtlarda Ara")
+        self.geometry("760x420")
+        self.transient(master)
+
+        self.on_open = on_open
+        self.hits = {}        # iid -> SearchHit
+        self._pending = None  # after() id'si
+
+        self.build_ui()
+        self.bind("<Escape>", lambda e: self.withdraw())
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+
+    def build_ui(self):
+        top = ttk.Frame(self)
+        top.pack(fill="x", padx=10, pady=10)
+
+        ttk.Label(top, text="Ara:").pack(side="left")
+        self.query_var = tk.StringVar()
+        self.query_entry = ttk.Entry(top, textvariable=self.query_var, width=40)
+        self.query_entry.pack(side="left", padx=5)
+        self.query_entry.bind("<KeyRelease>", self.on_key)
+        self.query_entry.bind("<Return>", lambda e: self.run_search())
+        self.query_entry.bind("<Down>", self.focus_results)
+
+        # Kayıt türü filtresi
+        self.kind_vars = {}
+        for kind, title in KIND_TITLES.items():
+            var = tk.IntVar(value=1)
+            self.kind_vars[kind] = var
+            ttk.Checkbutton(top, text=title, variable=var, command=self.run_search)\
+                .pack(side="left", padx=5)
+
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(top, textvariable=self.status_var, foreground="gray").pack(side="right")
+
+        list_frame = ttk.Frame(self)
+        list_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        columns = ("kind", "date", "employee", "text")
+        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings")
+        self.tree.heading("kind", text="Tür")
+        self.tree.heading("date", text="Tarih")
+        self.tree.heading("employee", text="Personel")
+        self.tree.heading("text", text="Not / Açıklama")
+        self.tree.column("kind", width=90)
+        self.tree.column("date", width=90, anchor="center")
+        self.tree.column("employee", width=160)
+        self.tree.column("text", width=380)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.pack(fill="both", expand=True)
+        self.grid_rows = DataGrid(self.tree, scrollbar=scrollbar)
+
+        self.tree.bind("<Double-1>", self.open_selected)
+        self.tree.bind("<Return>", self.open_selected)
+
+    # ---- Arama ----
+
+    def show(self, text=""):
+        """Pencereyi öne getirir; text verilirse onu arar."""
+        self.deiconify()
+        self.lift()
+        if text:
+            self.query_var.set(text)
+            self.run_search()
+        self.query_entry.focus_set()
+        self.query_entry.select_range(0, "end")
+
+    def on_key(self, event):
+        if event.keysym in ("Return", "Down", "Escape"):
+            return
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        self._pending = None
+        kinds = [kind for kind, var in self.kind_vars.items() if var.get()]
+        hits = search_records(self.query_var.get(), kinds=kinds)
+
+        self.hits = {f"{hit.kind}:{hit.record_id}": hit for hit in hits}
+        self.grid_rows.set_rows(
+            (iid, (KIND_TITLES[hit.kind], hit.date, hit.name, hit.text or ""))
+            for iid, hit in self.hits.items()
+        )
+        if not self.query_var.get().strip():
+            self.status_var.set("")
+        else:
+            self.status_var.set(f"{len(hits)} sonuç")
+
+    # ---- Kayda git ----
+
+    def focus_results(self, event=None):
+        children = self.tree.get_children()
+        if children:
+            self.tree.focus_set()
+            self.tree.focus(children[0])
+            self.tree.selection_set(children[0])
+        return "break"
+
+    def open_selected(self, event=None):
+        hit = self.hits.get(self.tree.focus())
+        if hit is not None:
+            self.on_open(hit)
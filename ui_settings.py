@@ -1,9 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import os
 from datetime import datetime
-import shutil
 
-from db import get_settings, update_settings, DB_NAME
+from db import (
+    get_settings,
+    update_settings,
+    rebuild_monthly_summary,
+    get_backup_config,
+    update_backup_config,
+    DB_NAME,
+)
+from task_runner import run_file_job, get_task_runner
 
 
 class SettingsTab(ttk.Frame):
@@ -14,8 +22,17 @@ class SettingsTab(ttk.Frame):
         self.overtime_coef_var = tk.StringVar()
         self.include_weekends_var = tk.IntVar(value=1)
 
+        # Otomatik yedek ayarları
+        self.backup_enabled_var = tk.IntVar(value=1)
+        self.backup_dir_var = tk.StringVar()
+        self.backup_interval_var = tk.StringVar()
+        self.backup_keep_var = tk.StringVar()
+        self.backup_compress_var = tk.IntVar(value=1)
+        self.last_backup_var = tk.StringVar()
+
         self.build_ui()
         self.load_settings()
+        self.load_backup_config()
 
     def build_ui(self):
         # --- GENEL AYARLAR ---
@@ -63,19 +80,85 @@ class SettingsTab(ttk.Frame):
         ttk.Label(
             backup_frame,
             text=(
-                "Mevcut veritabanını bir .db dosyası olarak yedekleyebilirsiniz.\n"
-                "Öneri: Yedekleri tarih/saat içeren isimle saklayın."
+                "Yedek, program açıkken de tutarlı alınır (SQLite online backup).\n"
+                "Her yedek kaydedilmeden önce bütünlük kontrolünden geçer.\n"
+                "Dosya adı .gz ile biterse yedek sıkıştırılır."
             ),
             justify="left",
-        ).grid(row=0, column=0, columnspan=2, padx=5, pady=5, sticky="w")
+        ).grid(row=0, column=0, columnspan=4, padx=5, pady=5, sticky="w")
 
         ttk.Label(backup_frame, text=f"Aktif veritabanı dosyası: {DB_NAME}").grid(
-            row=1, column=0, columnspan=2, padx=5, pady=5, sticky="w"
+            row=1, column=0, columnspan=4, padx=5, pady=5, sticky="w"
         )
 
         ttk.Button(backup_frame, text="Veritabanını Yedekle", command=self.backup_db).grid(
             row=2, column=0, padx=5, pady=8, sticky="w"
         )
+        ttk.Button(backup_frame, text="Yedeği Doğrula", command=self.verify_backup_file).grid(
+            row=2, column=1, padx=5, pady=8, sticky="w"
+        )
+
+        # --- OTOMATİK YEDEK ---
+        auto_frame = ttk.LabelFrame(self, text="Otomatik Yedek")
+        auto_frame.pack(fill="x", padx=10, pady=(0, 10))
+
+        ttk.Checkbutton(
+            auto_frame, text="Otomatik yedek al", variable=self.backup_enabled_var
+        ).grid(row=0, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+
+        ttk.Label(auto_frame, text="Yedek klasörü:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
+        ttk.Entry(auto_frame, textvariable=self.backup_dir_var, width=45).grid(
+            row=1, column=1, padx=5, pady=5, sticky="w"
+        )
+        ttk.Button(auto_frame, text="Seç...", command=self.choose_backup_dir).grid(
+            row=1, column=2, padx=5, pady=5, sticky="w"
+        )
+
+        ttk.Label(auto_frame, text="Yedek aralığı:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        ttk.Entry(auto_frame, textvariable=self.backup_interval_var, width=10).grid(
+            row=2, column=1, padx=5, pady=5, sticky="w"
+        )
+        ttk.Label(auto_frame, text="saat").grid(row=2, column=2, padx=5, pady=5, sticky="w")
+
+        ttk.Label(auto_frame, text="Saklanacak yedek:").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        ttk.Entry(auto_frame, textvariable=self.backup_keep_var, width=10).grid(
+            row=3, column=1, padx=5, pady=5, sticky="w"
+        )
+        ttk.Label(auto_frame, text="adet (eskiler silinir)").grid(row=3, column=2, padx=5, pady=5, sticky="w")
+
+        ttk.Checkbutton(
+            auto_frame, text="Yedekleri sıkıştır (.db.gz)", variable=self.backup_compress_var
+        ).grid(row=4, column=0, columnspan=3, padx=5, pady=5, sticky="w")
+
+        ttk.Label(auto_frame, textvariable=self.last_backup_var).grid(
+            row=5, column=0, columnspan=3, padx=5, pady=5, sticky="w"
+        )
+
+        auto_btns = ttk.Frame(auto_frame)
+        auto_btns.grid(row=6, column=0, columnspan=3, padx=5, pady=8, sticky="w")
+        ttk.Button(auto_btns, text="Yedek Ayarlarını Kaydet", command=self.save_backup_config).pack(
+            side="left"
+        )
+        ttk.Button(auto_btns, text="Şimdi Yedek Al", command=self.run_auto_backup_now).pack(
+            side="left", padx=5
+        )
+
+        # --- BAKIM ---
+        maintenance_frame = ttk.LabelFrame(self, text="Bakım")
+        maintenance_frame.pack(fill="x", padx=10, pady=(0, 10))
+
+        ttk.Label(
+            maintenance_frame,
+            text=(
+                "Raporlar aylık özet tablosundan okunur. Rakamlar ham kayıtlarla\n"
+                "uyuşmuyorsa özet tabloyu baştan oluşturabilirsiniz."
+            ),
+            justify="left",
+        ).grid(row=0, column=0, padx=5, pady=5, sticky="w")
+
+        ttk.Button(
+            maintenance_frame, text="Aylık Özeti Yeniden Oluştur", command=self.rebuild_summary
+        ).grid(row=1, column=0, padx=5, pady=8, sticky="w")
 
     def load_settings(self):
         daily_hours, overtime_coef, include_weekends = get_settings()
@@ -111,23 +194,153 @@ class SettingsTab(ttk.Frame):
         update_settings(daily_hours, overtime_coef, include_weekends)
         messagebox.showinfo("Başarılı", "Ayarlar kaydedildi.")
 
+    def rebuild_summary(self):
+        run_file_job(
+            self,
+            "Aylık özet yeniden oluşturuluyor",
+            lambda task: rebuild_monthly_summary(),
+            "Aylık özet tablosu yeniden oluşturuldu.",
+            "Aylık özet oluşturulurken hata oluştu:",
+        )
+
+    # ---------- Yedek ---------- #
+
     def backup_db(self):
-        """DB dosyasını kullanıcıya seçtirdiği konuma kopyalar."""
-        # Önerilen dosya adı: personel_takip_yedek_YYYYMMDD_HHMMSS.db
-        default_name = f"personel_takip_yedek_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+        """Veritabanının tutarlı bir yedeğini kullanıcının seçtiği konuma yazar."""
+        from backup import default_backup_name
 
         file_path = filedialog.asksaveasfilename(
             defaultextension=".db",
-            filetypes=[("SQLite Veritabanı", "*.db"), ("Tüm Dosyalar", "*.*")],
-            initialfile=default_name,
+            filetypes=[
+                ("SQLite Veritabanı", "*.db"),
+                ("Sıkıştırılmış Yedek", "*.gz"),
+                ("Tüm Dosyalar", "*.*"),
+            ],
+            initialfile=default_backup_name(),
             title="Veritabanı Yedeğini Kaydet",
         )
 
         if not file_path:
             return
 
+        def job(task):
+            from backup import backup_database
+
+            return backup_database(file_path, task=task)
+
+        run_file_job(
+            self,
+            "Veritabanı yedekleniyor",
+            job,
+            f"Veritabanı yedeği oluşturuldu ve doğrulandı:\n{file_path}",
+            "Yedek alınırken hata oluştu:",
+        )
+
+    def verify_backup_file(self):
+        file_path = filedialog.askopenfilename(
+            filetypes=[
+                ("Veritabanı Yedeği", "*.db *.gz"),
+                ("Tüm Dosyalar", "*.*"),
+            ],
+            title="Doğrulanacak Yedeği Seçin",
+        )
+        if not file_path:
+            return
+
+        def job(task):
+            from backup import verify_backup
+
+            return verify_backup(file_path)
+
+        def done(problems):
+            if problems:
+                messagebox.showerror(
+                    "Yedek Bozuk", "Yedek bütünlük kontrolünden geçemedi:\n" + "\n".join(problems[:10])
+                )
+            else:
+                messagebox.showinfo("Başarılı", f"Yedek sağlam:\n{file_path}")
+
+        get_task_runner(self).submit(
+            job,
+            description="Yedek doğrulanıyor",
+            on_done=done,
+            on_error=lambda e: messagebox.showerror("Hata", f"Yedek okunamadı:\n{e}"),
+        )
+
+    def load_backup_config(self):
+        config = get_backup_config()
+        self.backup_enabled_var.set(int(config.enabled))
+        self.backup_dir_var.set(config.directory)
+        self.backup_interval_var.set(str(config.interval_hours))
+        self.backup_keep_var.set(str(config.keep_count))
+        self.backup_compress_var.set(int(config.compress))
+        self.refresh_last_backup(config)
+
+    def refresh_last_backup(self, config=None):
+        from backup import default_backup_dir, list_backups
+
+        config = config or get_backup_config()
+        directory = config.directory or default_backup_dir()
         try:
-            shutil.copyfile(DB_NAME, file_path)
-            messagebox.showinfo("Başarılı", f"Veritabanı yedeği oluşturuldu:\n{file_path}")
-        except Exception as e:
-            messagebox.showerror("Hata", f"Yedek alınırken hata oluştu:\n{e}")
+            backups = list_backups(directory)
+        except OSError:
+            backups = []
+        if backups:
+            stamp = datetime.fromtimestamp(os.path.getmtime(backups[0])).strftime("%d.%m.%Y %H:%M")
+            self.last_backup_var.set(f"Son yedek: {stamp} ({len(backups)} yedek, {directory})")
+        else:
+            self.last_backup_var.set(f"Henüz yedek yok ({directory})")
+
+    def choose_backup_dir(self):
+        directory = filedialog.askdirectory(title="Yedek Klasörünü Seçin")
+        if directory:
+            self.backup_dir_var.set(directory)
+
+    def save_backup_config(self, show_message=True):
+        """Formdaki yedek ayarlarını kaydeder; hatalıysa None döner."""
+        try:
+            interval = float(self.backup_interval_var.get().strip().replace(",", "."))
+            keep = int(self.backup_keep_var.get().strip())
+        except ValueError:
+            messagebox.showerror("Hata", "Yedek aralığı ve saklanacak yedek sayısı sayısal olmalıdır.")
+            return None
+
+        if interval <= 0:
+            messagebox.showerror("Hata", "Yedek aralığı 0'dan büyük olmalıdır.")
+            return None
+        if keep < 1:
+            messagebox.showerror("Hata", "En az 1 yedek saklanmalıdır.")
+            return None
+
+        config = update_backup_config(
+            int(self.backup_enabled_var.get()),
+            self.backup_dir_var.get().strip(),
+            interval,
+            keep,
+            int(self.backup_compress_var.get()),
+        )
+        self.refresh_last_backup(config)
+        if show_message:
+            messagebox.showinfo("Başarılı", "Yedek ayarları kaydedildi.")
+        return config
+
+    def run_auto_backup_now(self):
+        config = self.save_backup_config(show_message=False)
+        if config is None:
+            return
+
+        def job(task):
+            from backup import run_auto_backup
+
+            return run_auto_backup(config, task=task)
+
+        def done(result):
+            self.refresh_last_backup(config)
+            messagebox.showinfo("Başarılı", f"Yedek oluşturuldu ve doğrulandı:\n{result.path}")
+
+        get_task_runner(self).submit(
+            job,
+            description="Veritabanı yedekleniyor",
+            on_done=done,
+            on_error=lambda e: messagebox.showerror("Hata", f"Yedek alınırken hata oluştu:\n{e}"),
+        )
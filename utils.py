@@ -1,15 +1,7 @@
-from datetime import date, datetime, timedelta
+import unicodedata
 
 from db import get_settings
-
-
-def month_date_range(year, month):
-    start = date(year, month, 1)
-    if month == 12:
-        end = date(year + 1, 1, 1)
-    else:
-        end = date(year, month + 1, 1)
-    return start, end
+from work_calendar import month_date_range, working_days_for_month  # noqa: F401
 
 
 def working_days_for_employee(start_date_str, year, month):
@@ -19,36 +11,8 @@ def working_days_for_employee(start_date_str, year, month):
     - İçinde bulunulan ayda bugünden sonrasını saymaz
     - Hafta sonu ayarını (include_weekends) dikkate alır
     """
-    start_dt = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-    month_start, month_end = month_date_range(year, month)
-
-    # Çalışanın işe giriş tarihinden önceki günler sayılmaz
-    effective_start = max(start_dt, month_start)
-
-    # Gelecekteki günleri sayma
-    today = date.today()
-    if today.year == year and today.month == month:
-        effective_end = min(month_end, today + timedelta(days=1))
-    else:
-        effective_end = month_end
-
-    if effective_start >= effective_end:
-        return 0
-
     daily_hours, overtime_coef, include_weekends = get_settings()
-    include_weekends_flag = bool(include_weekends)
-
-    d = effective_start
-    count = 0
-    while d < effective_end:
-        if include_weekends_flag:
-            count += 1
-        else:
-            # 0 = Pazartesi, 6 = Pazar
-            if d.weekday() < 5:  # Pazartesi–Cuma
-                count += 1
-        d += timedelta(days=1)
-    return count
+    return working_days_for_month(start_date_str, year, month, bool(include_weekends))
 
 
 def calculate_lost_hours(att_rows):
@@ -91,7 +55,9 @@ def calculate_advance_cut(adv_rows):
     """Bu ay avans kesintisini hesaplar.
 
     adv_rows: (id, date, amount, installments, remaining)
-    Her ay için 1 taksit keser.
+    Her ay için 1 taksit keser. Taksit kuruşa yuvarlanır (db.installment_plan
+    ile aynı); kalan 1,5 taksitten azsa son taksittir ve yuvarlama farkı
+    dahil kalanın tamamı kesilir.
     Geri dönen:
         (toplam_kesinti, [(adv_id, new_remaining), ...])
     """
@@ -101,21 +67,22 @@ def calculate_advance_cut(adv_rows):
     for adv_id, d_str, amount, installments, remaining in adv_rows:
         if installments <= 0:
             continue
-        per_inst = amount / installments
+        per_inst = round(amount / installments, 2)
+        remaining = round(remaining, 2)
         if remaining <= 0:
             new_remaining = 0.0
             cut = 0.0
-        elif remaining <= per_inst:
+        elif remaining < per_inst * 1.5:
             cut = remaining
             new_remaining = 0.0
         else:
             cut = per_inst
-            new_remaining = remaining - per_inst
+            new_remaining = round(remaining - per_inst, 2)
 
         total_cut += cut
         updates.append((adv_id, new_remaining))
 
-    return total_cut, updates
+    return round(total_cut, 2), updates
 
 
 def tl(value):
@@ -141,3 +108,43 @@ def format_float(value):
     if s.endswith(".00"):
         return s[:-3]
     return s
+
+
+# ---- Türkçe metin karşılaştırma ----
+
+# str.lower() 'I' -> 'i' ve 'İ' -> 'i̇' (noktalı birleşik) yapar; Türkçede
+# 'I' -> 'ı', 'İ' -> 'i' olmalı.
+_TR_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+
+# Arama anahtarında Türkçe harfler ASCII karşılığına indirgenir; 'ayse'
+# yazan 'Ayşe'yi, 'isik' yazan 'Işık'ı bulur. 'i̇' (str.lower() ile küçültülmüş
+# 'İ') içindeki birleşik nokta atılır.
+_TR_ASCII = str.maketrans("çğıöşüâîû", "cgiosuaiu", "\u0307")
+
+# Sıralama: harfler Türk alfabesindeki sırasına göre özel kullanım
+# alanındaki (U+E000...) karakterlere eşlenir; boşluk ve rakamlar önde kalır.
+_TR_ALPHABET = "abcçdefgğhıijklmnoöpqrsştuüvwxyz"
+_TR_SORT = str.maketrans({ch: chr(0xE000 + i) for i, ch in enumerate(_TR_ALPHABET)})
+
+
+def turkish_lower(text):
+    """Türkçe kurallarıyla küçük harf ('IŞIK' -> 'ışık', 'İLKER' -> 'ilker')."""
+    # Ayrışık yazılmış harfler (s + birleşik çengel) tek karaktere birleştirilir
+    return unicodedata.normalize("NFC", str(text)).translate(_TR_LOWER).lower()
+
+
+def search_key(text):
+    """Arama anahtarı: Türkçe küçük harf, ASCII'ye indirgenmiş, tek boşluklu."""
+    return " ".join(turkish_lower(text).translate(_TR_ASCII).split())
+
+
+def turkish_sort_key(text):
+    """sorted(..., key=turkish_sort_key): Türk alfabesi sırası, büyük/küçük harf duyarsız."""
+    return turkish_lower(text).translate(_TR_SORT)
+
+
+def name_keys(text):
+    """(karşılaştırma, arama, sıralama) anahtarları tek geçişte; binlerce
+    isim indekslenirken her ismi üç kez küçültmemek için."""
+    lowered = " ".join(turkish_lower(text).split())
+    return lowered, lowered.translate(_TR_ASCII), lowered.translate(_TR_SORT)
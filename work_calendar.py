@@ -0,0 +1,146 @@
+"""Çalışma günü hesapları.
+
+Gün gün döngü yerine hafta içi günler kapalı formülle sayılır:
+1.1.0001 Pazartesi olduğundan, bir tarihten önceki hafta içi gün sayısı
+    (tam hafta * 5) + min(artan gün, 5)
+olarak bulunur; iki tarih arası bu değerlerin farkıdır (O(1)).
+
+Tüm aralıklar yarı açıktır: [başlangıç, bitiş).
+"""
+from datetime import date, datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # numpy yoksa toplu hesap saf Python ile yapılır
+    np = None
+
+
+MONTH_NAMES_TR = [
+    "Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
+    "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"
+]
+
+
+def month_date_range(year, month):
+    start = date(year, month, 1)
+    if month == 12:
+        end = date(year + 1, 1, 1)
+    else:
+        end = date(year, month + 1, 1)
+    return start, end
+
+
+def weekdays_before(d):
+    """d tarihinden önceki (d hariç) Pazartesi–Cuma gün sayısı (1.1.0001'den beri)."""
+    weeks, rest = divmod(d.toordinal() - 1, 7)
+    return weeks * 5 + min(rest, 5)
+
+
+def count_working_days(start, end, include_weekends):
+    """[start, end) aralığındaki çalışma günü sayısı."""
+    if start >= end:
+        return 0
+    if include_weekends:
+        return (end - start).days
+    return weekdays_before(end) - weekdays_before(start)
+
+
+def parse_start_date(value):
+    """İşe giriş tarihini date'e çevirir; boş/geçersizse None."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def month_period_end(year, month, today=None):
+    """Ay içinde sayılacak son günün ertesi (yarı açık bitiş).
+
+    İçinde bulunulan ayda bugünden sonrası sayılmaz.
+    """
+    if today is None:
+        today = date.today()
+    month_start, month_end = month_date_range(year, month)
+    if year == today.year and month == today.month:
+        return min(month_end, today + timedelta(days=1))
+    return month_end
+
+
+def employee_period(start_date, year, month, today=None):
+    """Personelin ay içindeki [başlangıç, bitiş) çalışma aralığı; yoksa None.
+
+    - İşe giriş tarihinden önceki günler sayılmaz
+    - İçinde bulunulan ayda bugünden sonrası sayılmaz
+    """
+    start_dt = parse_start_date(start_date)
+    if start_dt is None:
+        return None
+    month_start, _ = month_date_range(year, month)
+    period_start = max(start_dt, month_start)
+    period_end = month_period_end(year, month, today)
+    if period_start >= period_end:
+        return None
+    return period_start, period_end
+
+
+def working_days_for_month(start_date, year, month, include_weekends, today=None):
+    """Personelin seçilen ayda çalışması gereken gün sayısı."""
+    period = employee_period(start_date, year, month, today)
+    if period is None:
+        return 0
+    return count_working_days(period[0], period[1], include_weekends)
+
+
+def working_days_matrix(start_dates, periods, include_weekends, today=None):
+    """Çok sayıda personel x çok sayıda ay için çalışma günleri.
+
+    start_dates: işe giriş tarihleri (str / date / None)
+    periods    : [(yıl, ay), ...]  (örn. bir yılın 12 ayı)
+    Geri dönen : her personel için periods sırasında gün sayıları listesi.
+
+    numpy varsa tek vektörel busday_count çağrısı ile hesaplanır.
+    """
+    starts = [parse_start_date(s) for s in start_dates]
+    bounds = [(month_date_range(y, m)[0], month_period_end(y, m, today)) for y, m in periods]
+
+    if np is None:
+        return [
+            [
+                count_working_days(max(s, m_start), m_end, include_weekends) if s else 0
+                for m_start, m_end in bounds
+            ]
+            for s in starts
+        ]
+
+    if not starts or not bounds:
+        return [[] for _ in starts]
+
+    # Geçersiz başlangıç: çok ileri bir tarih -> 0 gün
+    far_future = np.datetime64("9999-01-01")
+    start_arr = np.array(
+        [np.datetime64(s) if s else far_future for s in starts], dtype="datetime64[D]"
+    )[:, None]
+    month_starts = np.array([np.datetime64(b[0]) for b in bounds], dtype="datetime64[D]")[None, :]
+    month_ends = np.array([np.datetime64(b[1]) for b in bounds], dtype="datetime64[D]")[None, :]
+
+    begin = np.maximum(start_arr, month_starts)
+    end = np.broadcast_to(month_ends, begin.shape)
+    valid = begin < end
+    begin = np.where(valid, begin, end)
+
+    if include_weekends:
+        days = (end - begin).astype("int64")
+    else:
+        days = np.busday_count(begin, end)
+    return days.tolist()
+
+
+def working_days_batch(start_dates, year, month, include_weekends, today=None):
+    """Tek ay için, personel listesindeki her başlangıç tarihine karşılık gün sayısı."""
+    return [row[0] for row in working_days_matrix(start_dates, [(year, month)], include_weekends, today)]